@@ -0,0 +1,302 @@
+"""
+Takvim Hizalama ve Kurumsal İşlem Düzeltmesi
+Tüm sembolleri tek bir ana takvime tek dağıtım (scatter) işlemiyle yerleştirir,
+boşlukları ileri doldurur (hangi barların doldurulduğunu maskede tutar) ve
+bölünme/temettü düzeltme faktörlerini tüm matrise tek geçişte uygular.
+Sonuç diske yazılır (sembol kümesi başına tek kayıt, veri değişince üzerine
+yazılır); aynı girdiyle tekrar istendiğinde mmap ile okunur.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+DEFAULT_ALIGNED_DIR = os.path.join('.cache', 'aligned')
+
+ALIGN_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+
+DAY_NS = 86_400 * 10**9
+
+
+def local_ns(dates):
+    """Tarihleri yerel saatte saat dilimsiz nanosaniyeye (int64) çevirir"""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def fill_index(present):
+    """
+    Her bar için son gerçek barın indeksi (ileri doldurma kaynağı)
+
+    Args:
+        present (np.ndarray): (sembol x bar) gerçek bar maskesi
+
+    Returns:
+        np.ndarray: Aynı boyutta int64 indeksler; ilk gerçek bardan önce -1
+    """
+    last = np.where(present, np.arange(present.shape[-1]), -1)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    return last
+
+
+def adjustment_factors(close, dividends=None, splits=None):
+    """
+    Geriye dönük düzeltme faktörleri (en son bar 1)
+
+    t. bardaki s oranlı bölünme t'den önceki fiyatları s'ye böler; d
+    temettüsü önceki fiyatları (1 - d / önceki kapanış) ile çarpar; önceki
+    kapanış sembolün o barda verisi olmasa da son gerçek kapanıştır.
+
+    Args:
+        close (np.ndarray): (sembol x bar) ham kapanış matrisi
+        dividends (np.ndarray): Aynı boyutta temettü (yoksa 0)
+        splits (np.ndarray): Aynı boyutta bölünme oranı (yoksa 0)
+
+    Returns:
+        tuple: (fiyat faktörü, hacim faktörü) matrisleri
+    """
+    shape = close.shape
+    price_event = np.ones(shape)
+    volume_event = np.ones(shape)
+
+    if splits is not None:
+        ratio = np.where(np.nan_to_num(splits) > 0, splits, 1.0)
+        price_event[:, :-1] /= ratio[:, 1:]
+        volume_event[:, :-1] *= ratio[:, 1:]
+    if dividends is not None:
+        # Ana takvimde sembolün barı olmayan yerlerde önceki kapanış NaN
+        # olmasın diye ham kapanış ileri doldurulur
+        take = np.maximum(fill_index(~np.isnan(close)), 0)
+        prev_close = np.take_along_axis(close, take, axis=1)[:, :-1]
+        dividend = np.nan_to_num(dividends[:, 1:])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            factor = 1 - dividend / prev_close
+        price_event[:, :-1] *= np.where(np.isfinite(factor) & (factor > 0), factor, 1.0)
+
+    # Sondan başa kümülatif çarpım: her bar kendinden sonraki tüm olayları taşır
+    price_factor = np.cumprod(price_event[:, ::-1], axis=1)[:, ::-1]
+    volume_factor = np.cumprod(volume_event[:, ::-1], axis=1)[:, ::-1]
+    return price_factor, volume_factor
+
+
+class AlignedFrames:
+    """
+    Ana takvimde hizalanmış çoklu sembol matrisleri
+
+    Attributes:
+        calendar (pd.DatetimeIndex): Ana takvim
+        symbols (list): Semboller (satır sırası)
+        values (dict): Sütun -> (sembol x bar) matris (ileri doldurulmuş,
+            istenirse düzeltilmiş; işlem görmeye başlamadan önce NaN)
+        present (np.ndarray): Sembolün o barda gerçek verisi var
+        filled (np.ndarray): Bar ileri doldurmayla üretildi
+        adjusted (bool): Kurumsal işlem düzeltmesi uygulandı
+    """
+
+    def __init__(self, calendar, symbols, values, present, filled, adjusted=False):
+        self.calendar = calendar
+        self.symbols = list(symbols)
+        self.values = values
+        self.present = present
+        self.filled = filled
+        self.adjusted = adjusted
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def listed(self):
+        """Sembol işlem görmeye başlamış (ilk gerçek bardan itibaren)"""
+        return self.present | self.filled
+
+    def matrix(self, column):
+        """(sembol x bar) matris"""
+        return self.values[column]
+
+    def frame(self, column='close'):
+        """
+        (bar x sembol) DataFrame (portfolio.align_closes biçimi)
+
+        Returns:
+            pd.DataFrame: Tarih indeksli, sembol sütunlu fiyatlar
+        """
+        return pd.DataFrame(np.asarray(self.values[column]).T, index=self.calendar,
+                            columns=self.symbols)
+
+    def save(self, path, fingerprint=None):
+        """
+        Matrisleri klasöre .npy olarak yazar
+
+        Önce geçici klasöre yazılıp eski klasörle yer değiştirilir; eski
+        kaydı mmap ile okuyan görünümler bozulmaz.
+
+        Args:
+            path (str): Hedef klasör (varsa üzerine yazılır)
+            fingerprint (str): Girdilerin özeti (load ile doğrulanır)
+        """
+        tmp_dir = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        arrays = dict(self.values, present=self.present, filled=self.filled,
+                      calendar=self.calendar.to_numpy(dtype='datetime64[ns]').view(np.int64))
+        for name, values in arrays.items():
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), values)
+        meta = {'symbols': self.symbols, 'columns': list(self.values), 'adjusted': self.adjusted,
+                'fingerprint': fingerprint}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        old_dir = None
+        if os.path.exists(path):
+            old_dir = f"{path}.old-{os.getpid()}-{time.time_ns()}"
+            os.replace(path, old_dir)
+        os.replace(tmp_dir, path)
+        if old_dir is not None:
+            # POSIX'te açık mmap'ler silinen dosyaları okumaya devam eder
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap=True, fingerprint=None):
+        """Klasörden okur (matrisler mmap ile açılır); yoksa ya da özet farklıysa None"""
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if fingerprint is not None and meta.get('fingerprint') != fingerprint:
+            return None
+
+        mmap_mode = 'r' if mmap else None
+
+        def read(name):
+            return np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+
+        calendar = pd.DatetimeIndex(np.asarray(read('calendar')).view('datetime64[ns]'))
+        values = {name: read(name) for name in meta['columns']}
+        return cls(calendar, meta['symbols'], values, read('present'), read('filled'),
+                   meta['adjusted'])
+
+
+def _cache_key(stocks_data, columns, adjust, normalize):
+    """Önbellek klasörü: sembol kümesi ve seçenekler (veri değişince aynı kalır)"""
+    key = repr((list(stocks_data), list(columns), adjust, normalize))
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _fingerprint(stocks_data, columns, adjust, normalize):
+    """Girdilerin ucuz özeti: sembol, bar sayısı, ilk/son tarih ve son kapanış"""
+    digest = hashlib.sha1(repr((list(columns), adjust, normalize)).encode())
+    for symbol, data in stocks_data.items():
+        dates = pd.DatetimeIndex(data['date'])
+        digest.update(repr((symbol, len(data), str(dates[0]) if len(dates) else '',
+                            str(dates[-1]) if len(dates) else '',
+                            float(data['close'].iloc[-1]) if len(data) else 0.0)).encode())
+    return digest.hexdigest()[:16]
+
+
+def align_frames(stocks_data, columns=ALIGN_COLUMNS, adjust='auto', normalize=True,
+                 cache_dir=None):
+    """
+    Sembol verilerini ana takvimde hizalar
+
+    Tüm sembollerin barları tek diziye birleştirilip (sembol, bar) konumlarına
+    tek seferde dağıtılır; sembol başına reindex/merge yapılmaz.
+
+    Args:
+        stocks_data (dict): Sembol -> 'date' ve OHLCV sütunları olan veri
+        columns (tuple): Hizalanacak sütunlar
+        adjust (bool veya str): Bölünme/temettü düzeltmesi. 'auto' sadece
+            ham veride ('adj close' sütunu varsa) uygular; Yahoo'nun varsayılan
+            (auto_adjust) verisi zaten düzeltilmiştir
+        normalize (bool): Tarihleri güne yuvarla (günlük veri için)
+        cache_dir (str): Verilirse sonuç bu klasörde sembol kümesi başına tek
+            kayıt olarak saklanır; yeni bar gelince aynı kaydın üzerine yazılır
+
+    Returns:
+        AlignedFrames: Hizalanmış matrisler
+    """
+    path = fingerprint = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, _cache_key(stocks_data, columns, adjust, normalize))
+        fingerprint = _fingerprint(stocks_data, columns, adjust, normalize)
+        cached = AlignedFrames.load(path, fingerprint=fingerprint)
+        if cached is not None:
+            return cached
+
+    symbols = [symbol for symbol, data in stocks_data.items() if len(data)]
+    frames = [stocks_data[symbol] for symbol in symbols]
+    stamps = [local_ns(data['date']) for data in frames]
+    lengths = np.array([len(s) for s in stamps], dtype=np.int64)
+
+    # Tek dağıtım: (satır, bar) konumları
+    all_stamps = np.concatenate(stamps) if stamps else np.empty(0, dtype=np.int64)
+    if normalize:
+        all_stamps -= all_stamps % DAY_NS
+    calendar, bar = np.unique(all_stamps, return_inverse=True)
+    row = np.repeat(np.arange(len(symbols)), lengths)
+    shape = (len(symbols), len(calendar))
+
+    present = np.zeros(shape, dtype=bool)
+    present[row, bar] = True
+
+    raw = {}
+    wanted = list(columns)
+    if adjust in (True, 'auto'):
+        wanted += [name for name in ('adj close', 'dividends', 'stock splits') if name not in wanted]
+    for name in wanted:
+        if not all(name in data for data in frames):
+            continue
+        matrix = np.full(shape, np.nan)
+        matrix[row, bar] = np.concatenate([np.asarray(data[name], dtype=np.float64)
+                                           for data in frames])
+        raw[name] = matrix
+
+    # İleri doldurma: her bar son gerçek barın değerini alır
+    last = fill_index(present)
+    listed = last >= 0
+    filled = listed & ~present
+    take = np.maximum(last, 0)
+
+    # Kurumsal işlem faktörleri (ham, doldurulmamış seriler üzerinde)
+    do_adjust = adjust is True or (adjust == 'auto' and 'adj close' in raw)
+    price_factor = volume_factor = None
+    if do_adjust and 'close' in raw:
+        if 'adj close' in raw:
+            # Yahoo'nun ham hacmi bölünmeye göre zaten düzeltilmiştir; sadece
+            # fiyatlara adj close / close oranı uygulanır
+            with np.errstate(invalid='ignore', divide='ignore'):
+                price_factor = raw['adj close'] / raw['close']
+        else:
+            price_factor, volume_factor = adjustment_factors(
+                raw['close'], raw.get('dividends'), raw.get('stock splits'))
+
+    values = {}
+    for name in columns:
+        if name not in raw:
+            continue
+        matrix = raw[name]
+        if price_factor is not None and name in PRICE_COLUMNS:
+            matrix = matrix * price_factor
+        elif volume_factor is not None and name == 'volume':
+            matrix = matrix * volume_factor
+
+        matrix = np.take_along_axis(matrix, take, axis=1)
+        matrix[~listed] = np.nan
+        if name == 'volume':
+            # Doldurulmuş barlarda işlem hacmi yok
+            matrix[filled] = 0.0
+        values[name] = matrix
+
+    aligned = AlignedFrames(pd.DatetimeIndex(calendar.view('datetime64[ns]')), symbols,
+                            values, present, filled, adjusted=price_factor is not None)
+    if path is not None:
+        aligned.save(path, fingerprint)
+    return aligned
@@ -3,14 +3,21 @@ Streamlit Web Arayüzü
 Hisse Senedi Alım-Satım Botu
 """
 
+import hashlib
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import yfinance as yf
-import ta
+from strategy import sma_rsi_macd, bollinger_stochastic
+from backtest_kernel import run_backtest, SIDE_BUY, SIDE_SELL
+from costs import CostModel
+from metrics import compute_metrics, position_from_trades
+from indicators import add_indicators
+from trade_ledger import TradeLedger
+from data_cache import OHLCVCache, period_to_start
+from profiling import PROFILER
+from reporting import DEFAULT_MAX_POINTS
+from app_charts import price_figure, portfolio_figure, rsi_figure
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -19,6 +26,108 @@ st.set_page_config(
     layout="wide"
 )
 
+# Yerel OHLCV önbelleği
+cache = OHLCVCache()
+
+# Streamlit önbellek sınırları (çok kullanıcıda bellek sabit kalsın)
+DATA_TTL = 15 * 60
+MAX_DATA_ENTRIES = 32
+MAX_INDICATOR_ENTRIES = 64
+MAX_BACKTEST_ENTRIES = 128
+
+# Seçilebilir stratejiler (app2 MACD oyu iki yönlüdür)
+APP_STRATEGIES = {
+    "SMA / RSI / MACD": sma_rsi_macd(sma='sma', macd_two_way=True),
+    "Bollinger + Stokastik": bollinger_stochastic(),
+}
+
+# Strateji ne olursa olsun grafiklerde çizilen indikatörler
+CHART_COLUMNS = ('sma', 'rsi', 'bb_upper', 'bb_lower')
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_DATA_ENTRIES, show_spinner=False)
+def load_data(symbol, period):
+    """
+    Veriyi yükler, (symbol, period) anahtarıyla TTL süresince önbellekte tutar
+    
+    Returns:
+        tuple: (veri, sonraki aşamaların anahtarı olan veri özeti)
+    """
+    data = cache.get(symbol, period_to_start(period))
+    if data.empty:
+        raise ValueError(f"{symbol} için veri bulunamadı")
+    
+    data_hash = hashlib.sha1(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes()).hexdigest()
+    return data, data_hash
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_INDICATOR_ENTRIES, show_spinner=False)
+def compute_indicators(_data, data_hash, sma_period, rsi_period, strategy_name):
+    """
+    İndikatörleri ve sinyalleri hesaplar
+    
+    Anahtar: veri özeti + SMA/RSI periyotları + strateji (_data hash'lenmez)
+    """
+    data = _data.copy()
+    strategy = APP_STRATEGIES[strategy_name]
+    
+    # Teknik indikatörler (ta kütüphanesiyle aynı tanımlar, ortak ara sonuçlar bir kez);
+    # sadece stratejinin ve grafiklerin kullandığı sütunlar hesaplanır
+    data = add_indicators(data, {
+        'sma': ('sma', {'window': sma_period}),
+        'rsi': ('rsi_wilder', {'window': rsi_period}),
+        'macd': ('macd', {'adjust': False}, 'macd'),
+        'macd_signal': ('macd', {'adjust': False}, 'signal'),
+        'bb_middle': ('bollinger', {'window': 20, 'ddof': 0}, 'middle'),
+        'bb_upper': ('bollinger', {'window': 20, 'ddof': 0}, 'upper'),
+        'bb_lower': ('bollinger', {'window': 20, 'ddof': 0}, 'lower'),
+        'stoch_k': ('stochastic', {'window': 14}, 'k'),
+        'stoch_d': ('stochastic', {'window': 14}, 'd'),
+    }, only=(strategy.columns | set(CHART_COLUMNS)) - set(_data.columns))
+    
+    # Sinyaller
+    data['signal'] = strategy.signals(data)
+    
+    data['position'] = data['signal'].diff()
+    return data
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_BACKTEST_ENTRIES, show_spinner=False)
+def run_backtest_stage(_data, data_hash, sma_period, rsi_period, strategy_name,
+                       initial_capital, stop_loss, take_profit,
+                       commission=0.0, fee_bps=0.0, slippage_bps=0.0,
+                       volume_impact=0.0, fill='close'):
+    """
+    Backtest'i çalıştırır
+    
+    Anahtar: veri özeti + strateji, risk ve maliyet parametreleri (_data hash'lenmez)
+    
+    Returns:
+        tuple: (final sermaye, portföy değerleri dizisi, TradeLedger, toplam maliyet,
+            performans metrikleri)
+    """
+    costs = CostModel(commission, fee_bps, slippage_bps, volume_impact, fill)
+    # Backtest stratejinin ana indikatörü hesaplanabildiği bardan başlar
+    valid = _data[APP_STRATEGIES[strategy_name].requires[0]].notna().to_numpy()
+    result = run_backtest(
+        _data['close'].to_numpy(),
+        _data['signal'].to_numpy(),
+        valid=valid,
+        initial_capital=initial_capital,
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        costs=costs,
+        open_prices=_data['open'].to_numpy(),
+        volume=_data['volume'].to_numpy()
+    )
+    portfolio_values = result['equity'][valid]
+    trades = TradeLedger.from_result(result, _data['date'])
+    position = position_from_trades(len(_data), result['trade_index'], result['trade_side'])
+    metrics = compute_metrics(result['equity'], position)
+    
+    return result['final_capital'], portfolio_values, trades, result['total_costs'], metrics
+
+
 # Ana başlık
 st.title("🤖 Hisse Senedi Alım-Satım Botu")
 st.markdown("---")
@@ -28,7 +137,7 @@ st.sidebar.header("⚙️ Bot Parametreleri")
 
 # Hisse senedi seçimi
 symbol = st.sidebar.text_input("Hisse Senedi Sembolü", value="AAPL", help="Örn: AAPL, TSLA, GOOGL")
-period = st.sidebar.selectbox("Veri Periyodu", ["1y", "6mo", "3mo", "1mo"])
+period = st.sidebar.selectbox("Veri Periyodu", ["1y", "6mo", "3mo", "1mo", "2y", "5y", "10y", "max"])
 
 # Risk yönetimi
 st.sidebar.subheader("🛡️ Risk Yönetimi")
@@ -38,139 +147,51 @@ initial_capital = st.sidebar.number_input("Başlangıç Sermayesi (TL)", 1000, 1
 
 # Strateji parametreleri
 st.sidebar.subheader("📊 Strateji Parametreleri")
+strategy_name = st.sidebar.selectbox("Strateji", list(APP_STRATEGIES))
 sma_period = st.sidebar.slider("SMA Periyodu", 3, 50, 5)
 rsi_period = st.sidebar.slider("RSI Periyodu", 5, 30, 14)
 
+# İşlem maliyetleri
+st.sidebar.subheader("💸 İşlem Maliyeti")
+commission = st.sidebar.number_input("Komisyon (TL / işlem)", 0.0, 1000.0, 0.0, step=1.0)
+fee_bps = st.sidebar.number_input("Ücret (bps)", 0.0, 100.0, 0.0, step=1.0)
+slippage_bps = st.sidebar.number_input("Sabit Slippage (bps)", 0.0, 100.0, 0.0, step=1.0)
+volume_impact = st.sidebar.number_input("Hacme Orantılı Slippage Katsayısı", 0.0, 10.0, 0.0,
+                                        step=0.05, help="Emir / bar hacmi oranıyla çarpılır")
+fill = "next_open" if st.sidebar.checkbox("Sonraki Bar Açılışında Doldur") else "close"
+
+# Grafik ayarları
+st.sidebar.subheader("🖥️ Grafik")
+max_points = st.sidebar.number_input("En Fazla Grafik Noktası (0 = hepsi)", 0, 100000,
+                                     DEFAULT_MAX_POINTS, step=500)
+decimation = st.sidebar.selectbox("Seyreltme Yöntemi", ["lttb", "minmax"])
+
 # Ana içerik
 if st.button("🚀 Bot'u Başlat", type="primary"):
     
     with st.spinner("Veri çekiliyor ve analiz yapılıyor..."):
         
-        # Veri çekme
+        # Veri çekme (yerel önbellek, sadece yeni barlar indirilir)
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
-            data.reset_index(inplace=True)
-            data.columns = [col.lower() for col in data.columns]
-            
+            with PROFILER.stage('app.load_data', symbol=symbol):
+                data, data_hash = load_data(symbol, period)
             st.success(f"✅ {symbol} için {len(data)} günlük veri çekildi")
             
         except Exception as e:
             st.error(f"❌ Veri çekme hatası: {e}")
             st.stop()
         
-        # Teknik indikatörler
-        data['sma'] = data['close'].rolling(window=sma_period).mean()
-        data['rsi'] = ta.momentum.RSIIndicator(data['close'], window=rsi_period).rsi()
-        
-        # MACD
-        macd = ta.trend.MACD(data['close'])
-        data['macd'] = macd.macd()
-        data['macd_signal'] = macd.macd_signal()
-        
-        # Bollinger Bands
-        bb = ta.volatility.BollingerBands(data['close'])
-        data['bb_upper'] = bb.bollinger_hband()
-        data['bb_lower'] = bb.bollinger_lband()
-        
-        # Sinyaller
-        data['signal'] = 0
-        data['position'] = 0
-        
-        for i in range(1, len(data)):
-            if pd.isna(data['sma'].iloc[i]) or pd.isna(data['rsi'].iloc[i]):
-                continue
-                
-            # Kombine sinyal
-            sma_signal = 1 if data['close'].iloc[i] > data['sma'].iloc[i] else -1
-            rsi_signal = 1 if data['rsi'].iloc[i] < 30 else (-1 if data['rsi'].iloc[i] > 70 else 0)
-            macd_signal = 1 if data['macd'].iloc[i] > data['macd_signal'].iloc[i] else -1
-            
-            combined_signal = (sma_signal * 0.5 + rsi_signal * 0.3 + macd_signal * 0.2)
-            
-            if combined_signal > 0.3:
-                data.loc[data.index[i], 'signal'] = 1
-            elif combined_signal < -0.3:
-                data.loc[data.index[i], 'signal'] = -1
-        
-        data['position'] = data['signal'].diff()
+        # İndikatörler ve sinyaller
+        with PROFILER.stage('app.compute_indicators', symbol=symbol):
+            data = compute_indicators(data, data_hash, sma_period, rsi_period, strategy_name)
         
         # Backtesting
-        capital = initial_capital
-        shares = 0
-        portfolio_values = []
-        trades = []
-        entry_price = 0
-        
-        for i, row in data.iterrows():
-            if pd.isna(row['sma']):
-                continue
-                
-            current_price = row['close']
-            signal = row['signal']
-            
-            # Al sinyali
-            if signal == 1 and shares == 0:
-                shares = capital / current_price
-                capital = 0
-                entry_price = current_price
-                trades.append({
-                    'date': row['date'],
-                    'action': 'BUY',
-                    'price': current_price,
-                    'shares': shares
-                })
-            
-            # Sat sinyali
-            elif signal == -1 and shares > 0:
-                capital = shares * current_price
-                trades.append({
-                    'date': row['date'],
-                    'action': 'SELL',
-                    'price': current_price,
-                    'shares': shares
-                })
-                shares = 0
-            
-            # Risk yönetimi
-            elif shares > 0:
-                # Stop-loss
-                if current_price <= entry_price * (1 - stop_loss):
-                    capital = shares * current_price
-                    trades.append({
-                        'date': row['date'],
-                        'action': 'SELL',
-                        'price': current_price,
-                        'shares': shares,
-                        'reason': 'Stop-Loss'
-                    })
-                    shares = 0
-                # Take-profit
-                elif current_price >= entry_price * (1 + take_profit):
-                    capital = shares * current_price
-                    trades.append({
-                        'date': row['date'],
-                        'action': 'SELL',
-                        'price': current_price,
-                        'shares': shares,
-                        'reason': 'Take-Profit'
-                    })
-                    shares = 0
-            
-            # Portföy değeri
-            portfolio_value = shares * current_price if shares > 0 else capital
-            portfolio_values.append(portfolio_value)
-        
-        # Son pozisyonu kapat
-        if shares > 0:
-            capital = shares * data['close'].iloc[-1]
-            trades.append({
-                'date': data['date'].iloc[-1],
-                'action': 'SELL',
-                'price': data['close'].iloc[-1],
-                'shares': shares,
-                'reason': 'Final'
-            })
+        with PROFILER.stage('app.backtest', symbol=symbol):
+            capital, portfolio_values, trades, total_costs, metrics = run_backtest_stage(
+                data, data_hash, sma_period, rsi_period, strategy_name,
+                initial_capital, stop_loss, take_profit,
+                commission, fee_bps, slippage_bps, volume_impact, fill
+            )
         
         # Sonuçlar
         final_capital = capital
@@ -191,134 +212,60 @@ if st.button("🚀 Bot'u Başlat", type="primary"):
         with col4:
             st.metric("🔄 İşlem Sayısı", len(trades))
         
-        # Grafikler
-        st.subheader("📊 Analiz Grafikleri")
-        
-        # 1. Hisse fiyatı ve sinyaller
-        fig1 = go.Figure()
+        col5, col6, col7, col8 = st.columns(4)
         
-        # Fiyat çizgisi
-        fig1.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['close'],
-            mode='lines',
-            name='Hisse Fiyatı',
-            line=dict(color='blue', width=2)
-        ))
+        with col5:
+            st.metric("📐 Sharpe", f"{metrics['sharpe']:.2f}",
+                      help=f"Sortino: {metrics['sortino']:.2f} | CAGR: {metrics['cagr'] * 100:.2f}%")
         
-        # SMA
-        fig1.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['sma'],
-            mode='lines',
-            name=f'SMA {sma_period}',
-            line=dict(color='orange', width=2)
-        ))
+        with col6:
+            st.metric("📉 Max Drawdown", f"{metrics['max_drawdown'] * 100:.2f}%",
+                      help=f"Zirvenin altında en uzun süre: {metrics['max_drawdown_bars']:.0f} bar")
         
-        # Bollinger Bands
-        fig1.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['bb_upper'],
-            mode='lines',
-            name='BB Üst',
-            line=dict(color='gray', dash='dash'),
-            showlegend=False
-        ))
+        with col7:
+            st.metric("🎯 Kazanma Oranı", f"{metrics['win_rate'] * 100:.1f}%",
+                      help=f"{metrics['round_trips']:.0f} al-sat döngüsü")
         
-        fig1.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['bb_lower'],
-            mode='lines',
-            name='Bollinger Bands',
-            line=dict(color='gray', dash='dash'),
-            fill='tonexty'
-        ))
+        with col8:
+            st.metric("⏳ Piyasada", f"{metrics['exposure'] * 100:.1f}%",
+                      help=f"Devir hızı: {metrics['turnover']:.1f}x/yıl")
         
-        # Al/sat sinyalleri
-        buy_signals = data[data['position'] == 1]
-        sell_signals = data[data['position'] == -1]
+        if total_costs:
+            st.caption(f"💸 Toplam işlem maliyeti (ücret + komisyon + slippage): {total_costs:,.2f} TL")
         
-        fig1.add_trace(go.Scatter(
-            x=buy_signals['date'],
-            y=buy_signals['close'],
-            mode='markers',
-            name='Al Sinyali',
-            marker=dict(color='green', size=10, symbol='triangle-up')
-        ))
-        
-        fig1.add_trace(go.Scatter(
-            x=sell_signals['date'],
-            y=sell_signals['close'],
-            mode='markers',
-            name='Sat Sinyali',
-            marker=dict(color='red', size=10, symbol='triangle-down')
-        ))
+        # Grafikler
+        st.subheader("📊 Analiz Grafikleri")
         
-        fig1.update_layout(
-            title=f'{symbol} Hisse Senedi Fiyatı ve Sinyaller',
-            xaxis_title='Tarih',
-            yaxis_title='Fiyat (TL)',
-            height=500
-        )
+        # 1. Hisse fiyatı ve sinyaller (uzun seriler tarayıcıya gönderilmeden seyreltilir)
+        fig1 = price_figure(data, symbol, sma_period, max_points, decimation)
         
-        st.plotly_chart(fig1, use_container_width=True)
+        with PROFILER.stage('app.render_price', symbol=symbol):
+            st.plotly_chart(fig1, use_container_width=True)
         
         # 2. Portföy değeri
-        fig2 = go.Figure()
+        fig2 = portfolio_figure(data['date'], portfolio_values, initial_capital,
+                                max_points, decimation)
         
-        fig2.add_trace(go.Scatter(
-            x=data['date'][:len(portfolio_values)],
-            y=portfolio_values,
-            mode='lines',
-            name='Portföy Değeri',
-            line=dict(color='purple', width=3)
-        ))
-        
-        fig2.add_hline(
-            y=initial_capital,
-            line_dash="dash",
-            line_color="red",
-            annotation_text=f"Başlangıç Sermayesi ({initial_capital:,} TL)"
-        )
-        
-        fig2.update_layout(
-            title='Portföy Değeri Değişimi',
-            xaxis_title='Tarih',
-            yaxis_title='Portföy Değeri (TL)',
-            height=400
-        )
-        
-        st.plotly_chart(fig2, use_container_width=True)
+        with PROFILER.stage('app.render_portfolio', symbol=symbol):
+            st.plotly_chart(fig2, use_container_width=True)
         
         # 3. RSI grafiği
-        fig3 = go.Figure()
+        fig3 = rsi_figure(data, max_points, decimation)
         
-        fig3.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['rsi'],
-            mode='lines',
-            name='RSI',
-            line=dict(color='purple', width=2)
-        ))
+        with PROFILER.stage('app.render_rsi', symbol=symbol):
+            st.plotly_chart(fig3, use_container_width=True)
         
-        fig3.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
-        fig3.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
-        
-        fig3.update_layout(
-            title='RSI (Relative Strength Index)',
-            xaxis_title='Tarih',
-            yaxis_title='RSI',
-            yaxis=dict(range=[0, 100]),
-            height=400
-        )
-        
-        st.plotly_chart(fig3, use_container_width=True)
+        # Tarayıcıya gönderilen grafik verisi
+        figures = (fig1, fig2, fig3)
+        payload = sum(len(fig.to_json()) for fig in figures)
+        points = sum(len(trace.x) for fig in figures for trace in fig.data)
+        st.caption(f"📦 Grafik verisi: {payload / 1024:,.0f} KB ({points:,} nokta, {len(data):,} bar)")
         
         # İşlem detayları
         st.subheader("📋 İşlem Detayları")
         
         if trades:
-            trades_df = pd.DataFrame(trades)
+            trades_df = trades.to_frame().drop(columns='bar')
             st.dataframe(trades_df, use_container_width=True)
         else:
             st.info("Hiç işlem yapılmadı.")
@@ -327,16 +274,16 @@ if st.button("🚀 Bot'u Başlat", type="primary"):
         st.subheader("📊 İstatistikler")
         
         if trades:
-            buy_trades = [t for t in trades if t['action'] == 'BUY']
-            sell_trades = [t for t in trades if t['action'] == 'SELL']
+            buy_trades = trades.count(SIDE_BUY)
+            sell_trades = trades.count(SIDE_SELL)
             
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric("🟢 Al İşlemleri", len(buy_trades))
+                st.metric("🟢 Al İşlemleri", buy_trades)
             
             with col2:
-                st.metric("🔴 Sat İşlemleri", len(sell_trades))
+                st.metric("🔴 Sat İşlemleri", sell_trades)
             
             with col3:
                 if len(trades) > 0:
@@ -344,6 +291,11 @@ if st.button("🚀 Bot'u Başlat", type="primary"):
                     last_trade = trades[-1]['date']
                     st.metric("📅 İşlem Süresi", f"{(last_trade - first_trade).days} gün")
 
+        # Aşama profili (BOT_PROFILE=1 ile açılır)
+        if PROFILER.enabled:
+            with st.expander("⏱️ Aşama Profili"):
+                st.dataframe(PROFILER.summary(), use_container_width=True)
+
 # Footer
 st.markdown("---")
 st.markdown("🤖 **Hisse Senedi Alım-Satım Botu** - Gelişmiş analiz ve risk yönetimi")
@@ -0,0 +1,183 @@
+"""
+Web Arayüzü Grafikleri
+app2.py'nin plotly grafiklerini üreten fonksiyonlar; Streamlit'e bağlı
+olmadıkları için benchmark tarafından ayrıca ölçülebilir.
+Uzun seriler tarayıcıya gönderilmeden sunucuda seyreltilir.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from reporting import DEFAULT_MAX_POINTS, decimate_indices, thin_markers
+
+# Bu bar sayısından itibaren WebGL (Scattergl) izleri kullanılır
+WEBGL_MIN_POINTS = 1000
+
+
+def scatter_type(n_points):
+    """Nokta sayısına göre go.Scatter ya da WebGL'li go.Scattergl döndürür"""
+    return go.Scattergl if n_points >= WEBGL_MIN_POINTS else go.Scatter
+
+
+def line_trace(x, y, indices, **kwargs):
+    """
+    Sunucuda seyreltilmiş çizgi izi oluşturur
+
+    Args:
+        x (pd.Series): Tarihler (y'den uzunsa baştan kırpılır)
+        y (array-like): Değerler
+        indices (np.ndarray): Gönderilecek noktalar (decimate_indices)
+        **kwargs: go.Scatter/go.Scattergl parametreleri
+    """
+    y = np.asarray(y, dtype=np.float64)
+    return scatter_type(len(y))(x=x.iloc[:len(y)].iloc[indices], y=y[indices], mode='lines', **kwargs)
+
+
+def price_figure(data, symbol, sma_period, max_points=DEFAULT_MAX_POINTS, decimation='lttb'):
+    """
+    Fiyat, SMA, Bollinger bantları ve al/sat sinyalleri grafiği
+
+    Args:
+        data (pd.DataFrame): 'date', 'close', 'sma', 'bb_upper', 'bb_lower'
+            ve 'position' sütunları olan veri
+        symbol (str): Başlıktaki sembol
+        sma_period (int): Göstergedeki SMA periyodu
+        max_points (int): En fazla nokta (0 ise hepsi)
+        decimation (str): 'lttb' ya da 'minmax'
+
+    Returns:
+        go.Figure: Fiyat grafiği
+    """
+    price_points = decimate_indices(data['close'].to_numpy(), max_points, decimation)
+
+    fig = go.Figure()
+
+    # Fiyat çizgisi
+    fig.add_trace(line_trace(
+        data['date'], data['close'], price_points,
+        name='Hisse Fiyatı',
+        line=dict(color='blue', width=2)
+    ))
+
+    # SMA
+    fig.add_trace(line_trace(
+        data['date'], data['sma'], price_points,
+        name=f'SMA {sma_period}',
+        line=dict(color='orange', width=2)
+    ))
+
+    # Bollinger Bands
+    fig.add_trace(line_trace(
+        data['date'], data['bb_upper'], price_points,
+        name='BB Üst',
+        line=dict(color='gray', dash='dash'),
+        showlegend=False
+    ))
+
+    fig.add_trace(line_trace(
+        data['date'], data['bb_lower'], price_points,
+        name='Bollinger Bands',
+        line=dict(color='gray', dash='dash'),
+        fill='tonexty'
+    ))
+
+    # Al/sat sinyalleri
+    buy_signals = thin_markers(data[data['position'] == 1], max_points)
+    sell_signals = thin_markers(data[data['position'] == -1], max_points)
+
+    fig.add_trace(scatter_type(len(data))(
+        x=buy_signals['date'],
+        y=buy_signals['close'],
+        mode='markers',
+        name='Al Sinyali',
+        marker=dict(color='green', size=10, symbol='triangle-up')
+    ))
+
+    fig.add_trace(scatter_type(len(data))(
+        x=sell_signals['date'],
+        y=sell_signals['close'],
+        mode='markers',
+        name='Sat Sinyali',
+        marker=dict(color='red', size=10, symbol='triangle-down')
+    ))
+
+    fig.update_layout(
+        title=f'{symbol} Hisse Senedi Fiyatı ve Sinyaller',
+        xaxis_title='Tarih',
+        yaxis_title='Fiyat (TL)',
+        height=500
+    )
+    return fig
+
+
+def portfolio_figure(dates, portfolio_values, initial_capital, max_points=DEFAULT_MAX_POINTS,
+                     decimation='lttb'):
+    """
+    Portföy değeri grafiği
+
+    Args:
+        dates (pd.Series): Tarihler (portföy değerlerinden uzunsa baştan kırpılır)
+        portfolio_values (np.ndarray): Portföy değerleri
+        initial_capital (float): Başlangıç sermayesi çizgisi
+        max_points (int): En fazla nokta (0 ise hepsi)
+        decimation (str): 'lttb' ya da 'minmax'
+
+    Returns:
+        go.Figure: Portföy grafiği
+    """
+    fig = go.Figure()
+
+    fig.add_trace(line_trace(
+        dates, portfolio_values,
+        decimate_indices(portfolio_values, max_points, decimation),
+        name='Portföy Değeri',
+        line=dict(color='purple', width=3)
+    ))
+
+    fig.add_hline(
+        y=initial_capital,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Başlangıç Sermayesi ({initial_capital:,} TL)"
+    )
+
+    fig.update_layout(
+        title='Portföy Değeri Değişimi',
+        xaxis_title='Tarih',
+        yaxis_title='Portföy Değeri (TL)',
+        height=400
+    )
+    return fig
+
+
+def rsi_figure(data, max_points=DEFAULT_MAX_POINTS, decimation='lttb'):
+    """
+    RSI grafiği (aşırı alım/satım seviyeleriyle)
+
+    Args:
+        data (pd.DataFrame): 'date' ve 'rsi' sütunları olan veri
+        max_points (int): En fazla nokta (0 ise hepsi)
+        decimation (str): 'lttb' ya da 'minmax'
+
+    Returns:
+        go.Figure: RSI grafiği
+    """
+    fig = go.Figure()
+
+    fig.add_trace(line_trace(
+        data['date'], data['rsi'],
+        decimate_indices(data['rsi'].to_numpy(), max_points, decimation),
+        name='RSI',
+        line=dict(color='purple', width=2)
+    ))
+
+    fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
+    fig.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
+
+    fig.update_layout(
+        title='RSI (Relative Strength Index)',
+        xaxis_title='Tarih',
+        yaxis_title='RSI',
+        yaxis=dict(range=[0, 100]),
+        height=400
+    )
+    return fig
@@ -0,0 +1,233 @@
+"""
+Backtest Çekirdeği
+Sadece-uzun (long-only) pozisyon döngüsünü düz float dizileri üzerinde çalıştırır.
+Numba kuruluysa döngü JIT ile derlenir, değilse aynı kod saf Python ile çalışır.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# İşlem yönleri
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+# Çıkış nedenleri
+REASON_SIGNAL = 0
+REASON_STOP_LOSS = 1
+REASON_TAKE_PROFIT = 2
+REASON_FINAL = 3
+
+REASON_NAMES = {
+    REASON_SIGNAL: 'Signal',
+    REASON_STOP_LOSS: 'Stop-Loss',
+    REASON_TAKE_PROFIT: 'Take-Profit',
+    REASON_FINAL: 'Final',
+}
+
+
+def _backtest_loop(close, signal, valid, initial_capital, stop_loss, take_profit,
+                   fill_price, fill_volume, delay, fee_rate, commission, slippage, volume_impact,
+                   equity, trade_index, trade_side, trade_price, trade_shares, trade_reason):
+    """
+    Durum makinesi döngüsü (JIT ile derlenebilir)
+
+    Kararlar kapanışla verilir, işlem fill_price[i] fiyatından (delay > 0
+    ise sonraki barın açılışında) maliyetlerle birlikte gerçekleşir.
+    Çıktı dizilerini yerinde doldurur; işlem sayısını, final sermayeyi ve
+    toplam işlem maliyetini döndürür.
+    """
+    n = len(close)
+    capital = initial_capital
+    shares = 0.0
+    entry_price = 0.0
+    n_trades = 0
+    total_cost = 0.0
+
+    for i in range(n):
+        if not valid[i]:
+            continue
+
+        current_price = close[i]
+        sig = signal[i]
+
+        # Gecikmeli dolumda barın değeri işlemden önceki pozisyonla ölçülür
+        if shares > 0:
+            pre_trade_value = shares * current_price
+        else:
+            pre_trade_value = capital
+
+        side = 0
+        reason = REASON_SIGNAL
+        if sig == 1 and shares == 0:
+            side = SIDE_BUY
+        elif sig == -1 and shares > 0:
+            side = SIDE_SELL
+        elif shares > 0:
+            # Risk yönetimi
+            if stop_loss > 0 and current_price <= entry_price * (1 - stop_loss):
+                side = SIDE_SELL
+                reason = REASON_STOP_LOSS
+            elif take_profit > 0 and current_price >= entry_price * (1 + take_profit):
+                side = SIDE_SELL
+                reason = REASON_TAKE_PROFIT
+
+        # Dolum fiyatı yoksa (son bar, sonraki açılış) işlem yapılmaz
+        raw_price = fill_price[i]
+        if side != 0 and raw_price == raw_price:
+            if side == SIDE_BUY:
+                cash = capital - commission
+                slip = slippage
+                if volume_impact > 0 and fill_volume[i] > 0:
+                    slip += volume_impact * (cash / raw_price) / fill_volume[i]
+                price = raw_price * (1 + slip)
+                if cash > 0:
+                    shares = cash / (price * (1 + fee_rate))
+                    total_cost += capital - shares * raw_price
+                    capital = 0.0
+                    entry_price = price
+            else:
+                slip = slippage
+                if volume_impact > 0 and fill_volume[i] > 0:
+                    slip += volume_impact * shares / fill_volume[i]
+                price = raw_price * (1 - slip)
+                capital = shares * price * (1 - fee_rate) - commission
+                total_cost += shares * raw_price - capital
+
+            if shares > 0 or side == SIDE_SELL:
+                trade_index[n_trades] = i + delay
+                trade_side[n_trades] = side
+                trade_price[n_trades] = price
+                trade_shares[n_trades] = shares
+                trade_reason[n_trades] = reason
+                n_trades += 1
+                if side == SIDE_SELL:
+                    shares = 0.0
+
+        # Portföy değeri
+        if delay > 0 and side != 0:
+            equity[i] = pre_trade_value
+        elif shares > 0:
+            equity[i] = shares * current_price
+        else:
+            equity[i] = capital
+
+    # Son pozisyonu kapat (son kapanıştan, maliyetlerle)
+    if shares > 0 and n > 0:
+        slip = slippage
+        if volume_impact > 0 and fill_volume[n - 1] > 0:
+            slip += volume_impact * shares / fill_volume[n - 1]
+        price = close[n - 1] * (1 - slip)
+        capital = shares * price * (1 - fee_rate) - commission
+        total_cost += shares * close[n - 1] - capital
+        trade_index[n_trades] = n - 1
+        trade_side[n_trades] = SIDE_SELL
+        trade_price[n_trades] = price
+        trade_shares[n_trades] = shares
+        trade_reason[n_trades] = REASON_FINAL
+        n_trades += 1
+
+    return n_trades, capital, total_cost
+
+
+if NUMBA_AVAILABLE:
+    _backtest_loop_jit = njit(cache=True)(_backtest_loop)
+else:
+    _backtest_loop_jit = None
+
+
+def run_backtest(close, signal, valid=None, initial_capital=10000.0,
+                 stop_loss=0.0, take_profit=0.0, use_jit=True,
+                 costs=None, open_prices=None, volume=None):
+    """
+    Ortak backtest çekirdeğini çalıştırır
+
+    Args:
+        close (array-like): Kapanış fiyatları
+        signal (array-like): 1 (al), -1 (sat), 0 (bekle) sinyalleri
+        valid (array-like): False olan barlar atlanır (örn. SMA henüz yokken)
+        initial_capital (float): Başlangıç sermayesi
+        stop_loss (float): Zarar-kes oranı (0 ise kapalı)
+        take_profit (float): Kâr-al oranı (0 ise kapalı)
+        use_jit (bool): Numba varsa derlenmiş döngüyü kullan
+        costs (CostModel): İşlem maliyeti modeli (None ise maliyetsiz,
+            kapanıştan dolum)
+        open_prices (array-like): Açılış fiyatları ('next_open' dolumu için)
+        volume (array-like): Bar hacimleri (hacme orantılı slippage için)
+
+    Returns:
+        dict: equity (atlanan barlarda NaN), final_capital, total_return,
+            total_costs (ücret + komisyon + slippage) ve trade_* dizileri;
+            trade_price maliyetli dolum fiyatıdır
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signal = np.ascontiguousarray(signal, dtype=np.int64)
+    n = len(close)
+    if valid is None:
+        valid = np.ones(n, dtype=np.bool_)
+    else:
+        valid = np.ascontiguousarray(valid, dtype=np.bool_)
+
+    # Her barda en fazla bir işlem + son kapanış
+    equity = np.full(n, np.nan)
+    trade_index = np.empty(n + 1, dtype=np.int64)
+    trade_side = np.empty(n + 1, dtype=np.int8)
+    trade_price = np.empty(n + 1, dtype=np.float64)
+    trade_shares = np.empty(n + 1, dtype=np.float64)
+    trade_reason = np.empty(n + 1, dtype=np.int8)
+
+    if costs is None:
+        fill_price, fill_volume = close, np.zeros(n)
+        delay, fee_rate, commission, slippage, volume_impact = 0, 0.0, 0.0, 0.0, 0.0
+    else:
+        fill_price, fill_volume = costs.fill_arrays(close, open_prices, volume)
+        delay, fee_rate, commission = costs.delay, costs.fee_rate, costs.commission
+        slippage, volume_impact = costs.slippage, costs.volume_impact
+
+    if use_jit and _backtest_loop_jit is not None:
+        n_trades, final_capital, total_costs = _backtest_loop_jit(
+            close, signal, valid, float(initial_capital), float(stop_loss), float(take_profit),
+            fill_price, fill_volume, delay, fee_rate, commission, slippage, volume_impact,
+            equity, trade_index, trade_side, trade_price, trade_shares, trade_reason
+        )
+    else:
+        # Saf Python'da liste erişimi NumPy skaler erişiminden hızlıdır
+        n_trades, final_capital, total_costs = _backtest_loop(
+            close.tolist(), signal.tolist(), valid.tolist(),
+            float(initial_capital), float(stop_loss), float(take_profit),
+            fill_price.tolist(), fill_volume.tolist(), delay, fee_rate, commission,
+            slippage, volume_impact,
+            equity, trade_index, trade_side, trade_price, trade_shares, trade_reason
+        )
+
+    return {
+        'equity': equity,
+        'final_capital': final_capital,
+        'total_return': (final_capital - initial_capital) / initial_capital * 100,
+        'total_costs': total_costs if costs is not None else 0.0,
+        'trade_index': trade_index[:n_trades],
+        'trade_side': trade_side[:n_trades],
+        'trade_price': trade_price[:n_trades],
+        'trade_shares': trade_shares[:n_trades],
+        'trade_reason': trade_reason[:n_trades],
+    }
+
+
+def iter_trades(result):
+    """
+    Çekirdek sonucundaki işlemleri sırayla gezer
+
+    Yields:
+        tuple: (bar indeksi, 'BUY'/'SELL', fiyat, adet, neden adı)
+    """
+    for idx, side, price, shares, reason in zip(result['trade_index'].tolist(),
+                                                result['trade_side'].tolist(),
+                                                result['trade_price'].tolist(),
+                                                result['trade_shares'].tolist(),
+                                                result['trade_reason'].tolist()):
+        action = 'BUY' if side == SIDE_BUY else 'SELL'
+        yield idx, action, price, shares, REASON_NAMES[reason]
@@ -0,0 +1,192 @@
+"""
+Gün İçi (Intraday) Bar Yardımcıları
+Aralık tanımları, bar ya da zaman cinsinden indikatör pencereleri,
+float32/int32 sütunlu kompakt veri ve vektörel yeniden örnekleme (resampling)
+"""
+
+import re
+import math
+import numpy as np
+import pandas as pd
+from data_cache import INTERVAL_STEPS
+
+INTRADAY_INTERVALS = ('1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h')
+
+# pandas resample kuralları
+RESAMPLE_RULES = {
+    '1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min',
+    '60m': '1h', '90m': '90min', '1h': '1h', '1d': '1D', '5d': '5D', '1wk': 'W-FRI',
+}
+
+# Seans saatleri (örnek gün içi veri için, borsa yerel saati)
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj close', 'dividends', 'stock splits')
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def is_intraday(interval):
+    """Aralık gün içi mi"""
+    return interval in INTRADAY_INTERVALS
+
+
+def interval_step(interval):
+    """Aralığın süresini döndürür"""
+    if interval not in INTERVAL_STEPS:
+        raise ValueError(f"Bilinmeyen aralık: {interval}")
+    return INTERVAL_STEPS[interval]
+
+
+# Seans cinsinden süre birimleri (gün = bir seans, hafta = beş seans)
+SESSION_UNITS = {'d': 1, 'day': 1, 'days': 1, 'w': 5, 'wk': 5, 'week': 5, 'weeks': 5}
+
+# Günlük ve üstü aralıklarda bir barın kapsadığı seans sayısı
+SESSIONS_PER_BAR = {'1d': 1, '5d': 5, '1wk': 5}
+
+
+def _sessions(window):
+    """'5D', '2W' gibi gün/hafta süresini seans sayısına çevirir (değilse None)"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([A-Za-z]+)\s*', window)
+    if match is None or match.group(2).lower() not in SESSION_UNITS:
+        return None
+    return float(match.group(1)) * SESSION_UNITS[match.group(2).lower()]
+
+
+def window_bars(window, interval='1d'):
+    """
+    İndikatör penceresini bar sayısına çevirir
+
+    Gün ve hafta süreleri takvim süresi değil seans sayısıdır: '1D' bir
+    seansın barları (1m aralıkta 390), '1W' beş seanstır. Seans içi süreler
+    ('30min', '2h') aralık adımına bölünür.
+
+    Args:
+        window (int veya str): Bar sayısı (5) ya da süre ('30min', '2h', '20D', '4W')
+        interval (str): Bar aralığı
+
+    Returns:
+        int: Bar sayısı
+    """
+    if isinstance(window, (int, np.integer)):
+        return int(window)
+
+    sessions = _sessions(window)
+    if sessions is not None:
+        if is_intraday(interval):
+            bars = sessions * bars_per_session(interval)
+        else:
+            interval_step(interval)
+            bars = sessions / SESSIONS_PER_BAR.get(interval, 1)
+    else:
+        bars = pd.Timedelta(window) / interval_step(interval)
+    if bars < 1:
+        raise ValueError(f"{window} penceresi {interval} aralığında bir bardan kısa")
+    return int(round(bars))
+
+
+def compact_frame(data, symbol=None, categorical_symbol=True, price_dtype=np.float32):
+    """
+    Fiyatları float32, hacmi int32 yaparak veriyi küçültür
+
+    Hacim int32'ye sığmıyorsa float32'de tutulur. Tarih datetime64[ns] kalır.
+
+    Args:
+        data (pd.DataFrame): Küçük harfli OHLCV sütunları olan veri
+        symbol (str): Verilirse 'symbol' sütunu eklenir
+        categorical_symbol (bool): 'symbol' sütununu kategorik yap
+        price_dtype: Fiyat sütunlarının tipi
+
+    Returns:
+        pd.DataFrame: Küçültülmüş kopya
+    """
+    data = data.copy()
+    for name in data.columns:
+        if name in PRICE_COLUMNS:
+            data[name] = data[name].astype(price_dtype)
+        elif name == 'volume':
+            volume = data[name].fillna(0).to_numpy()
+            fits = len(volume) == 0 or (volume.min() >= 0 and volume.max() <= INT32_MAX)
+            data[name] = volume.astype(np.int32 if fits else np.float32)
+
+    if symbol is not None:
+        data['symbol'] = symbol
+    if categorical_symbol and 'symbol' in data.columns:
+        data['symbol'] = data['symbol'].astype('category')
+    return data
+
+
+def memory_mb(data):
+    """Verinin bellek kullanımı (MB, derin)"""
+    return data.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def resample_bars(data, interval, by='symbol'):
+    """
+    Barları daha büyük bir aralığa toplar (örn. 1m -> 5m, 1h -> 1d)
+
+    open ilk, high en büyük, low en küçük, close son değer, volume toplam
+    olarak alınır; barı olmayan aralıklar atılır.
+
+    Args:
+        data (pd.DataFrame): 'date' ve OHLCV sütunları olan veri
+        interval (str): Hedef aralık
+        by (str): Varsa bu sütuna göre (sembol başına) ayrı toplanır
+
+    Returns:
+        pd.DataFrame: Yeniden örneklenmiş veri (aynı sütun tipleri)
+    """
+    rule = RESAMPLE_RULES.get(interval)
+    if rule is None:
+        raise ValueError(f"Bilinmeyen aralık: {interval}")
+
+    how = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    how = {name: agg for name, agg in how.items() if name in data.columns}
+
+    grouped = by in data.columns
+    keys = [pd.Grouper(key='date', freq=rule)]
+    if grouped:
+        keys.insert(0, by)
+
+    resampled = data.groupby(keys, observed=True, sort=True).agg(how)
+    resampled = resampled.dropna(subset=['close']).reset_index()
+    for name in how:
+        # Toplanan hacim int32'ye sığmıyorsa int64 kalır
+        if name == 'volume' and len(resampled) and resampled[name].max() > INT32_MAX:
+            continue
+        resampled[name] = resampled[name].astype(data[name].dtype)
+    if grouped and isinstance(data[by].dtype, pd.CategoricalDtype):
+        resampled[by] = resampled[by].astype(data[by].dtype)
+    return resampled
+
+
+def bars_per_session(interval):
+    """
+    Bir seanstaki bar sayısı (günlük ve üstü aralıklarda 1)
+
+    Seans adıma tam bölünmüyorsa son bar kısmidir ve sayılır (Yahoo 1h
+    aralıkta 7, 90m aralıkta 5 bar döndürür).
+    """
+    if not is_intraday(interval):
+        return 1
+    return max(math.ceil((SESSION_CLOSE - SESSION_OPEN) / interval_step(interval)), 1)
+
+
+def session_index(start, n_bars, interval):
+    """
+    İş günlerinin seans saatleri içinde n_bars adet bar zamanı üretir
+
+    Args:
+        start (str): Başlangıç günü
+        n_bars (int): Bar sayısı
+        interval (str): Gün içi aralık
+
+    Returns:
+        pd.DatetimeIndex: Bar zamanları
+    """
+    step = interval_step(interval)
+    per_day = bars_per_session(interval)
+    days = pd.bdate_range(start, periods=-(-n_bars // per_day))
+    offsets = (SESSION_OPEN + pd.to_timedelta(np.arange(per_day) * step.value)).to_numpy()
+    stamps = (days.to_numpy()[:, None] + offsets[None, :]).ravel()
+    return pd.DatetimeIndex(stamps[:n_bars])
@@ -0,0 +1,136 @@
+"""
+Toplu (Batch) Backtest
+Binlerce SMA penceresini tek dizi geçişinde değerlendirir
+"""
+
+import numpy as np
+from signals import combined_signals
+
+
+def sma_matrix(close, windows):
+    """
+    Tüm pencereler için SMA matrisini tek kümülatif toplamla hesaplar
+
+    Args:
+        close (array-like): Kapanış fiyatları
+        windows (array-like): SMA pencere uzunlukları
+
+    Returns:
+        np.ndarray: (pencere x bar) boyutlu SMA matrisi, ilk window-1 bar NaN
+    """
+    close = np.asarray(close, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    n = len(close)
+
+    csum = np.concatenate(([0.0], np.cumsum(close)))
+    bars = np.arange(n)
+    end = bars + 1
+    start = end - windows[:, None]
+
+    sma = (csum[end] - csum[np.maximum(start, 0)]) / windows[:, None]
+    sma[start < 0] = np.nan
+    return sma
+
+
+def positions_from_signals(signal):
+    """
+    Sinyal matrisinden sadece-uzun pozisyon matrisini çıkarır
+
+    Al sinyali düz pozisyonda alım, sat sinyali açık pozisyonda satış
+    yaptığı için pozisyon, son sıfır olmayan sinyalin 1 olmasıdır.
+
+    Args:
+        signal (np.ndarray): (çalıştırma x bar) sinyal matrisi
+
+    Returns:
+        np.ndarray: Bar kapanışında pozisyon açıksa True
+    """
+    n = signal.shape[-1]
+    last = np.where(signal != 0, np.arange(n), 0)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    return np.take_along_axis(signal, last, axis=-1) == 1
+
+
+def equity_matrix(close, position, initial_capital=10000.0):
+    """
+    Pozisyon matrisinden portföy değerlerini hesaplar
+
+    Her bar getirisi, bir önceki barın kapanışında pozisyon açıksa uygulanır;
+    düz pozisyonda sermaye sabit kalır.
+
+    Args:
+        close (array-like): Kapanış fiyatları
+        position (np.ndarray): (çalıştırma x bar) pozisyon matrisi
+        initial_capital (float): Başlangıç sermayesi
+
+    Returns:
+        np.ndarray: (çalıştırma x bar) portföy değeri matrisi
+    """
+    close = np.asarray(close, dtype=np.float64)
+    growth = np.ones(position.shape, dtype=np.float64)
+    if close.shape[-1] > 1:
+        ratio = close[1:] / close[:-1]
+        growth[..., 1:] = np.where(position[..., :-1], ratio, 1.0)
+    return initial_capital * np.cumprod(growth, axis=-1)
+
+
+def batch_backtest(close, windows, rsi, macd, macd_signal, initial_capital=10000.0,
+                   macd_two_way=True, chunk_size=512):
+    """
+    Tüm SMA pencerelerini tek seferde backtest eder
+
+    Stop-Loss/Take-Profit çıkışları yola bağlı olduğu için bu modda yoktur;
+    onlar için backtest_kernel.run_backtest kullanılır. Sonuçlar çekirdekle
+    aynı işlemleri üretir, portföy değerleri kayan nokta yuvarlaması
+    kadar farklı olabilir.
+
+    Args:
+        close (array-like): Kapanış fiyatları
+        windows (array-like): SMA pencere uzunlukları
+        rsi (array-like): RSI değerleri
+        macd (array-like): MACD çizgisi
+        macd_signal (array-like): MACD sinyal çizgisi
+        initial_capital (float): Başlangıç sermayesi
+        macd_two_way (bool): combined_signals ile aynı anlamda
+        chunk_size (int): Bellek kullanımını sınırlamak için bir seferde
+            işlenen pencere sayısı
+
+    Returns:
+        dict: windows, equity (pencere x bar, SMA olmayan barlar NaN),
+            position (pencere x bar, bar kapanışında pozisyon), final_capital,
+            total_return ve trades dizileri
+    """
+    close = np.asarray(close, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    n_windows, n = len(windows), len(close)
+
+    equity = np.empty((n_windows, n), dtype=np.float64)
+    positions = np.empty((n_windows, n), dtype=bool)
+    trades = np.zeros(n_windows, dtype=np.int64)
+
+    for lo in range(0, n_windows, chunk_size):
+        hi = min(lo + chunk_size, n_windows)
+        sma = sma_matrix(close, windows[lo:hi])
+        signal = combined_signals(close, sma, rsi, macd, macd_signal,
+                                  macd_two_way=macd_two_way)
+        position = positions_from_signals(signal)
+
+        block = equity_matrix(close, position, initial_capital)
+        block[np.isnan(sma)] = np.nan
+        equity[lo:hi] = block
+        positions[lo:hi] = position
+
+        # Girişler + çıkışlar (açık kalan pozisyon son barda kapanır)
+        entries = position[:, 0] + np.count_nonzero(position[:, 1:] & ~position[:, :-1], axis=1)
+        exits = np.count_nonzero(~position[:, 1:] & position[:, :-1], axis=1) + position[:, -1]
+        trades[lo:hi] = entries + exits
+
+    final_capital = equity[:, -1] if n > 0 else np.full(n_windows, float(initial_capital))
+    return {
+        'windows': windows,
+        'equity': equity,
+        'position': positions,
+        'final_capital': final_capital,
+        'total_return': (final_capital - initial_capital) / initial_capital * 100,
+        'trades': trades,
+    }
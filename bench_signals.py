@@ -0,0 +1,115 @@
+"""
+Sinyal Motoru Benchmark'ı
+Eski satır satır döngü ile vektörel sinyal motorunu karşılaştırır
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from main2 import CurrentTradingBot
+from signals import combined_signals
+
+
+def loop_signals(data, sma_col='sma_5', macd_two_way=False):
+    """Eski generate_signals döngüsü (referans uygulama)"""
+    data['signal'] = 0
+
+    for i in range(1, len(data)):
+        if pd.isna(data[sma_col].iloc[i]) or pd.isna(data['rsi'].iloc[i]):
+            continue
+
+        sma_signal = 1 if data['close'].iloc[i] > data[sma_col].iloc[i] else -1
+        rsi_signal = 1 if data['rsi'].iloc[i] < 30 else (-1 if data['rsi'].iloc[i] > 70 else 0)
+
+        if macd_two_way:
+            macd_signal = 1 if data['macd'].iloc[i] > data['macd_signal'].iloc[i] else -1
+        else:
+            macd_signal = 0
+            if data['macd'].iloc[i] > data['macd_signal'].iloc[i]:
+                macd_signal = 1
+            elif data['macd'].iloc[i] < data['macd_signal'].iloc[i]:
+                macd_signal = -1
+
+        combined_signal = (sma_signal * 0.5 + rsi_signal * 0.3 + macd_signal * 0.2)
+
+        if combined_signal > 0.3:
+            data.loc[data.index[i], 'signal'] = 1
+        elif combined_signal < -0.3:
+            data.loc[data.index[i], 'signal'] = -1
+
+    return data['signal'].to_numpy()
+
+
+def make_data(n_bars, seed=42):
+    """n_bars uzunluğunda indikatörleri hesaplanmış örnek veri üretir"""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.standard_normal(n_bars) * 0.02))
+    data = pd.DataFrame({
+        'date': pd.bdate_range('2000-01-03', periods=n_bars),
+        'close': prices,
+        'high': prices * (1 + rng.uniform(0, 0.02, n_bars)),
+        'low': prices * (1 - rng.uniform(0, 0.02, n_bars)),
+        'volume': rng.integers(1000, 10000, n_bars)
+    })
+
+    bot = CurrentTradingBot()
+    return bot.calculate_technical_indicators(data)
+
+
+def run_benchmark(lengths=(250, 1000, 2500, 10000), loop_limit=10000):
+    """
+    Farklı seri uzunluklarında iki yöntemi karşılaştırır
+
+    Args:
+        lengths (tuple): Denenecek bar sayıları
+        loop_limit (int): Bu uzunluğun üzerinde döngü çalıştırılmaz
+
+    Returns:
+        list: Her uzunluk için sonuç sözlükleri
+    """
+    rows = []
+
+    for n_bars in lengths:
+        data = make_data(n_bars)
+        arrays = [data[c].to_numpy() for c in ['close', 'sma_5', 'rsi', 'macd', 'macd_signal']]
+
+        start = time.perf_counter()
+        fast = combined_signals(*arrays)
+        vector_time = time.perf_counter() - start
+
+        loop_time = float('nan')
+        match = None
+        if n_bars <= loop_limit:
+            start = time.perf_counter()
+            slow = loop_signals(data.copy())
+            loop_time = time.perf_counter() - start
+            match = bool(np.array_equal(slow, fast))
+
+        rows.append({
+            'bars': n_bars,
+            'loop_s': loop_time,
+            'vector_s': vector_time,
+            'speedup': loop_time / vector_time if vector_time > 0 else float('nan'),
+            'match': match
+        })
+
+    return rows
+
+
+def main():
+    """Benchmark sonuçlarını tablo olarak yazdırır"""
+    lengths = tuple(int(x) for x in sys.argv[1:]) or (250, 1000, 2500, 10000)
+
+    print("⏱️ Sinyal motoru benchmark'ı başlatılıyor...")
+    results = pd.DataFrame(run_benchmark(lengths))
+    print(results.to_string(index=False))
+
+    if (results['match'] == False).any():
+        print("❌ Vektörel sonuçlar döngüyle eşleşmiyor!")
+        sys.exit(1)
+    print("✅ Tüm sonuçlar döngüyle birebir eşleşti")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark Paketi
+Veri yükleme, indikatörler, sinyaller, backtest ve grafik aşamalarını
+bar ve sembol sayısına göre ayrı ayrı ölçer; JSON rapor üretir ve kayıtlı
+bir temel (baseline) rapora göre yavaşlamaları işaretler
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import statistics
+from datetime import datetime
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from main1 import TradingBot
+from main2 import CurrentTradingBot
+from data_cache import OHLCVCache
+from verbosity import verbosity
+from app_charts import price_figure, portfolio_figure, rsi_figure
+
+DEFAULT_BARS = (250, 1000, 5000)
+DEFAULT_SYMBOLS = (1, 10)
+
+# Aşamaların yerinde değiştirdiği girdiler; her tekrarda ölçüm dışında kopyalanır
+MUTABLE_INPUTS = ('raw', 'indicators', 'signals')
+
+
+def _load_sample(ctx):
+    bot = CurrentTradingBot()
+    return [bot.create_sample_data_2025(n_bars=ctx['bars'], seed=i) for i in range(ctx['symbols'])]
+
+
+def _load_cache(ctx):
+    return [ctx['cache'].load(symbol) for symbol in ctx['symbol_names']]
+
+
+def _indicators(ctx):
+    bot = CurrentTradingBot()
+    return [bot.calculate_technical_indicators(data) for data in ctx['raw']]
+
+
+def _signals(ctx):
+    bot = CurrentTradingBot()
+    return [bot.generate_signals(data) for data in ctx['indicators']]
+
+
+def _backtest(ctx):
+    return [CurrentTradingBot().backtest(data) for data in ctx['signals']]
+
+
+def _plot(ctx):
+    for data, results in zip(ctx['signals'], ctx['results']):
+        CurrentTradingBot().plot_current_results(data, results)
+        plt.close('all')
+
+
+def _plot_plotly(ctx):
+    for data, results in zip(ctx['app'], ctx['results']):
+        price_figure(data, 'BENCH', 5)
+        portfolio_figure(data['date'], results['portfolio_values'], 10000)
+        rsi_figure(data)
+
+
+def _simple_pipeline(ctx):
+    for i in range(ctx['symbols']):
+        bot = TradingBot()
+        data = bot.create_sample_data(n_days=ctx['bars'], seed=i)
+        data = bot.generate_signals(bot.calculate_sma(data))
+        bot.backtest(data)
+
+
+# Aşama adı -> ölçülen fonksiyon
+STAGES = {
+    'data_load_sample': _load_sample,
+    'data_load_cache': _load_cache,
+    'indicators': _indicators,
+    'signals': _signals,
+    'backtest': _backtest,
+    'plot_matplotlib': _plot,
+    'plot_plotly': _plot_plotly,
+    'simple_pipeline': _simple_pipeline,
+}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """
+    Bot çıktılarını ölçüm sırasında bastırır
+
+    Bot mesajları 'batch' seviyesinde hiç biçimlendirilmez (işlem başına
+    satırlar ölçüme girmez); sadece print kullanan main1 çıktısı yönlendirilir.
+    """
+    with verbosity('batch'), open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _prepare(n_bars, n_symbols, cache_dir):
+    """Her aşamanın girdisini ölçüm dışında hazırlar"""
+    ctx = {'bars': n_bars, 'symbols': n_symbols}
+    bot = CurrentTradingBot()
+
+    with _quiet():
+        ctx['raw'] = _load_sample(ctx)
+        ctx['symbol_names'] = [f'BENCH{i}' for i in range(n_symbols)]
+        ctx['cache'] = OHLCVCache(cache_dir)
+        for symbol, data in zip(ctx['symbol_names'], ctx['raw']):
+            ctx['cache'].save(symbol, '1d', data)
+
+        ctx['indicators'] = [bot.calculate_technical_indicators(data.copy()) for data in ctx['raw']]
+        ctx['signals'] = [bot.generate_signals(data.copy()) for data in ctx['indicators']]
+        ctx['results'] = [CurrentTradingBot().backtest(data) for data in ctx['signals']]
+    # app2 grafikleri 'sma' sütununu çizer
+    ctx['app'] = [data.rename(columns={'sma_5': 'sma'}) for data in ctx['signals']]
+    return ctx
+
+
+def _fresh(ctx):
+    """Tekrar başına değiştirilebilir girdilerin kopyalarıyla bağlam"""
+    return dict(ctx, **{key: [data.copy() for data in ctx[key]] for key in MUTABLE_INPUTS})
+
+
+def run_benchmarks(bars=DEFAULT_BARS, symbols=DEFAULT_SYMBOLS, stages=None, repeat=5):
+    """
+    Tüm aşamaları ölçer
+
+    Args:
+        bars (iterable): Denenecek bar sayıları
+        symbols (iterable): Denenecek sembol sayıları
+        stages (list): Ölçülecek aşamalar (varsayılan hepsi)
+        repeat (int): Her ölçümün tekrar sayısı
+
+    Returns:
+        dict: 'meta' ve 'results' alanlı, JSON'a yazılabilir rapor
+    """
+    stages = stages or list(STAGES)
+    results = []
+    cache_dir = tempfile.mkdtemp(prefix='bench_cache_')
+
+    try:
+        for n_bars in bars:
+            for n_symbols in symbols:
+                ctx = _prepare(n_bars, n_symbols, cache_dir)
+
+                for stage in stages:
+                    timings = []
+                    for _ in range(repeat):
+                        run_ctx = _fresh(ctx)
+                        with _quiet():
+                            start = time.perf_counter()
+                            STAGES[stage](run_ctx)
+                            timings.append(time.perf_counter() - start)
+
+                    results.append({
+                        'stage': stage,
+                        'bars': n_bars,
+                        'symbols': n_symbols,
+                        'repeat': repeat,
+                        'min_s': min(timings),
+                        'median_s': statistics.median(timings),
+                        'mean_s': statistics.fmean(timings),
+                    })
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold=0.25):
+    """
+    Raporu temel rapora göre karşılaştırır
+
+    Args:
+        report (dict): Güncel rapor
+        baseline (dict): Kayıtlı temel rapor
+        threshold (float): Bu orandan fazla yavaşlama işaretlenir (0.25 = %25)
+
+    Returns:
+        pd.DataFrame: Aşama başına medyan süreler, oran ve yavaşlama bayrağı
+    """
+    key = ['stage', 'bars', 'symbols']
+    current = pd.DataFrame(report['results'])[key + ['median_s']]
+    base = pd.DataFrame(baseline['results'])[key + ['median_s']]
+
+    table = current.merge(base, on=key, suffixes=('', '_baseline'))
+    table['ratio'] = table['median_s'] / table['median_s_baseline']
+    table['slower'] = table['ratio'] > 1 + threshold
+    return table
+
+
+def main():
+    """Komut satırından benchmark çalıştırır"""
+    parser = argparse.ArgumentParser(description="Benchmark paketi")
+    parser.add_argument('--bars', type=int, nargs='+', default=list(DEFAULT_BARS))
+    parser.add_argument('--symbols', type=int, nargs='+', default=list(DEFAULT_SYMBOLS))
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='benchmark.json', help="JSON rapor dosyası")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak temel rapor")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Yavaşlama eşiği (oran)")
+    args = parser.parse_args()
+
+    print("⏱️ Benchmark başlatılıyor...")
+    report = run_benchmarks(args.bars, args.symbols, args.stages, args.repeat)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    table = pd.DataFrame(report['results'])
+    print(table[['stage', 'bars', 'symbols', 'min_s', 'median_s']].to_string(index=False))
+    print(f"✅ Rapor kaydedildi: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare(report, baseline, args.threshold)
+        print("\n📊 TEMEL RAPORA GÖRE:")
+        print(comparison.to_string(index=False))
+
+        if comparison['slower'].any():
+            print(f"❌ {int(comparison['slower'].sum())} ölçümde %{args.threshold * 100:.0f}'den fazla yavaşlama")
+            sys.exit(1)
+        print("✅ Yavaşlama yok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+İşlem Maliyeti ve Slippage Modeli
+Komisyon, baz puan (bps) ücret, sabit ya da hacme orantılı slippage ve
+kapanış/sonraki bar açılışı dolumu. Bar başına dolum fiyatı ve hacim
+dizileri bir kez vektörel hazırlanır; maliyetler backtest çekirdeğinin
+döngüsü içinde uygulanır.
+"""
+
+import numpy as np
+
+FILL_MODES = ('close', 'next_open')
+
+
+class CostModel:
+    """
+    Backtest işlem maliyeti tanımı
+
+    Alışta dolum fiyatı fiyat * (1 + kayma), satışta fiyat * (1 - kayma)
+    olur. Kayma = slippage_bps / 10000 + volume_impact * (adet / bar hacmi).
+    Ücret işlem tutarının fee_bps / 10000'i, komisyon işlem başına sabittir.
+    """
+
+    def __init__(self, commission=0.0, fee_bps=0.0, slippage_bps=0.0,
+                 volume_impact=0.0, fill='close'):
+        """
+        Args:
+            commission (float): İşlem başına sabit komisyon (TL)
+            fee_bps (float): İşlem tutarı üzerinden ücret (baz puan)
+            slippage_bps (float): Sabit slippage (baz puan)
+            volume_impact (float): Hacme orantılı slippage katsayısı
+                (örn. 0.1: bar hacminin %1'i kadar emir -> 10 bps)
+            fill (str): 'close' (sinyal barının kapanışı) ya da
+                'next_open' (sonraki barın açılışı)
+        """
+        if fill not in FILL_MODES:
+            raise ValueError(f"Bilinmeyen dolum modu: {fill}")
+        if min(commission, fee_bps, slippage_bps, volume_impact) < 0:
+            raise ValueError("Maliyet parametreleri negatif olamaz")
+
+        self.commission = float(commission)
+        self.fee_bps = float(fee_bps)
+        self.slippage_bps = float(slippage_bps)
+        self.volume_impact = float(volume_impact)
+        self.fill = fill
+
+    @property
+    def fee_rate(self):
+        return self.fee_bps / 10000
+
+    @property
+    def slippage(self):
+        return self.slippage_bps / 10000
+
+    @property
+    def delay(self):
+        """Karar ile dolum arasındaki bar sayısı"""
+        return 1 if self.fill == 'next_open' else 0
+
+    def fill_arrays(self, close, open_prices=None, volume=None):
+        """
+        Bar başına dolum fiyatı ve hacim dizilerini hazırlar
+
+        'next_open' modunda i. barın kararı i+1. barın açılışında dolar;
+        son barın dolum fiyatı NaN olur (o bardaki sinyal işleme dönmez).
+
+        Args:
+            close (np.ndarray): Kapanış fiyatları
+            open_prices (array-like): Açılış fiyatları ('next_open' için gerekli)
+            volume (array-like): Bar hacimleri (volume_impact için gerekli)
+
+        Returns:
+            tuple: (dolum fiyatı, dolum barı hacmi) float64 dizileri
+        """
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        n = len(close)
+
+        if self.fill == 'next_open':
+            if open_prices is None:
+                raise ValueError("'next_open' dolumu için açılış fiyatları gerekli")
+            fill_price = np.full(n, np.nan)
+            fill_price[:-1] = np.asarray(open_prices, dtype=np.float64)[1:]
+        else:
+            fill_price = close
+
+        if self.volume_impact > 0:
+            if volume is None:
+                raise ValueError("Hacme orantılı slippage için hacim gerekli")
+            volume = np.asarray(volume, dtype=np.float64)
+            fill_volume = np.zeros(n)
+            fill_volume[:n - self.delay] = volume[self.delay:]
+        else:
+            fill_volume = np.zeros(n)
+
+        return fill_price, fill_volume
+
+    def __repr__(self):
+        return (f"CostModel(commission={self.commission}, fee_bps={self.fee_bps}, "
+                f"slippage_bps={self.slippage_bps}, volume_impact={self.volume_impact}, "
+                f"fill='{self.fill}')")
@@ -0,0 +1,263 @@
+"""
+Yerel OHLCV Önbelleği
+Sembol ve aralık bazında sütun sütun .npy dosyalarında veri saklar,
+her çağrıda sadece son önbellek barından yeni olan barları indirir
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from verbosity import get_logger
+
+log = get_logger('data_cache')
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'ohlcv')
+
+# Aralık başına bir sonraki barın en erken zamanı
+INTERVAL_STEPS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '60m': pd.Timedelta(hours=1),
+    '90m': pd.Timedelta(minutes=90),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=5),
+    '1wk': pd.Timedelta(weeks=1),
+}
+
+
+def yahoo_downloader(symbol, start, end, interval='1d'):
+    """
+    Yahoo Finance'ten veri indirir
+
+    Returns:
+        pd.DataFrame: Küçük harfli sütunlar ve 'date' sütunu olan veri
+    """
+    import yfinance as yf
+
+    data = yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+    data.reset_index(inplace=True)
+    data.columns = [col.lower() for col in data.columns]
+    if 'datetime' in data.columns:
+        data.rename(columns={'datetime': 'date'}, inplace=True)
+    return data
+
+
+def period_to_start(period, now=None):
+    """
+    yfinance periyot ifadesini ('1y', '6mo', '5d' ...) başlangıç tarihine çevirir
+    """
+    now = pd.Timestamp(now or datetime.now()).normalize()
+    if period == 'max':
+        return pd.Timestamp('1970-01-01')
+    if period == 'ytd':
+        return now.replace(month=1, day=1)
+
+    units = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return now - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Geçersiz periyot: {period}")
+
+
+class OHLCVCache:
+    """
+    Sembol/aralık bazlı kalıcı OHLCV önbelleği
+
+    Her sembol için bir klasör açılır; her sütun ayrı bir .npy dosyasında
+    tutulur, böylece dosyalar np.load(mmap_mode='r') ile belleğe eşlenebilir.
+    Tarihler UTC nanosaniye (int64) olarak, saat dilimi meta.json'da saklanır.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, downloader=None):
+        """
+        Args:
+            cache_dir (str): Önbellek kök klasörü
+            downloader (callable): (symbol, start, end, interval) -> DataFrame;
+                testlerde Yahoo yerine sahte bir indirici verilebilir
+        """
+        self.cache_dir = cache_dir
+        self.downloader = downloader or yahoo_downloader
+
+    def _path(self, symbol, interval):
+        """Sembol/aralık klasörünü döndürür"""
+        safe = symbol.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.cache_dir, interval, safe)
+
+    def _read_meta(self, path):
+        """meta.json dosyasını okur, yoksa None döndürür"""
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, symbol, interval='1d', mmap=True):
+        """
+        Önbellekteki veriyi okur
+
+        Args:
+            symbol (str): Hisse senedi sembolü
+            interval (str): Bar aralığı
+            mmap (bool): Sütunları belleğe eşleyerek aç
+
+        Returns:
+            pd.DataFrame veya None: Önbellekte veri yoksa None
+        """
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+        if meta is None:
+            return None
+
+        mmap_mode = 'r' if mmap else None
+        columns = {}
+        for name, filename in meta['files'].items():
+            values = np.load(os.path.join(path, filename), mmap_mode=mmap_mode)
+            if name == 'date':
+                dates = pd.to_datetime(np.asarray(values), utc=True)
+                values = dates.tz_convert(meta['tz']) if meta['tz'] else dates.tz_localize(None)
+            columns[name] = values
+
+        return pd.DataFrame(columns)
+
+    def save(self, symbol, interval, data, checked_from=None, checked_until=None):
+        """
+        Veriyi önbelleğe yazar (dosyalar atomik olarak değiştirilir)
+
+        Args:
+            symbol (str): Hisse senedi sembolü
+            interval (str): Bar aralığı
+            data (pd.DataFrame): 'date' sütunu olan veri
+            checked_from (pd.Timestamp): Kaynağın sorgulandığı ilk zaman
+            checked_until (pd.Timestamp): Kaynağın sorgulandığı son zaman (hariç)
+        """
+        path = self._path(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+
+        dates = pd.to_datetime(data['date'])
+        tz = str(dates.dt.tz) if dates.dt.tz is not None else None
+        utc = dates.dt.tz_convert('UTC') if tz else dates.dt.tz_localize('UTC')
+
+        files = {}
+        for name in data.columns:
+            if name == 'date':
+                values = utc.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+            else:
+                values = data[name].to_numpy()
+                if values.dtype == object:
+                    continue
+            filename = name.replace(' ', '_') + '.npy'
+            tmp_path = os.path.join(path, filename + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_path, os.path.join(path, filename))
+            files[name] = filename
+
+        meta = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'tz': tz,
+            'rows': len(data),
+            'files': files,
+            'checked_from': str(checked_from if checked_from is not None else _naive(dates.iloc[0], dates.dt.tz)),
+            'checked_until': str(checked_until if checked_until is not None else _naive(dates.iloc[-1], dates.dt.tz)),
+        }
+        tmp_path = os.path.join(path, 'meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, 'meta.json'))
+
+    def _download(self, symbol, start, end, interval):
+        """
+        Önbelleği tamamlayan indirme; hata olursa uyarı yazıp None döndürür
+
+        Returns:
+            pd.DataFrame veya None: İndirilen (boş olabilir) veri, hata olursa None
+        """
+        try:
+            data = self.downloader(symbol, start, end, interval)
+        except Exception as e:
+            log.warning(f"⚠️ {symbol} [{start} - {end}) indirilemedi, önbellekteki barlar "
+                        f"kullanılıyor: {e}")
+            return None
+        return pd.DataFrame() if data is None else data
+
+    def get(self, symbol, start, end=None, interval='1d'):
+        """
+        Veriyi önbellekten döndürür, eksik barları indirip ekler
+
+        Daha önce sorgulanmamış eski tarihler başa, son önbellek barından yeni
+        barlar sona eklenir. Sorgulanan aralık meta.json'da tutulur, böylece
+        aynı aralık (örn. hafta sonu) tekrar istendiğinde indirme yapılmaz.
+        Önbellekte veri varken indirme başarısız olursa önbellekteki barlar
+        uyarıyla döndürülür ve sorgulanan aralık güncellenmez.
+
+        Args:
+            symbol (str): Hisse senedi sembolü
+            start (str): Başlangıç tarihi
+            end (str): Bitiş tarihi (hariç, varsayılan bugün)
+            interval (str): Bar aralığı
+
+        Returns:
+            pd.DataFrame: [start, end) aralığındaki veri
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end or datetime.now().strftime('%Y-%m-%d'))
+        step = INTERVAL_STEPS.get(interval, pd.Timedelta(days=1))
+
+        cached = self.load(symbol, interval, mmap=False)
+        if cached is None or cached.empty:
+            data = self.downloader(symbol, start, end, interval)
+            if data is None or data.empty:
+                return pd.DataFrame()
+            checked_from, checked_until = start, end
+        else:
+            meta = self._read_meta(self._path(symbol, interval))
+            tz = cached['date'].dt.tz
+            last = _naive(cached['date'].iloc[-1], tz)
+            checked_from = pd.Timestamp(meta['checked_from'])
+            checked_until = pd.Timestamp(meta['checked_until'])
+            parts = [cached]
+
+            # Daha önce sorgulanmamış eski tarihler
+            if start < checked_from:
+                earlier = self._download(symbol, start, checked_from, interval)
+                if earlier is not None:
+                    parts.insert(0, earlier)
+                    checked_from = start
+
+            # Son önbellek barından yeni barlar
+            if end > checked_until:
+                later = self._download(symbol, last + step, end, interval)
+                if later is not None:
+                    parts.append(later)
+                    checked_until = end
+
+            if len(parts) == 1:
+                return _slice(cached, start, end)
+
+            parts = [part for part in parts if not part.empty]
+            data = pd.concat(parts, ignore_index=True)
+
+        data = data.drop_duplicates(subset='date', keep='last').sort_values('date', ignore_index=True)
+        self.save(symbol, interval, data, checked_from, checked_until)
+        return _slice(data, start, end)
+
+
+def _naive(timestamp, tz):
+    """Saat dilimli zamanı yerel saat diliminde saat dilimsiz hale getirir"""
+    return timestamp.tz_localize(None) if tz is not None else timestamp
+
+
+def _slice(data, start, end):
+    """Veriyi [start, end) aralığına keser"""
+    dates = data['date']
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    mask = (dates >= start) & (dates < end)
+    return data.loc[mask.to_numpy()].reset_index(drop=True)
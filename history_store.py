@@ -0,0 +1,429 @@
+"""
+Sütunlu Geçmiş Veri Deposu (History Store)
+Tüm sembollerin OHLCV verisini ortak bir takvim indeksinde, sütun başına tek
+bir (sembol x bar) .npy dosyasında tutar. Depo np.load(mmap_mode='r') ile
+açılır; açılış süresi ve bellek kullanımı sembol sayısından bağımsızdır,
+işçi süreçler aynı dosyaları kopyasız dilimler halinde okur.
+
+Klasör yapısı:
+    meta.json      semboller, aralık, sütunlar, sembol saat dilimleri
+    calendar.npy   ortak takvim (borsa yerel saati, nanosaniye, int64;
+                   günlük aralıklarda güne yuvarlanır, alignment.py ile aynı)
+    present.npy    (sembol x bar) gerçek bar maskesi
+    <sütun>.npy    (sembol x bar) değerler, eksik barlar NaN
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from alignment import local_ns, DAY_NS
+from bars import is_intraday
+
+DEFAULT_STORE_DIR = os.path.join('.cache', 'history')
+
+STORE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _calendar_ns(dates, interval):
+    """
+    Tarihleri ortak takvim anahtarına çevirir
+
+    Farklı borsaların günlük barları aynı güne düşsün diye UTC anı yerine
+    borsanın yerel saati kullanılır; günlük aralıklarda saat atılır.
+    """
+    stamps = local_ns(dates)
+    if not is_intraday(interval):
+        stamps = stamps - stamps % DAY_NS
+    return stamps
+
+
+def _tz_name(dates):
+    """Tarih sütununun saat dilimi adı (yoksa None)"""
+    tz = pd.DatetimeIndex(dates).tz
+    return str(tz) if tz is not None else None
+
+
+def write_store(path, symbols, loader, interval='1d', columns=STORE_COLUMNS,
+                dtype=np.float64, tz=None):
+    """
+    Depoyu yazar
+
+    İki geçişte çalışır: önce sadece tarihler okunup ortak takvim çıkarılır,
+    sonra her sembol kendi satırına doğrudan diskteki diziye yazılır; bellekte
+    aynı anda tek sembolün verisi bulunur.
+
+    Args:
+        path (str): Depo klasörü
+        symbols (list): Semboller
+        loader (callable veya dict): symbol -> 'date' ve OHLCV sütunları olan
+            DataFrame (None/boş ise sembol atlanır)
+        interval (str): Bar aralığı
+        columns (tuple): Saklanacak sütunlar
+        dtype: Değer tipi (float32 ile disk ve bellek yarıya iner)
+        tz (str): Takvimin saat dilimi (None ise semboller tek dilimdeyse o dilim)
+
+    Returns:
+        HistoryStore: Yazılan depo (salt okunur açılmış)
+    """
+    if isinstance(loader, Mapping):
+        loader = loader.get
+
+    # 1. geçiş: ortak takvim
+    stamps = []
+    kept = []
+    zones = {}
+    for symbol in symbols:
+        data = loader(symbol)
+        if data is None or len(data) == 0:
+            continue
+        stamps.append(np.unique(_calendar_ns(data['date'], interval)))
+        zones[symbol] = _tz_name(data['date'])
+        kept.append(symbol)
+    calendar = np.unique(np.concatenate(stamps)) if stamps else np.empty(0, dtype=np.int64)
+    if tz is None and len(set(zones.values())) == 1:
+        # Tek borsalı depoda takvim o borsanın saat dilimiyle okunur
+        tz = next(iter(zones.values()))
+
+    # Açık mmap'ler (HistoryStore, StoreRef görünümleri) eski dosyaları
+    # tutmaya devam etsin diye depo geçici klasöre yazılıp yerine taşınır
+    path = os.path.normpath(path)
+    tmp_dir = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    shape = (len(kept), len(calendar))
+    np.save(os.path.join(tmp_dir, 'calendar.npy'), calendar)
+
+    # 2. geçiş: satır satır diskteki dizilere yaz
+    present = np.lib.format.open_memmap(os.path.join(tmp_dir, 'present.npy'), mode='w+',
+                                        dtype=np.bool_, shape=shape)
+    arrays = {name: np.lib.format.open_memmap(os.path.join(tmp_dir, f'{name}.npy'), mode='w+',
+                                              dtype=dtype, shape=shape)
+              for name in columns}
+    for row, symbol in enumerate(kept):
+        data = loader(symbol)
+        # Aynı takvim anahtarına düşen barlardan sonuncusu tutulur
+        keys = _calendar_ns(data['date'], interval)[::-1]
+        dates, first = np.unique(keys, return_index=True)
+        first = len(keys) - 1 - first
+        bars = np.searchsorted(calendar, dates)
+        present[row] = False
+        present[row, bars] = True
+        for name, array in arrays.items():
+            array[row] = np.nan
+            if name in data:
+                array[row, bars] = np.asarray(data[name], dtype=np.float64)[first]
+
+    present.flush()
+    for array in arrays.values():
+        array.flush()
+    del present, arrays
+
+    meta = {
+        'symbols': list(kept),
+        'interval': interval,
+        'columns': list(columns),
+        'dtype': np.dtype(dtype).name,
+        'calendar': 'local',
+        'tz': tz,
+        'symbol_tz': zones,
+        'bars': len(calendar),
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    old_dir = None
+    if os.path.exists(path):
+        old_dir = f"{path}.old-{os.getpid()}-{time.time_ns()}"
+        os.replace(path, old_dir)
+    os.replace(tmp_dir, path)
+    if old_dir is not None:
+        # POSIX'te açık mmap'ler silinen dosyaları okumaya devam eder
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return HistoryStore(path)
+
+
+def write_store_from_cache(path, symbols, cache, interval='1d', **kwargs):
+    """
+    OHLCVCache içeriğinden depo yazar (önbellek sütunları mmap ile okunur)
+
+    Args:
+        path (str): Depo klasörü
+        symbols (list): Semboller
+        cache (OHLCVCache): Kaynak önbellek
+        interval (str): Bar aralığı
+        **kwargs: write_store parametreleri
+    """
+    return write_store(path, symbols, lambda symbol: cache.load(symbol, interval, mmap=True),
+                       interval=interval, **kwargs)
+
+
+class HistoryStore:
+    """
+    Belleğe eşlenmiş salt okunur geçmiş veri deposu
+
+    Tüm sütun dizileri açılışta mmap ile eşlenir (veri sayfaları okundukça
+    yüklenir; depo yeniden yazılsa da nesne eski sürümü okumaya devam eder);
+    satırlar (semboller) bellekte bitişik olduğu için tek sembolün serisi
+    kopyasız görünümdür.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_DIR):
+        """
+        Args:
+            path (str): Depo klasörü
+        """
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Depo bulunamadı: {path}")
+        with open(meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        self.path = path
+        self.symbols = self.meta['symbols']
+        self.interval = self.meta['interval']
+        self.columns = self.meta['columns']
+        self._rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._calendar = None
+        # Dosyalar açılışta eşlenir: depo yeniden yazılsa da bu nesne eski
+        # sürümü tutarlı biçimde okumaya devam eder
+        self._arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                        for name in ('calendar', 'present', *self.columns)}
+
+    def _array(self, name):
+        """Sütunun mmap dizisi"""
+        if name not in self._arrays:
+            raise KeyError(f"Depoda olmayan sütun: {name}")
+        return self._arrays[name]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    @property
+    def calendar(self):
+        """Ortak takvim (DatetimeIndex)"""
+        if self._calendar is None:
+            dates = pd.to_datetime(self._array('calendar'))
+            tz = self.meta.get('tz')
+            if self.meta.get('calendar') == 'local':
+                if tz:
+                    dates = dates.tz_localize(tz, ambiguous=False, nonexistent='shift_forward')
+            elif tz:
+                # Eski depolar: takvim UTC anı olarak yazılmış
+                dates = dates.tz_localize('UTC').tz_convert(tz)
+            self._calendar = dates
+        return self._calendar
+
+    @property
+    def present(self):
+        """(sembol x bar) gerçek bar maskesi (mmap)"""
+        return self._array('present')
+
+    def row(self, symbol):
+        """Sembolün satır numarası"""
+        if symbol not in self._rows:
+            raise KeyError(f"Depoda olmayan sembol: {symbol}")
+        return self._rows[symbol]
+
+    def bar_range(self, start=None, end=None):
+        """[start, end) tarih aralığının takvimdeki bar sınırları"""
+        calendar = self.calendar
+        lo = 0 if start is None else calendar.searchsorted(pd.Timestamp(start, tz=calendar.tz))
+        hi = len(calendar) if end is None else calendar.searchsorted(pd.Timestamp(end, tz=calendar.tz))
+        return int(lo), int(hi)
+
+    def matrix(self, column, symbols=None, start=None, end=None):
+        """
+        (sembol x bar) değer matrisi
+
+        Sembol listesi verilmezse ve sadece bar aralığı kesilirse sonuç
+        mmap görünümüdür (kopya yok); sembol seçimi satırları kopyalar.
+
+        Args:
+            column (str): Sütun adı
+            symbols (list): Semboller (None ise hepsi, depo sırasıyla)
+            start, end: Tarih aralığı [start, end)
+
+        Returns:
+            np.ndarray: Eksik barlarda NaN olan matris
+        """
+        lo, hi = self.bar_range(start, end)
+        values = self._array(column)
+        if symbols is None:
+            return values[:, lo:hi]
+        return values[[self.row(symbol) for symbol in symbols], lo:hi]
+
+    def series(self, symbol, column='close', start=None, end=None):
+        """
+        Tek sembolün kendi barları
+
+        Sembolün ilk ve son barı arasında takvim boşluğu yoksa sonuç kopyasız
+        görünümdür; aksi halde sadece gerçek barlar kopyalanır.
+
+        Returns:
+            tuple: (tarihler, değerler)
+        """
+        row = self.row(symbol)
+        lo, hi = self.bar_range(start, end)
+        present = self.present[row, lo:hi]
+        bars = np.flatnonzero(present)
+        if len(bars) == 0:
+            return self.calendar[:0], self._array(column)[row, :0]
+
+        first, last = lo + bars[0], lo + bars[-1] + 1
+        if len(bars) == last - first:
+            return self.calendar[first:last], self._array(column)[row, first:last]
+        return self.calendar[lo:hi][bars], self._array(column)[row, lo:hi][bars]
+
+    def frame(self, symbol, start=None, end=None):
+        """
+        Sembolü botun beklediği DataFrame biçiminde döndürür
+
+        Returns:
+            pd.DataFrame: 'date' ve sütunlar (sadece gerçek barlar)
+        """
+        data = {}
+        for name in self.columns:
+            dates, data[name] = self.series(symbol, name, start, end)
+        return pd.DataFrame({'date': dates, **data}, copy=False)
+
+    def frames(self, symbols=None, start=None, end=None):
+        """Sembol -> DataFrame tembel eşlemesi (erişilen sembol okunur)"""
+        return _LazyFrames(self, list(symbols or self.symbols), start, end)
+
+    def ref(self, symbol, column='close'):
+        """İşçi süreçlere gönderilebilen hafif referans"""
+        return StoreRef(self.path, symbol, column)
+
+
+class _LazyFrames(Mapping):
+    """get_multiple_stocks çıktısıyla aynı arayüzde tembel sözlük"""
+
+    def __init__(self, store, symbols, start, end):
+        self.store = store
+        self.symbols = [symbol for symbol in symbols if symbol in store]
+        self.start = start
+        self.end = end
+
+    def __getitem__(self, symbol):
+        if symbol not in self.symbols:
+            raise KeyError(symbol)
+        return self.store.frame(symbol, self.start, self.end)
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+
+# Süreç başına açılmış depolar: yol -> (meta.json kimliği, depo)
+_OPEN_STORES = {}
+
+
+def open_store(path):
+    """
+    Depoyu süreç başına bir kez açar
+
+    Depo yeniden yazıldıysa (meta.json değiştiyse) yeni sürüm açılır.
+    """
+    stat = os.stat(os.path.join(path, 'meta.json'))
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _OPEN_STORES.get(path)
+    if cached is None or cached[0] != key:
+        cached = _OPEN_STORES[path] = (key, HistoryStore(path))
+    return cached[1]
+
+
+class StoreRef:
+    """
+    Depodaki tek seriye referans
+
+    Süreç havuzuna dizi yerine bu nesne gönderilir; işçi aynı dosyayı mmap
+    ile açıp seriyi kopyasız okur.
+    """
+
+    def __init__(self, path, symbol, column='close'):
+        self.path = path
+        self.symbol = symbol
+        self.column = column
+
+    def load(self):
+        """Seriyi döndürür (mmap görünümü)"""
+        return open_store(self.path).series(self.symbol, self.column)[1]
+
+    def __repr__(self):
+        return f"StoreRef({self.path!r}, {self.symbol!r}, {self.column!r})"
+
+
+def main():
+    """Komut satırından depo oluşturur ya da özetler"""
+    parser = argparse.ArgumentParser(description="Sütunlu geçmiş veri deposu")
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('symbols', nargs='*', help="Semboller (build)")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--sample', type=int, default=0,
+                        help="Önbellek yerine bu kadar örnek sembolle oluştur")
+    parser.add_argument('--bars', type=int, default=2520, help="Örnek sembol başına bar")
+    parser.add_argument('--float32', action='store_true', help="Değerleri float32 sakla")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from main2 import CurrentTradingBot
+        from data_cache import OHLCVCache
+        from verbosity import verbosity
+
+        dtype = np.float32 if args.float32 else np.float64
+        start = time.perf_counter()
+        if args.sample:
+            # Tarih ekseni bir kez üretilir, fiyatlar sembol başına rastgele yürüyüş
+            with verbosity('batch'):
+                dates = CurrentTradingBot(interval=args.interval).create_sample_data_2025(
+                    n_bars=args.bars)['date']
+            symbols = [f"SYM{i:04d}" for i in range(args.sample)]
+
+            def loader(symbol):
+                rng = np.random.default_rng(int(symbol[3:]))
+                close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+                return pd.DataFrame({
+                    'date': dates,
+                    'open': close * (1 + rng.normal(0, 0.005, len(dates))),
+                    'high': close * (1 + rng.uniform(0, 0.02, len(dates))),
+                    'low': close * (1 - rng.uniform(0, 0.02, len(dates))),
+                    'close': close,
+                    'volume': rng.integers(1000, 10000, len(dates)),
+                })
+
+            store = write_store(args.store, symbols, loader, args.interval, dtype=dtype)
+        else:
+            if not args.symbols:
+                print("❌ Sembol verin ya da --sample kullanın")
+                sys.exit(1)
+            store = write_store_from_cache(args.store, [s.upper() for s in args.symbols],
+                                           OHLCVCache(), args.interval, dtype=dtype)
+        print(f"✅ {len(store)} sembol x {store.meta['bars']} bar "
+              f"{time.perf_counter() - start:.2f} saniyede yazıldı: {args.store}")
+        return
+
+    start = time.perf_counter()
+    store = HistoryStore(args.store)
+    opened = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(args.store, f)) for f in os.listdir(args.store))
+    print(f"📦 {args.store}: {len(store)} sembol, {store.meta['bars']} bar, "
+          f"aralık {store.interval}, {store.meta['dtype']}, {size / 1024 ** 2:.1f} MB")
+    print(f"⏱️ Açılış: {opened * 1000:.2f} ms")
+    if store.meta['bars']:
+        print(f"📅 {store.calendar[0]} - {store.calendar[-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+İndikatör Hesap Grafiği
+İndikatörler bir kayıt defterinde (registry) girdileri ve parametreleriyle
+tanımlanır. Ortak ara sonuçlar (fark, kayan ortalama/toplam/varyans, EWM,
+MACD çizgisi) (kaynak, işlem, parametre) anahtarıyla bir kez hesaplanıp
+paylaşılır; sadece istenen sütunlar ve bağımlılıkları değerlendirilir.
+"""
+
+import numpy as np
+
+# İndikatör adı -> (fonksiyon, çıktı adları)
+INDICATORS = {}
+
+
+# İşlem adı -> fonksiyon(graf, kaynak, *parametreler)
+OPS = {
+    'diff': lambda g, s: g.get(s).diff(),
+    'sub': lambda g, s, other: g.get(s) - g.get(other),
+    'gain': lambda g, s: g.get(s).where(g.get(s) > 0, 0),
+    'loss': lambda g, s: -g.get(s).where(g.get(s) < 0, 0),
+    'rolling_mean': lambda g, s, w: g.get(s).rolling(window=w).mean(),
+    'rolling_sum': lambda g, s, w: g.get(s).rolling(window=w).sum(),
+    'rolling_min': lambda g, s, w: g.get(s).rolling(window=w).min(),
+    'rolling_max': lambda g, s, w: g.get(s).rolling(window=w).max(),
+    # Kareler toplamı - w * ortalama² fiyat seviyesinde hassasiyet kaybeder;
+    # pandas'ın kayan varyansı pencere içinde ortalamadan sapmaları toplar
+    'rolling_var': lambda g, s, w, ddof: g.get(s).rolling(window=w).var(ddof=ddof).clip(lower=0),
+    'rolling_std': lambda g, s, w, ddof: np.sqrt(g.get(('rolling_var', s, w, ddof))),
+    'ewm_mean': lambda g, s, span, alpha, adjust, min_periods: g.get(s).ewm(
+        span=span, alpha=alpha, adjust=adjust, min_periods=min_periods).mean(),
+}
+
+
+def indicator(name, outputs=('value',)):
+    """
+    İndikatörü kayıt defterine ekleyen dekoratör
+
+    Fonksiyon (graf, **parametreler) alır ve çıktı adı -> seri sözlüğü
+    (tek çıktılıysa seri) döndürür.
+
+    Args:
+        name (str): İndikatör adı
+        outputs (tuple): Çıktı adları
+    """
+    def register(func):
+        INDICATORS[name] = (func, tuple(outputs))
+        return func
+    return register
+
+
+class IndicatorGraph:
+    """
+    Tek veri kümesi üzerinde paylaşımlı indikatör değerlendirici
+
+    Anahtarlar ya girdi sütun adıdır ('close') ya da (işlem, kaynak,
+    parametreler...) demetidir; kaynak da bir anahtar olabildiği için
+    ara sonuçlar bir DAG oluşturur. Girdiler Series ya da (bar x sembol)
+    DataFrame olabilir.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (pd.DataFrame veya dict): Girdi sütunları ('close', 'high', 'low' ...)
+        """
+        self.data = data
+        self._cache = {}
+        self._indicators = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Anahtarın değerini döndürür (gerekirse bağımlılıklarıyla hesaplar)"""
+        if isinstance(key, str):
+            return self.data[key]
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        op, source, *params = key
+        if op not in OPS:
+            raise ValueError(f"Bilinmeyen işlem: {op}")
+        value = OPS[op](self, source, *params)
+        self._cache[key] = value
+        return value
+
+    # Kısa yollar
+    def rolling(self, source, op, window):
+        return self.get((f'rolling_{op}', source, int(window)))
+
+    def rolling_std(self, source, window, ddof=1):
+        return self.get(('rolling_std', source, int(window), ddof))
+
+    def sub(self, source, other):
+        return self.get(('sub', source, other))
+
+    def ewm(self, source, span=None, alpha=None, adjust=True, min_periods=0):
+        return self.get(('ewm_mean', source, span, alpha, adjust, min_periods))
+
+    def indicator(self, name, **params):
+        """
+        Kayıtlı indikatörü hesaplar (aynı parametrelerle bir kez)
+
+        Returns:
+            dict: Çıktı adı -> değer
+        """
+        if name not in INDICATORS:
+            raise ValueError(f"Bilinmeyen indikatör: {name}")
+        key = (name, tuple(sorted(params.items())))
+        if key not in self._indicators:
+            func, outputs = INDICATORS[name]
+            values = func(self, **params)
+            if not isinstance(values, dict):
+                values = {outputs[0]: values}
+            self._indicators[key] = values
+        return self._indicators[key]
+
+    def evaluate(self, columns):
+        """
+        İstenen sütunları hesaplar
+
+        Args:
+            columns (dict): Sütun adı -> (indikatör, parametreler) ya da
+                (indikatör, parametreler, çıktı adı)
+
+        Returns:
+            dict: Sütun adı -> değer (sadece istenen sütunlar)
+        """
+        result = {}
+        for column, spec in columns.items():
+            name, params = spec[0], spec[1]
+            output = spec[2] if len(spec) > 2 else INDICATORS[name][1][0]
+            result[column] = self.indicator(name, **params)[output]
+        return result
+
+
+def add_indicators(data, columns, only=None):
+    """
+    İndikatör sütunlarını veriye ekler
+
+    Args:
+        data (pd.DataFrame): Girdi verisi (yerinde güncellenir)
+        columns (dict): Sütun tanımları (bkz. IndicatorGraph.evaluate)
+        only (iterable): Verilirse sadece bu sütunlar hesaplanır
+
+    Returns:
+        pd.DataFrame: Güncellenmiş veri
+    """
+    if only is not None:
+        missing = set(only) - set(columns)
+        if missing:
+            raise ValueError(f"Tanımsız indikatör sütunları: {sorted(missing)}")
+        columns = {name: spec for name, spec in columns.items() if name in set(only)}
+
+    for name, values in IndicatorGraph(data).evaluate(columns).items():
+        data[name] = values
+    return data
+
+
+# --- Kayıtlı indikatörler ---
+
+@indicator('sma')
+def sma(graph, window, source='close'):
+    """Basit hareketli ortalama"""
+    return graph.rolling(source, 'mean', window)
+
+
+@indicator('rsi')
+def rsi(graph, window, source='close'):
+    """RSI (kazanç/kayıp kayan ortalamalarıyla, main2.py tanımı)"""
+    delta = ('diff', source)
+    gain = graph.rolling(('gain', delta), 'mean', window)
+    loss = graph.rolling(('loss', delta), 'mean', window)
+    return 100 - (100 / (1 + gain / loss))
+
+
+@indicator('rsi_wilder')
+def rsi_wilder(graph, window, source='close'):
+    """RSI (Wilder üstel ortalaması, ta kütüphanesiyle aynı)"""
+    delta = ('diff', source)
+    gain = graph.ewm(('gain', delta), alpha=1 / window, adjust=False, min_periods=window)
+    loss = graph.ewm(('loss', delta), alpha=1 / window, adjust=False, min_periods=window)
+    rs = gain / loss
+    return (100 - (100 / (1 + rs))).where(loss != 0, 100)
+
+
+@indicator('macd', outputs=('macd', 'signal', 'histogram'))
+def macd(graph, fast=12, slow=26, signal=9, adjust=True, source='close'):
+    """
+    MACD çizgisi, sinyal çizgisi ve histogram
+
+    adjust=False iken ta kütüphanesi gibi ilk pencereler NaN bırakılır.
+    """
+    def ema(key, span):
+        return ('ewm_mean', key, span, None, adjust, 0 if adjust else span)
+
+    # Çizgi de anahtardır: farklı sinyal periyotları aynı çizgiyi paylaşır
+    line = ('sub', ema(source, fast), ema(source, slow))
+    signal_line = ema(line, signal)
+    return {'macd': graph.get(line), 'signal': graph.get(signal_line),
+            'histogram': graph.sub(line, signal_line)}
+
+
+@indicator('bollinger', outputs=('middle', 'upper', 'lower'))
+def bollinger(graph, window=20, width=2, ddof=1, source='close'):
+    """Bollinger bantları (orta bant SMA ile paylaşılır)"""
+    middle = graph.rolling(source, 'mean', window)
+    std = graph.rolling_std(source, window, ddof)
+    return {'middle': middle, 'upper': middle + std * width, 'lower': middle - std * width}
+
+
+@indicator('stochastic', outputs=('k', 'd'))
+def stochastic(graph, window=14, smooth=3):
+    """Stokastik osilatör %K ve %D"""
+    low_min = graph.rolling('low', 'min', window)
+    high_max = graph.rolling('high', 'max', window)
+    k = 100 * ((graph.get('close') - low_min) / (high_max - low_min))
+    return {'k': k, 'd': k.rolling(window=smooth).mean()}
@@ -7,29 +7,44 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
+from backtest_kernel import run_backtest, iter_trades
+from trade_ledger import TradeLedger
+from verbosity import get_logger, TRADE
+from reporting import DEFAULT_MAX_POINTS, draw_simple_panels, headless_figure, save_figure
 import warnings
 warnings.filterwarnings('ignore')
 
+log = get_logger('main1')
+
 class TradingBot:
     def __init__(self, initial_capital=10000):
         """Trading Bot sınıfını başlatır"""
         self.initial_capital = initial_capital
         self.capital = initial_capital
-        self.portfolio_values = []
-        self.trades = []
-        
-    def create_sample_data(self):
-        """Örnek hisse senedi verisi oluşturur"""
-        print("📊 Örnek veri oluşturuluyor...")
-        dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
-        np.random.seed(42)
+        self.portfolio_values = np.empty(0)
+        self.trades = TradeLedger(fields=('Date', 'Action', 'Price', 'Shares', 'Reason'))
+        
+    def create_sample_data(self, n_days=None, seed=42):
+        """
+        Örnek hisse senedi verisi oluşturur
+        
+        Args:
+            n_days (int): Verilirse 2023 başından itibaren bu kadar gün üretilir
+            seed (int): Rastgelelik tohumu
+        """
+        log.info("📊 Örnek veri oluşturuluyor...")
+        if n_days:
+            dates = pd.date_range('2023-01-01', periods=n_days, freq='D')
+        else:
+            dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
+        np.random.seed(seed)
         prices = 100 + np.cumsum(np.random.randn(len(dates)) * 0.5)
         
         data = pd.DataFrame({
             'Date': dates,
             'Close': prices
         })
-        print(f"✅ {len(data)} günlük veri oluşturuldu")
+        log.info(f"✅ {len(data)} günlük veri oluşturuldu")
         return data
     
     def calculate_sma(self, data, window=5):
@@ -54,60 +69,32 @@ class TradingBot:
     
     def backtest(self, data):
         """Backtesting işlemini gerçekleştirir"""
-        print("🔄 Backtesting başlatılıyor...")
-        
-        self.capital = self.initial_capital
-        shares = 0
-        
-        for i, row in data.iterrows():
-            if pd.isna(row['SMA_5']):
-                continue
-                
-            current_price = row['Close']
-            signal = row['Signal']
-            
-            # Al sinyali
-            if signal == 1 and shares == 0:
-                shares = self.capital / current_price
-                self.capital = 0
-                self.trades.append({
-                    'Date': row['Date'],
-                    'Action': 'BUY',
-                    'Price': current_price,
-                    'Shares': shares
-                })
-                print(f"🟢 AL: {row['Date'].strftime('%Y-%m-%d')} - Fiyat: {current_price:.2f} TL")
-            
-            # Sat sinyali
-            elif signal == -1 and shares > 0:
-                self.capital = shares * current_price
-                self.trades.append({
-                    'Date': row['Date'],
-                    'Action': 'SELL',
-                    'Price': current_price,
-                    'Shares': shares
-                })
-                print(f"🔴 SAT: {row['Date'].strftime('%Y-%m-%d')} - Fiyat: {current_price:.2f} TL")
-                shares = 0
-            
-            # Portföy değeri hesaplama
-            if shares > 0:
-                portfolio_value = shares * current_price
-            else:
-                portfolio_value = self.capital
-                
-            self.portfolio_values.append(portfolio_value)
-        
-        # Son pozisyonu kapat
-        if shares > 0:
-            self.capital = shares * data['Close'].iloc[-1]
-            self.trades.append({
-                'Date': data['Date'].iloc[-1],
-                'Action': 'SELL',
-                'Price': data['Close'].iloc[-1],
-                'Shares': shares
-            })
-            print(f"🔴 SON SAT: {data['Date'].iloc[-1].strftime('%Y-%m-%d')} - Fiyat: {data['Close'].iloc[-1]:.2f} TL")
+        log.info("🔄 Backtesting başlatılıyor...")
+        
+        valid = data['SMA_5'].notna().to_numpy()
+        result = run_backtest(
+            data['Close'].to_numpy(),
+            data['Signal'].to_numpy(),
+            valid=valid,
+            initial_capital=self.initial_capital
+        )
+        self.capital = result['final_capital']
+        
+        self.trades.extend_from_result(result, data['Date'])
+        
+        # İşlem satırları sadece 'trades' seviyesinde biçimlendirilir
+        if log.isEnabledFor(TRADE):
+            for idx, action, price, shares, reason in iter_trades(result):
+                date = data['Date'].iloc[idx]
+                if action == 'BUY':
+                    log.log(TRADE, f"🟢 AL: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+                elif reason == 'Final':
+                    log.log(TRADE, f"🔴 SON SAT: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+                else:
+                    log.log(TRADE, f"🔴 SAT: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+        
+        # Portföy değeri (SMA'sı olan barlar)
+        self.portfolio_values = np.concatenate([self.portfolio_values, result['equity'][valid]])
         
         return {
             'final_capital': self.capital,
@@ -116,48 +103,47 @@ class TradingBot:
             'portfolio_values': self.portfolio_values
         }
     
-    def plot_results(self, data, results):
-        """Sonuçları görselleştirir"""
-        print("📊 Grafikler oluşturuluyor...")
-        
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-        
-        # Hisse fiyatı ve hareketli ortalama
-        ax1.plot(data['Date'], data['Close'], label='Hisse Fiyatı', linewidth=2, color='blue')
-        ax1.plot(data['Date'], data['SMA_5'], label='5-Günlük MA', linewidth=2, color='orange')
-        
-        # Al/sat sinyalleri
-        buy_signals = data[data['Position'] == 1]
-        sell_signals = data[data['Position'] == -1]
-        
-        ax1.scatter(buy_signals['Date'], buy_signals['Close'], 
-                   color='green', marker='^', s=100, label='Al Sinyali', zorder=5)
-        ax1.scatter(sell_signals['Date'], sell_signals['Close'], 
-                   color='red', marker='v', s=100, label='Sat Sinyali', zorder=5)
-        
-        ax1.set_title('Hisse Senedi Fiyatı ve Al/Sat Sinyalleri', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Fiyat (TL)')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Portföy değeri
-        portfolio_dates = data['Date'].iloc[:len(results['portfolio_values'])]
-        ax2.plot(portfolio_dates, results['portfolio_values'], 
-                color='purple', linewidth=2, label='Portföy Değeri')
-        ax2.axhline(y=self.initial_capital, color='red', linestyle='--', 
-                   label=f'Başlangıç Sermayesi ({self.initial_capital:,} TL)')
-        
-        ax2.set_title('Portföy Değeri Değişimi', fontsize=14, fontweight='bold')
-        ax2.set_xlabel('Tarih')
-        ax2.set_ylabel('Portföy Değeri (TL)')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
+    def plot_results(self, data, results, output=None, formats=('png',),
+                     max_points=DEFAULT_MAX_POINTS):
+        """
+        Sonuçları görselleştirir
+        
+        Args:
+            data (pd.DataFrame): Sinyal sütunları olan veri
+            results (dict): backtest çıktısı
+            output (str): Verilirse ekran açılmaz, grafik bu yola (uzantısız) kaydedilir
+            formats (tuple): output ile kaydedilecek formatlar ('png', 'svg', 'pdf', 'html')
+            max_points (int): Panel başına en fazla nokta (uzun seriler seyreltilir)
+            
+        Returns:
+            dict veya None: output verildiyse format -> dosya yolu
+        """
+        log.info("📊 Grafikler oluşturuluyor...")
+        
+        if output:
+            fig, axes = headless_figure(2, (14, 10))
+        else:
+            fig, axes = plt.subplots(2, 1, figsize=(14, 10))
+        
+        draw_simple_panels(axes, data, results['portfolio_values'], self.initial_capital, max_points)
+        fig.tight_layout()
+        
+        if output:
+            return save_figure(fig, output, formats, title="Backtest Raporu",
+                               results=results, initial_capital=self.initial_capital)
         plt.show()
     
-    def print_summary(self, results):
-        """Backtesting özetini yazdırır"""
+    def print_summary(self, results, show_trades=True):
+        """
+        Backtesting özetini yazdırır
+        
+        Çıktı seviyesinden bağımsızdır; toplu çalıştırmalarda özet
+        sadece istenince bu metotla basılır.
+        
+        Args:
+            results (dict): backtest çıktısı
+            show_trades (bool): İşlem detaylarını da listele
+        """
         print("\n" + "="*60)
         print("📊 BACKTESTING SONUÇLARI")
         print("="*60)
@@ -171,7 +157,7 @@ class TradingBot:
             print(f"📅 Son İşlem: {results['trades'][-1]['Date'].strftime('%Y-%m-%d')}")
         
         # İşlem detayları
-        if results['trades']:
+        if show_trades and results['trades']:
             print("\n📋 İŞLEM DETAYLARI:")
             print("-" * 40)
             for trade in results['trades']:
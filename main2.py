@@ -6,19 +6,81 @@ Güncel Hisse Senedi Alım-Satım Botu
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import yfinance as yf
+import time
+import logging
+import argparse
+import itertools
 from datetime import datetime, timedelta
+from strategy import sma_rsi_macd
+from backtest_kernel import run_backtest, iter_trades
+from trade_ledger import TradeLedger
+from data_cache import OHLCVCache, yahoo_downloader
+from downloader import fetch_many, summarize_report, yahoo_batch_downloader
+from portfolio import closes_from_store, backtest_portfolio, strategy_signals
+from history_store import HistoryStore
+from alignment import AlignedFrames, align_frames, DEFAULT_ALIGNED_DIR
+from screener import screen, DEFAULT_LOOKBACK
+from walk_forward import walk_forward, DEFAULT_WINDOW_GRIDS
+from metrics import compute_metrics, periods_per_year, position_from_trades
+from indicators import add_indicators
+from profiling import PROFILER, traced
+from verbosity import get_logger, set_verbosity, LEVELS, TRADE
+from bars import is_intraday, window_bars, compact_frame, bars_per_session, session_index
+from reporting import DEFAULT_MAX_POINTS, draw_current_panels, headless_figure, save_figure
 import warnings
 warnings.filterwarnings('ignore')
 
+log = get_logger('main2')
+
 class CurrentTradingBot:
-    def __init__(self, initial_capital=10000):
-        """Güncel Trading Bot sınıfını başlatır"""
+    # İndikatör pencereleri: bar sayısı (int) ya da süre ('30min', '2h')
+    DEFAULT_WINDOWS = {
+        'sma_5': 5,
+        'sma_10': 10,
+        'sma_20': 20,
+        'rsi': 14,
+        'bb': 20,
+        'stoch': 14,
+    }
+    
+    def __init__(self, initial_capital=10000, cache=None, interval='1d', windows=None,
+                 compact=False, costs=None, strategy=None):
+        """
+        Güncel Trading Bot sınıfını başlatır
+        
+        Args:
+            initial_capital (float): Başlangıç sermayesi
+            cache (OHLCVCache): Verilirse veri yerel önbellekten okunur
+            interval (str): Bar aralığı ('1d', '1h', '5m', '1m' ...)
+            windows (dict): DEFAULT_WINDOWS üzerine yazılacak pencereler;
+                sütun adları (sma_5 ...) pencereden bağımsız olarak korunur
+            compact (bool): Veriyi float32/int32 sütunlarla tut
+            costs (CostModel): İşlem maliyeti ve slippage modeli (None ise maliyetsiz)
+            strategy (Strategy): Sinyal stratejisi (None ise SMA/RSI/MACD ağırlıklı oy)
+        """
         self.initial_capital = initial_capital
+        self.cache = cache
+        self.interval = interval
+        self.windows = dict(self.DEFAULT_WINDOWS, **(windows or {}))
+        self.compact = compact
+        self.costs = costs
+        self.strategy = strategy if strategy is not None else sma_rsi_macd()
+        self.download_report = None
         self.capital = initial_capital
-        self.portfolio_values = []
-        self.trades = []
+        self.portfolio_values = np.empty(0)
+        self.trades = TradeLedger()
+    
+    def _window(self, name, windows=None):
+        """Pencereyi bot aralığında bar sayısına çevirir"""
+        return window_bars((windows or self.windows)[name], self.interval)
+    
+    def _end_date(self):
+        """Veri isteklerinin bitişi (gün içi aralıklarda şu an)"""
+        if is_intraday(self.interval):
+            return pd.Timestamp.now().floor('min')
+        return datetime.now().strftime('%Y-%m-%d')
         
+    @traced()
     def get_current_data(self, symbol="AAPL", start_date="2025-01-01"):
         """
         2025 başından şimdiye kadar güncel veri çeker
@@ -30,57 +92,70 @@ class CurrentTradingBot:
         Returns:
             pd.DataFrame: Güncel hisse senedi verileri
         """
-        print(f"📊 {symbol} için 2025 güncel veri çekiliyor...")
-        print(f"📅 Tarih aralığı: {start_date} - {datetime.now().strftime('%Y-%m-%d')}")
+        log.info(f"📊 {symbol} için 2025 güncel veri çekiliyor...")
+        log.info(f"📅 Tarih aralığı: {start_date} - {datetime.now().strftime('%Y-%m-%d')}")
         
         try:
-            ticker = yf.Ticker(symbol)
-            
-            # Güncel veri çek
-            data = ticker.history(
-                start=start_date,
-                end=datetime.now().strftime('%Y-%m-%d'),
-                interval='1d'
-            )
+            if self.cache is not None:
+                # Önbellekten oku, sadece yeni barları indir
+                data = self.cache.get(symbol, start_date, self._end_date(), interval=self.interval)
+            else:
+                # Güncel veri çek
+                data = yahoo_downloader(symbol, start_date, self._end_date(), self.interval)
             
             if data.empty:
-                print("❌ Veri bulunamadı, örnek veri oluşturuluyor...")
+                log.warning("❌ Veri bulunamadı, örnek veri oluşturuluyor...")
                 return self.create_sample_data_2025()
             
-            data.reset_index(inplace=True)
-            data.columns = [col.lower() for col in data.columns]
-            
             # Tarih formatını düzenle
             data['date'] = pd.to_datetime(data['date'])
+            if self.compact:
+                data = compact_frame(data)
             
-            print(f"✅ {len(data)} günlük güncel veri çekildi")
-            print(f"📈 İlk fiyat: {data['close'].iloc[0]:.2f} TL")
-            print(f"📈 Son fiyat: {data['close'].iloc[-1]:.2f} TL")
-            print(f"📊 Fiyat değişimi: {((data['close'].iloc[-1] - data['close'].iloc[0]) / data['close'].iloc[0] * 100):.2f}%")
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"✅ {len(data)} günlük güncel veri çekildi")
+                log.info(f"📈 İlk fiyat: {data['close'].iloc[0]:.2f} TL")
+                log.info(f"📈 Son fiyat: {data['close'].iloc[-1]:.2f} TL")
+                log.info(f"📊 Fiyat değişimi: {((data['close'].iloc[-1] - data['close'].iloc[0]) / data['close'].iloc[0] * 100):.2f}%")
             
             return data
             
         except Exception as e:
-            print(f"❌ Veri çekme hatası: {e}")
-            print("📊 Örnek veri oluşturuluyor...")
+            log.warning(f"❌ Veri çekme hatası: {e}")
+            log.info("📊 Örnek veri oluşturuluyor...")
             return self.create_sample_data_2025()
     
-    def create_sample_data_2025(self):
-        """2025 için örnek veri oluşturur"""
-        print("📊 2025 örnek veri oluşturuluyor...")
+    @traced()
+    def create_sample_data_2025(self, n_bars=None, seed=42):
+        """
+        2025 için örnek veri oluşturur
+        
+        Args:
+            n_bars (int): Verilirse 2025 başından itibaren bu kadar iş günü
+                (gün içi aralıklarda seans barı) üretilir, verilmezse bugüne
+                kadar (gün içi aralıklarda 20 seans)
+            seed (int): Rastgelelik tohumu
+        """
+        log.info("📊 2025 örnek veri oluşturuluyor...")
         
         # 2025 başından bugüne kadar
         start_date = datetime(2025, 1, 1)
-        end_date = datetime.now()
-        dates = pd.date_range(start_date, end_date, freq='D')
-        
-        # Hafta sonları hariç (sadece iş günleri)
-        dates = dates[dates.weekday < 5]
+        per_session = bars_per_session(self.interval)
+        if is_intraday(self.interval):
+            dates = session_index(start_date, n_bars or 20 * per_session, self.interval)
+        elif n_bars:
+            dates = pd.bdate_range(start_date, periods=n_bars)
+        else:
+            end_date = datetime.now()
+            dates = pd.date_range(start_date, end_date, freq='D')
+            
+            # Hafta sonları hariç (sadece iş günleri)
+            dates = dates[dates.weekday < 5]
         
-        np.random.seed(42)
+        np.random.seed(seed)
         # 2025 için daha gerçekçi fiyat hareketi
         base_price = 100
-        price_changes = np.random.randn(len(dates)) * 0.02  # %2 günlük volatilite
+        price_changes = np.random.randn(len(dates)) * 0.02 / np.sqrt(per_session)  # %2 günlük volatilite
         prices = base_price * np.exp(np.cumsum(price_changes))
         
         data = pd.DataFrame({
@@ -90,242 +165,382 @@ class CurrentTradingBot:
             'low': prices * (1 - np.random.uniform(0, 0.02, len(dates))),
             'volume': np.random.randint(1000, 10000, len(dates))
         })
+        if self.compact:
+            data = compact_frame(data)
         
-        print(f"✅ {len(data)} günlük 2025 örnek veri oluşturuldu")
+        log.info(f"✅ {len(data)} günlük 2025 örnek veri oluşturuldu")
         return data
     
-    def get_multiple_stocks(self, symbols=["AAPL", "GOOGL", "MSFT", "TSLA"]):
+    @traced()
+    def get_multiple_stocks(self, symbols=["AAPL", "GOOGL", "MSFT", "TSLA"],
+                            start_date="2025-01-01", max_workers=8, fetch=None, store=None):
         """
-        Birden fazla hisse senedi verisi çeker
+        Birden fazla hisse senedi verisini eşzamanlı çeker
         
         Args:
             symbols (list): Hisse senedi sembolleri
+            start_date (str): Başlangıç tarihi
+            max_workers (int): Aynı anda en fazla istek sayısı
+            fetch (callable): symbol -> DataFrame; verilmezse önbellek ya da
+                Yahoo Finance kullanılır (testlerde SimulatedSource verilebilir)
+            store (HistoryStore veya str): Verilirse veri indirilmez, depodan
+                tembel okunur (semboller erişildikçe DataFrame'e dönüşür)
             
         Returns:
             dict: Her hisse için veri
         """
-        print("📊 Birden fazla hisse senedi verisi çekiliyor...")
+        if store is not None:
+            if not isinstance(store, HistoryStore):
+                store = HistoryStore(store)
+            stocks_data = store.frames(symbols, start=start_date)
+            log.info(f"📦 {len(stocks_data)}/{len(symbols)} sembol depodan açıldı ({store.path})")
+            return stocks_data
+        
+        log.info(f"📊 {len(symbols)} hisse senedi verisi eşzamanlı çekiliyor...")
+        
+        end_date = self._end_date()
+        interval = self.interval
+        batch_fetch = None
+        
+        if fetch is None:
+            if self.cache is not None:
+                # Önbellek sembol bazında artımlı güncellenir
+                def fetch(symbol):
+                    return self.cache.get(symbol, start_date, end_date, interval=interval)
+            else:
+                def fetch(symbol):
+                    return yahoo_downloader(symbol, start_date, end_date, interval)
+                
+                def batch_fetch(batch_symbols):
+                    return yahoo_batch_downloader(batch_symbols, start_date, end_date, interval)
         
-        stocks_data = {}
+        start = time.perf_counter()
+        stocks_data, report = fetch_many(symbols, fetch, batch_fetch=batch_fetch,
+                                         max_workers=max_workers)
+        summary = summarize_report(report, wall_time=time.perf_counter() - start)
+        self.download_report = report
         
-        for symbol in symbols:
-            print(f"\n🔄 {symbol} verisi çekiliyor...")
-            try:
-                data = self.get_current_data(symbol)
-                stocks_data[symbol] = data
-                print(f"✅ {symbol} verisi hazır")
-            except Exception as e:
-                print(f"❌ {symbol} veri çekme hatası: {e}")
+        for symbol, data in stocks_data.items():
+            data['date'] = pd.to_datetime(data['date'])
+            if self.compact:
+                stocks_data[symbol] = compact_frame(data, symbol=symbol)
+        
+        for metric in report.itertuples():
+            if metric.status == 'ok':
+                log.info(f"✅ {metric.symbol} verisi hazır ({metric.rows} bar, "
+                      f"{metric.latency_s * 1000:.0f} ms, {metric.attempts} deneme)")
+            elif metric.status == 'empty':
+                log.warning(f"❌ {metric.symbol} için veri bulunamadı")
+            else:
+                log.warning(f"❌ {metric.symbol} veri çekme hatası: {metric.error}")
+        
+        log.info(f"📊 {summary['ok']}/{summary['symbols']} sembol {summary['wall_time_s']:.2f} saniyede çekildi "
+              f"(p50 {summary['latency_p50_s'] * 1000:.0f} ms, p95 {summary['latency_p95_s'] * 1000:.0f} ms, "
+              f"{summary['retries']} tekrar deneme)")
         
         return stocks_data
     
-    def calculate_technical_indicators(self, data):
-        """Teknik indikatörleri hesaplar"""
-        print("🔄 Teknik indikatörler hesaplanıyor...")
-        
-        # Hareketli ortalamalar
-        data['sma_5'] = data['close'].rolling(window=5).mean()
-        data['sma_10'] = data['close'].rolling(window=10).mean()
-        data['sma_20'] = data['close'].rolling(window=20).mean()
-        
-        # RSI
-        delta = data['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['rsi'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        exp1 = data['close'].ewm(span=12).mean()
-        exp2 = data['close'].ewm(span=26).mean()
-        data['macd'] = exp1 - exp2
-        data['macd_signal'] = data['macd'].ewm(span=9).mean()
-        data['macd_histogram'] = data['macd'] - data['macd_signal']
-        
-        # Bollinger Bands
-        data['bb_middle'] = data['close'].rolling(window=20).mean()
-        bb_std = data['close'].rolling(window=20).std()
-        data['bb_upper'] = data['bb_middle'] + (bb_std * 2)
-        data['bb_lower'] = data['bb_middle'] - (bb_std * 2)
-        
-        # Stochastic
-        low_min = data['low'].rolling(window=14).min()
-        high_max = data['high'].rolling(window=14).max()
-        data['stoch_k'] = 100 * ((data['close'] - low_min) / (high_max - low_min))
-        data['stoch_d'] = data['stoch_k'].rolling(window=3).mean()
-        
-        print("✅ Teknik indikatörler hesaplandı")
+    def indicator_columns(self, windows=None):
+        """
+        Botun indikatör sütun tanımları (bkz. indicators.IndicatorGraph.evaluate)
+        
+        Args:
+            windows (dict): Bot pencerelerinin üzerine yazılacak pencereler
+                (parametre taramalarında)
+        
+        Returns:
+            dict: Sütun adı -> (indikatör, parametreler[, çıktı])
+        """
+        windows = dict(self.windows, **(windows or {}))
+        bb_window = self._window('bb', windows)
+        stoch_window = self._window('stoch', windows)
+        return {
+            # Hareketli ortalamalar
+            'sma_5': ('sma', {'window': self._window('sma_5', windows)}),
+            'sma_10': ('sma', {'window': self._window('sma_10', windows)}),
+            'sma_20': ('sma', {'window': self._window('sma_20', windows)}),
+            # RSI
+            'rsi': ('rsi', {'window': self._window('rsi', windows)}),
+            # MACD
+            'macd': ('macd', {}, 'macd'),
+            'macd_signal': ('macd', {}, 'signal'),
+            'macd_histogram': ('macd', {}, 'histogram'),
+            # Bollinger Bands (orta bant aynı pencereli SMA ile paylaşılır)
+            'bb_middle': ('bollinger', {'window': bb_window}, 'middle'),
+            'bb_upper': ('bollinger', {'window': bb_window}, 'upper'),
+            'bb_lower': ('bollinger', {'window': bb_window}, 'lower'),
+            # Stochastic
+            'stoch_k': ('stochastic', {'window': stoch_window}, 'k'),
+            'stoch_d': ('stochastic', {'window': stoch_window}, 'd'),
+        }
+    
+    @traced()
+    def calculate_technical_indicators(self, data, columns=None):
+        """
+        Teknik indikatörleri hesaplar
+        
+        Ortak ara sonuçlar (kayan ortalamalar, fark, EWM) bir kez hesaplanır.
+        
+        Args:
+            data (pd.DataFrame): OHLCV verisi
+            columns (iterable): Sadece bu sütunları hesapla (None ise hepsi)
+        """
+        log.info("🔄 Teknik indikatörler hesaplanıyor...")
+        
+        data = add_indicators(data, self.indicator_columns(), only=columns)
+        
+        log.info("✅ Teknik indikatörler hesaplandı")
         return data
     
+    @traced()
     def generate_signals(self, data):
         """Al/sat sinyalleri üretir"""
-        print("🔄 Al/sat sinyalleri üretiliyor...")
+        log.info("🔄 Al/sat sinyalleri üretiliyor...")
         
-        data['signal'] = 0
-        data['position'] = 0
-        
-        for i in range(1, len(data)):
-            if pd.isna(data['sma_5'].iloc[i]) or pd.isna(data['rsi'].iloc[i]):
-                continue
-                
-            # Temel sinyal: SMA
-            sma_signal = 1 if data['close'].iloc[i] > data['sma_5'].iloc[i] else -1
-            
-            # RSI sinyali
-            rsi_signal = 0
-            if data['rsi'].iloc[i] < 30:  # Oversold
-                rsi_signal = 1
-            elif data['rsi'].iloc[i] > 70:  # Overbought
-                rsi_signal = -1
-            
-            # MACD sinyali
-            macd_signal = 0
-            if data['macd'].iloc[i] > data['macd_signal'].iloc[i]:
-                macd_signal = 1
-            elif data['macd'].iloc[i] < data['macd_signal'].iloc[i]:
-                macd_signal = -1
-            
-            # Kombine sinyal
-            combined_signal = (sma_signal * 0.5 + rsi_signal * 0.3 + macd_signal * 0.2)
-            
-            if combined_signal > 0.3:
-                data.loc[data.index[i], 'signal'] = 1
-            elif combined_signal < -0.3:
-                data.loc[data.index[i], 'signal'] = -1
+        # Strateji kuralları (varsayılan: SMA 0.5, RSI 0.3, MACD 0.2)
+        data['signal'] = self.strategy.signals(data)
         
         # Pozisyon değişimi
         data['position'] = data['signal'].diff()
         
         # Sinyal sayıları
-        buy_signals = len(data[data['position'] == 1])
-        sell_signals = len(data[data['position'] == -1])
-        
-        print(f"✅ {buy_signals} al sinyali, {sell_signals} sat sinyali üretildi")
+        if log.isEnabledFor(logging.INFO):
+            buy_signals = len(data[data['position'] == 1])
+            sell_signals = len(data[data['position'] == -1])
+            log.info(f"✅ {buy_signals} al sinyali, {sell_signals} sat sinyali üretildi")
         return data
     
+    @traced()
     def backtest(self, data):
         """Backtesting yapar"""
-        print("🔄 2025 backtesting başlatılıyor...")
-        
-        self.capital = self.initial_capital
-        shares = 0
-        
-        for i, row in data.iterrows():
-            if pd.isna(row['sma_5']):
-                continue
-                
-            current_price = row['close']
-            signal = row['signal']
-            
-            # Al sinyali
-            if signal == 1 and shares == 0:
-                shares = self.capital / current_price
-                self.capital = 0
-                self.trades.append({
-                    'date': row['date'],
-                    'action': 'BUY',
-                    'price': current_price,
-                    'shares': shares
-                })
-                print(f"🟢 AL: {row['date'].strftime('%Y-%m-%d')} - Fiyat: {current_price:.2f} TL")
-            
-            # Sat sinyali
-            elif signal == -1 and shares > 0:
-                self.capital = shares * current_price
-                self.trades.append({
-                    'date': row['date'],
-                    'action': 'SELL',
-                    'price': current_price,
-                    'shares': shares
-                })
-                print(f"🔴 SAT: {row['date'].strftime('%Y-%m-%d')} - Fiyat: {current_price:.2f} TL")
-                shares = 0
-            
-            # Portföy değeri
-            if shares > 0:
-                portfolio_value = shares * current_price
-            else:
-                portfolio_value = self.capital
-                
-            self.portfolio_values.append(portfolio_value)
-        
-        # Son pozisyonu kapat
-        if shares > 0:
-            self.capital = shares * data['close'].iloc[-1]
-            self.trades.append({
-                'date': data['date'].iloc[-1],
-                'action': 'SELL',
-                'price': data['close'].iloc[-1],
-                'shares': shares
-            })
-            print(f"🔴 SON SAT: {data['date'].iloc[-1].strftime('%Y-%m-%d')} - Fiyat: {data['close'].iloc[-1]:.2f} TL")
+        log.info("🔄 2025 backtesting başlatılıyor...")
+        
+        # Stratejinin ana indikatörü oluşunca başlanır
+        valid = data[list(self.strategy.requires[:1])].notna().all(axis=1).to_numpy()
+        result = run_backtest(
+            data['close'].to_numpy(),
+            data['signal'].to_numpy(),
+            valid=valid,
+            initial_capital=self.initial_capital,
+            costs=self.costs,
+            open_prices=data['open'].to_numpy() if 'open' in data else None,
+            volume=data['volume'].to_numpy() if 'volume' in data else None
+        )
+        self.capital = result['final_capital']
+        
+        self.trades.extend_from_result(result, data['date'])
+        
+        # İşlem satırları sadece 'trades' seviyesinde biçimlendirilir
+        if log.isEnabledFor(TRADE):
+            for idx, action, price, shares, reason in iter_trades(result):
+                date = data['date'].iloc[idx]
+                if action == 'BUY':
+                    log.log(TRADE, f"🟢 AL: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+                elif reason == 'Final':
+                    log.log(TRADE, f"🔴 SON SAT: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+                else:
+                    log.log(TRADE, f"🔴 SAT: {date.strftime('%Y-%m-%d')} - Fiyat: {price:.2f} TL")
+        
+        # Portföy değeri (SMA'sı olan barlar)
+        self.portfolio_values = np.concatenate([self.portfolio_values, result['equity'][valid]])
+        
+        position = position_from_trades(len(data), result['trade_index'], result['trade_side'])
+        metrics = compute_metrics(result['equity'], position, periods_per_year(self.interval))
         
         return {
             'final_capital': self.capital,
             'total_return': (self.capital - self.initial_capital) / self.initial_capital * 100,
             'trades': self.trades,
-            'portfolio_values': self.portfolio_values
+            'portfolio_values': self.portfolio_values,
+            'total_costs': result['total_costs'],
+            'metrics': metrics
         }
     
-    def plot_current_results(self, data, results):
-        """Güncel sonuçları görselleştirir"""
-        print("📊 2025 güncel grafikler oluşturuluyor...")
-        
-        fig, axes = plt.subplots(3, 1, figsize=(16, 12))
-        
-        # 1. Hisse fiyatı ve sinyaller
-        ax1 = axes[0]
-        ax1.plot(data['date'], data['close'], label='Hisse Fiyatı', linewidth=2, color='blue')
-        ax1.plot(data['date'], data['sma_5'], label='5-Günlük MA', linewidth=2, color='orange')
-        ax1.plot(data['date'], data['sma_20'], label='20-Günlük MA', linewidth=2, color='red')
-        
-        # Bollinger Bands
-        ax1.fill_between(data['date'], data['bb_upper'], data['bb_lower'], 
-                        alpha=0.2, color='gray', label='Bollinger Bands')
-        
-        # Al/sat sinyalleri
-        buy_signals = data[data['position'] == 1]
-        sell_signals = data[data['position'] == -1]
-        
-        ax1.scatter(buy_signals['date'], buy_signals['close'], 
-                   color='green', marker='^', s=100, label='Al Sinyali', zorder=5)
-        ax1.scatter(sell_signals['date'], sell_signals['close'], 
-                   color='red', marker='v', s=100, label='Sat Sinyali', zorder=5)
-        
-        ax1.set_title('2025 Güncel Hisse Senedi Fiyatı ve Sinyaller', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Fiyat (TL)')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # 2. RSI
-        ax2 = axes[1]
-        ax2.plot(data['date'], data['rsi'], label='RSI', color='purple', linewidth=2)
-        ax2.axhline(y=70, color='red', linestyle='--', alpha=0.7, label='Overbought (70)')
-        ax2.axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Oversold (30)')
-        ax2.set_ylabel('RSI')
-        ax2.set_ylim(0, 100)
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        # 3. Portföy değeri
-        ax3 = axes[2]
-        portfolio_dates = data['date'].iloc[:len(results['portfolio_values'])]
-        ax3.plot(portfolio_dates, results['portfolio_values'], 
-                color='purple', linewidth=2, label='Portföy Değeri')
-        ax3.axhline(y=self.initial_capital, color='red', linestyle='--', 
-                   label=f'Başlangıç Sermayesi ({self.initial_capital:,} TL)')
-        
-        ax3.set_title('2025 Portföy Değeri Değişimi', fontsize=14, fontweight='bold')
-        ax3.set_xlabel('Tarih')
-        ax3.set_ylabel('Portföy Değeri (TL)')
-        ax3.legend()
-        ax3.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
+    @traced()
+    def align_stocks(self, stocks_data, adjust='auto'):
+        """
+        Sembolleri tek ana takvimde hizalar (ileri doldurma maskeleri ve
+        bölünme/temettü düzeltmesiyle)
+        
+        Önbellek kullanılıyorsa sonuç .cache/aligned altında saklanır; aynı
+        veriyle tekrar çağrıldığında sembol bazında hizalama yapılmaz.
+        
+        Args:
+            stocks_data (dict): get_multiple_stocks çıktısı
+            adjust (bool veya str): Kurumsal işlem düzeltmesi ('auto' sadece ham veride)
+            
+        Returns:
+            AlignedFrames: Hizalanmış (sembol x bar) matrisler
+        """
+        cache_dir = DEFAULT_ALIGNED_DIR if self.cache is not None else None
+        aligned = align_frames(stocks_data, adjust=adjust, normalize=not is_intraday(self.interval),
+                               cache_dir=cache_dir)
+        log.info(f"📐 {len(aligned.symbols)} sembol {len(aligned.calendar)} barlık takvimde hizalandı "
+                 f"({int(aligned.filled.sum())} bar ileri dolduruldu"
+                 f"{', düzeltilmiş' if aligned.adjusted else ''})")
+        return aligned
+    
+    @traced()
+    def backtest_portfolio(self, stocks_data, allocation='equal'):
+        """
+        Birden fazla hisse için ortak nakitli portföy backtest'i yapar
+        
+        Sinyaller tek sembollü backtest'teki gibi botun stratejisi ve indikatör
+        tanımlarıyla tüm semboller için tek geçişte üretilir; botun maliyet
+        modeli (dolum, ücret, slippage) ağırlık değişimlerine uygulanır.
+        
+        Args:
+            stocks_data (dict, HistoryStore veya AlignedFrames): get_multiple_stocks
+                çıktısı, geçmiş veri deposu (hizalı matris kopyasız okunur) ya da
+                align_stocks çıktısı
+            allocation (str veya dict): 'equal', 'active' veya sembol -> pay
+            
+        Returns:
+            dict: Portföy değeri, getiriler, ağırlıklar ve özet
+        """
+        log.info(f"🔄 {len(stocks_data)} hisselik portföy backtesting başlatılıyor...")
+        
+        if not isinstance(stocks_data, (HistoryStore, AlignedFrames)):
+            stocks_data = self.align_stocks(stocks_data)
+        if isinstance(stocks_data, HistoryStore):
+            available = stocks_data.columns
+            def frame(column):
+                return closes_from_store(stocks_data, column=column)
+        else:
+            available = stocks_data.values
+            frame = stocks_data.frame
+        frames = {column: frame(column) for column in ('open', 'high', 'low', 'close', 'volume')
+                  if column in available}
+        
+        signal = strategy_signals(frames, self.strategy, self.indicator_columns())
+        results = backtest_portfolio(frames['close'], signal, allocation=allocation,
+                                     initial_capital=self.initial_capital, costs=self.costs,
+                                     opens=frames.get('open'), volumes=frames.get('volume'))
+        
+        log.info(f"✅ Portföy final değeri: {results['final_capital']:,.2f} TL "
+              f"({results['total_return']:.2f}%)")
+        return results
+    
+    @traced()
+    def screen(self, source, symbols=None, lookback=DEFAULT_LOOKBACK):
+        """
+        Hizalı evreni botun stratejisine göre tarar (tüm semboller tek geçişte)
+        
+        Args:
+            source (HistoryStore, AlignedFrames veya dict): Geçmiş veri deposu,
+                align_stocks çıktısı ya da get_multiple_stocks çıktısı
+            symbols (list): Taranacak semboller (None ise hepsi)
+            lookback (int): Kullanılacak son bar sayısı
+            
+        Returns:
+            dict: Sıralı sinyal tablosu, tarama tarihi ve süre (bkz. screener.screen)
+        """
+        if not isinstance(source, (HistoryStore, AlignedFrames)):
+            source = self.align_stocks(source)
+        log.info(f"🔎 {len(symbols or source.symbols)} sembol taranıyor ({self.strategy.name})...")
+        
+        result = screen(source, self.strategy, self.indicator_columns(), symbols, lookback)
+        
+        counts = result['table']['action'].value_counts()
+        log.info(f"✅ Tarama {result['elapsed_s'] * 1000:.0f} ms: {counts.get('AL', 0)} al, "
+                 f"{counts.get('SAT', 0)} sat sinyali")
+        return result
+    
+    @traced()
+    def walk_forward(self, data, train_size=252, test_size=63, anchored=False, windows=None,
+                     stop_losses=(0.0,), take_profits=(0.0,), max_workers=None):
+        """
+        Botun stratejisiyle walk-forward optimizasyonu yapar
+        
+        Sinyaller botun stratejisi ve indikatör tanımlarıyla, backtest botun
+        maliyet modeliyle çalışır; sadece taranan pencereler değişir.
+        
+        Args:
+            data (pd.DataFrame): 'date' ve OHLCV sütunları olan veri
+            train_size (int veya str): Eğitim penceresi (bar ya da süre, örn. '30D')
+            test_size (int veya str): Test penceresi (bar ya da süre)
+            anchored (bool): Eğitim penceresi hep ilk bardan başlasın
+            windows (dict): Pencere adı -> denenecek değerler (örn.
+                {'sma_5': range(3, 21), 'rsi': (7, 14, 21)}); None ise
+                stratejinin varsayılan ızgarası (DEFAULT_WINDOW_GRIDS)
+            stop_losses (iterable): Denenecek Stop-Loss oranları (0: kapalı)
+            take_profits (iterable): Denenecek Take-Profit oranları (0: kapalı)
+            max_workers (int): Süreç sayısı (1 ise havuz kullanılmaz)
+            
+        Returns:
+            dict: Pencere tablosu, örneklem dışı portföy eğrisi ve özet
+        """
+        train_size = window_bars(train_size, self.interval)
+        test_size = window_bars(test_size, self.interval)
+        if windows is None:
+            windows = DEFAULT_WINDOW_GRIDS.get(self.strategy.name, {})
+        
+        # Stratejinin okumadığı pencereler aynı sinyali üretir: tekrarlar atlanır
+        needed = self.strategy.columns
+        names = list(windows)
+        param_sets = {}
+        for values in itertools.product(*(windows[name] for name in names)):
+            params = dict(zip(names, values))
+            specs = {column: spec for column, spec in self.indicator_columns(params).items()
+                     if column in needed}
+            param_sets.setdefault(repr(sorted(specs.items())), (params, specs))
+        
+        log.info(f"🔄 Walk-forward: {train_size} bar eğitim, {test_size} bar test "
+                 f"({'sabitlenmiş' if anchored else 'kayan'} pencere), "
+                 f"{len(param_sets)} parametre seti ({self.strategy.name})...")
+        
+        result = walk_forward(data, self.strategy, list(param_sets.values()), train_size,
+                              test_size, anchored, stop_losses=stop_losses,
+                              take_profits=take_profits, initial_capital=self.initial_capital,
+                              costs=self.costs, max_workers=max_workers)
+        
+        log.info(f"✅ {len(result['windows'])} pencere, örneklem dışı getiri: "
+                 f"{result['total_return']:.2f}%")
+        return result
+    
+    @traced()
+    def plot_current_results(self, data, results, output=None, formats=('png',),
+                             max_points=DEFAULT_MAX_POINTS):
+        """
+        Güncel sonuçları görselleştirir
+        
+        Args:
+            data (pd.DataFrame): İndikatör ve sinyal sütunları olan veri
+            results (dict): backtest çıktısı
+            output (str): Verilirse ekran açılmaz, grafik bu yola (uzantısız) kaydedilir
+            formats (tuple): output ile kaydedilecek formatlar ('png', 'svg', 'pdf', 'html')
+            max_points (int): Panel başına en fazla nokta (uzun seriler seyreltilir)
+            
+        Returns:
+            dict veya None: output verildiyse format -> dosya yolu
+        """
+        log.info("📊 2025 güncel grafikler oluşturuluyor...")
+        
+        if output:
+            fig, axes = headless_figure(3, (16, 12))
+        else:
+            fig, axes = plt.subplots(3, 1, figsize=(16, 12))
+        
+        draw_current_panels(axes, data, results['portfolio_values'], self.initial_capital, max_points)
+        fig.tight_layout()
+        
+        if output:
+            return save_figure(fig, output, formats, title="2025 Backtest Raporu",
+                               results=results, initial_capital=self.initial_capital)
         plt.show()
     
-    def print_current_summary(self, results):
-        """Güncel backtesting özetini yazdırır"""
+    @traced()
+    def print_current_summary(self, results, show_trades=True):
+        """
+        Güncel backtesting özetini yazdırır
+        
+        Çıktı seviyesinden bağımsızdır; toplu çalıştırmalarda özet
+        sadece istenince bu metotla basılır.
+        
+        Args:
+            results (dict): backtest çıktısı
+            show_trades (bool): İşlem detaylarını da listele
+        """
         print("\n" + "="*70)
         print("📊 2025 GÜNCEL BACKTESTING SONUÇLARI")
         print("="*70)
@@ -333,13 +548,25 @@ class CurrentTradingBot:
         print(f"💰 Final Sermaye: {results['final_capital']:,.2f} TL")
         print(f"📈 Toplam Getiri: {results['total_return']:.2f}%")
         print(f"🔄 Toplam İşlem Sayısı: {len(results['trades'])}")
+        if self.costs is not None:
+            print(f"💸 İşlem Maliyeti: {results.get('total_costs', 0.0):,.2f} TL ({self.costs})")
+        
+        metrics = results.get('metrics')
+        if metrics:
+            print(f"📐 Sharpe: {metrics['sharpe']:.2f} | Sortino: {metrics['sortino']:.2f} | "
+                  f"CAGR: {metrics['cagr'] * 100:.2f}%")
+            print(f"📉 Max Drawdown: {metrics['max_drawdown'] * 100:.2f}% "
+                  f"({metrics['max_drawdown_bars']:.0f} bar)")
+            print(f"🎯 Kazanma Oranı: {metrics['win_rate'] * 100:.1f}% "
+                  f"({metrics['round_trips']:.0f} al-sat) | Piyasada: {metrics['exposure'] * 100:.1f}% | "
+                  f"Devir: {metrics['turnover']:.1f}x/yıl")
         
         if results['trades']:
             print(f"📅 İlk İşlem: {results['trades'][0]['date'].strftime('%Y-%m-%d')}")
             print(f"📅 Son İşlem: {results['trades'][-1]['date'].strftime('%Y-%m-%d')}")
         
         # İşlem detayları
-        if results['trades']:
+        if show_trades and results['trades']:
             print("\n📋 2025 İŞLEM DETAYLARI:")
             print("-" * 60)
             for trade in results['trades']:
@@ -350,11 +577,18 @@ class CurrentTradingBot:
 
 def main():
     """Ana program fonksiyonu"""
+    parser = argparse.ArgumentParser(description="2025 güncel hisse senedi alım-satım botu")
+    parser.add_argument('--verbosity', choices=list(LEVELS),
+                        help="Çıktı seviyesi (varsayılan BOT_VERBOSITY ya da 'trades')")
+    args = parser.parse_args()
+    if args.verbosity:
+        set_verbosity(args.verbosity)
+    
     print("🤖 2025 Güncel Hisse Senedi Alım-Satım Botu Başlatılıyor...")
     print("="*70)
     
     # Bot'u başlat
-    bot = CurrentTradingBot(initial_capital=10000)
+    bot = CurrentTradingBot(initial_capital=10000, cache=OHLCVCache())
     
     # Hisse senedi seçimi
     print("📊 Hangi hisse senedi için analiz yapmak istiyorsunuz?")
@@ -401,6 +635,9 @@ def main():
     
     print("\n✅ 2025 güncel program başarıyla tamamlandı!")
     print("📊 Grafikler açıldı. Kapatmak için pencereyi kapatın.")
+    
+    # BOT_PROFILE=1 ile açıldıysa aşama profilini göster
+    PROFILER.print_summary()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Performans Metrikleri
+Portföy değeri dizilerinden getiri, Sharpe, Sortino, CAGR, maksimum düşüş
+(ve süresi), kazanma oranı, piyasada kalma oranı ve devir hızı hesaplar.
+Tüm fonksiyonlar tek bir seri (bar) ya da (çalıştırma x bar) matrisi alır
+ve her çalıştırma için sonucu tek vektörel geçişte üretir.
+"""
+
+import numpy as np
+import pandas as pd
+from bars import bars_per_session
+
+TRADING_DAYS = 252
+
+METRIC_COLUMNS = ['total_return', 'cagr', 'sharpe', 'sortino', 'max_drawdown',
+                  'max_drawdown_bars', 'win_rate', 'round_trips', 'exposure', 'turnover']
+
+
+def periods_per_year(interval='1d'):
+    """Aralık için yıllık bar sayısı (gün içi aralıklarda seans başına bar x 252)"""
+    if interval == '1wk':
+        return 52
+    if interval == '5d':
+        return TRADING_DAYS / 5
+    return TRADING_DAYS * bars_per_session(interval)
+
+
+def _as_matrix(values):
+    """Diziyi (çalıştırma x bar) float64 matrisine çevirir"""
+    values = np.asarray(values, dtype=np.float64)
+    return values[None, :] if values.ndim == 1 else values
+
+
+def _squeeze(values, single):
+    """Tek seri verildiyse skaler döndürür"""
+    return float(values[0]) if single else values
+
+
+def fill_equity(equity):
+    """
+    Eksik (NaN) portföy değerlerini doldurur
+
+    Aradaki boşluklar önceki değerle, baştaki boşluklar ilk geçerli değerle
+    doldurulur; atlanan barlarda sermaye değişmemiş sayılır.
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri
+
+    Returns:
+        np.ndarray: Doldurulmuş matris
+    """
+    equity = _as_matrix(equity)
+    missing = np.isnan(equity)
+    if not missing.any():
+        return equity
+
+    n = equity.shape[1]
+    last = np.where(missing, 0, np.arange(n))
+    np.maximum.accumulate(last, axis=1, out=last)
+    filled = np.take_along_axis(equity, last, axis=1)
+
+    first = np.argmax(~missing, axis=1)
+    first_value = equity[np.arange(len(equity)), first]
+    leading = np.arange(n) < first[:, None]
+    return np.where(leading, first_value[:, None], filled)
+
+
+def bar_returns(equity):
+    """
+    Bar getirileri
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri (NaN olabilir)
+
+    Returns:
+        np.ndarray: (çalıştırma x bar-1) getiriler; iki ucundan biri eksik
+            olan barlar NaN
+    """
+    equity = _as_matrix(equity)
+    return equity[:, 1:] / equity[:, :-1] - 1
+
+
+def _ratio(numerator, denominator):
+    """Sıfır paydada 0 döndüren bölme"""
+    # Hiç işlem yoksa bincount tamsayı döndürür; çıktı her zaman float
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(np.broadcast(numerator, denominator).shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def sharpe_ratio(returns, periods=TRADING_DAYS, risk_free=0.0):
+    """
+    Yıllıklandırılmış Sharpe oranı
+
+    Args:
+        returns (array-like): (çalıştırma x bar) getiriler (NaN'lar atlanır)
+        periods (float): Yıllık bar sayısı
+        risk_free (float): Yıllık risksiz getiri
+
+    Returns:
+        np.ndarray: Çalıştırma başına oran (oynaklık yoksa 0)
+    """
+    excess = _as_matrix(returns) - risk_free / periods
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(excess, axis=1)
+        std = np.nanstd(excess, axis=1, ddof=1)
+    return _ratio(mean, np.nan_to_num(std)) * np.sqrt(periods)
+
+
+def sortino_ratio(returns, periods=TRADING_DAYS, risk_free=0.0):
+    """
+    Yıllıklandırılmış Sortino oranı (sadece aşağı yönlü oynaklık)
+
+    Args:
+        returns (array-like): (çalıştırma x bar) getiriler (NaN'lar atlanır)
+        periods (float): Yıllık bar sayısı
+        risk_free (float): Yıllık risksiz getiri
+
+    Returns:
+        np.ndarray: Çalıştırma başına oran (aşağı yönlü hareket yoksa 0)
+    """
+    excess = _as_matrix(returns) - risk_free / periods
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(excess, axis=1)
+        downside = np.sqrt(np.nanmean(np.minimum(excess, 0.0) ** 2, axis=1))
+    return _ratio(mean, np.nan_to_num(downside)) * np.sqrt(periods)
+
+
+def cagr(equity, periods=TRADING_DAYS):
+    """
+    Yıllık bileşik büyüme oranı
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri (NaN olabilir)
+        periods (float): Yıllık bar sayısı
+
+    Returns:
+        np.ndarray: Çalıştırma başına oran (0.12 = %12)
+    """
+    equity = _as_matrix(equity)
+    valid = ~np.isnan(equity)
+    filled = fill_equity(equity)
+    n_periods = np.count_nonzero(valid, axis=1) - 1
+
+    growth = _ratio(filled[:, -1], filled[:, 0])
+    years = n_periods / periods
+    out = np.zeros(len(equity))
+    ok = (years > 0) & (growth > 0)
+    out[ok] = growth[ok] ** (1 / years[ok]) - 1
+    return out
+
+
+def drawdown(equity):
+    """
+    Zirveden düşüş serisi
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri (NaN olabilir)
+
+    Returns:
+        np.ndarray: Her barda son zirveye göre oran (0 veya negatif)
+    """
+    filled = fill_equity(equity)
+    peak = np.maximum.accumulate(filled, axis=1)
+    return filled / peak - 1
+
+
+def max_drawdown(equity):
+    """
+    Maksimum düşüş ve en uzun düşüş süresi
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri (NaN olabilir)
+
+    Returns:
+        tuple: (en büyük düşüş oranı (negatif), zirvenin altında geçen en
+            uzun süre (bar)) dizileri
+    """
+    dd = drawdown(equity)
+    n = dd.shape[1]
+    bars = np.arange(n)
+    last_peak = np.where(dd >= 0, bars, 0)
+    np.maximum.accumulate(last_peak, axis=1, out=last_peak)
+    duration = (bars - last_peak).max(axis=1)
+    return dd.min(axis=1), duration
+
+
+def position_from_trades(n_bars, trade_index, trade_side):
+    """
+    İşlem listesinden bar kapanışındaki pozisyonu çıkarır
+
+    Args:
+        n_bars (int): Bar sayısı
+        trade_index (array-like): İşlem barları
+        trade_side (array-like): SIDE_BUY (1) / SIDE_SELL (-1)
+
+    Returns:
+        np.ndarray: Bar kapanışında pozisyon açıksa True
+    """
+    change = np.zeros(n_bars, dtype=np.int64)
+    np.add.at(change, np.asarray(trade_index, dtype=np.int64), np.asarray(trade_side))
+    return np.cumsum(change) > 0
+
+
+def round_trips(equity, position):
+    """
+    Tamamlanan al-sat döngülerinin sayısı ve kazanma oranı
+
+    Bir döngü pozisyonun açıldığı bardan kapandığı bara kadardır (son barda
+    açık kalan pozisyon orada kapanmış sayılır). Getirisi, çıkıştaki portföy
+    değerinin girişten önceki değere oranıdır.
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri
+        position (array-like): (çalıştırma x bar) pozisyon matrisi (bool)
+
+    Returns:
+        tuple: (döngü sayısı, kazanma oranı) dizileri
+    """
+    filled = fill_equity(equity)
+    position = np.asarray(position, dtype=bool)
+    position = position[None, :] if position.ndim == 1 else position
+    runs, n = position.shape
+
+    edges = np.zeros((runs, n + 2), dtype=np.int8)
+    edges[:, 1:-1] = position
+    change = np.diff(edges, axis=1)
+    entry_run, entry_bar = np.nonzero(change == 1)
+    _, exit_bar = np.nonzero(change == -1)
+
+    before = filled[entry_run, np.maximum(entry_bar - 1, 0)]
+    after = filled[entry_run, np.minimum(exit_bar, n - 1)]
+    wins = (after > before).astype(np.float64)
+
+    count = np.bincount(entry_run, minlength=runs)
+    win_rate = _ratio(np.bincount(entry_run, weights=wins, minlength=runs), count.astype(np.float64))
+    return count, win_rate
+
+
+def exposure(position, valid=None):
+    """
+    Piyasada kalma oranı
+
+    Args:
+        position (array-like): (çalıştırma x bar) pozisyon (bool ya da ağırlık)
+        valid (array-like): Sadece bu barlar sayılır (örn. SMA olan barlar)
+
+    Returns:
+        np.ndarray: Pozisyonlu bar oranı (0-1)
+    """
+    position = _as_matrix(position)
+    if valid is None:
+        return position.mean(axis=1)
+    valid = np.broadcast_to(np.asarray(valid, dtype=bool), position.shape)
+    return _ratio((position * valid).sum(axis=1), valid.sum(axis=1).astype(np.float64))
+
+
+def turnover(equity, position, periods=TRADING_DAYS):
+    """
+    Yıllık devir hızı: işlem hacmi / ortalama portföy değeri
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri
+        position (array-like): (çalıştırma x bar) pozisyon (bool ya da ağırlık)
+        periods (float): Yıllık bar sayısı
+
+    Returns:
+        np.ndarray: Yılda portföyün kaç kez el değiştirdiği
+    """
+    filled = fill_equity(equity)
+    position = _as_matrix(position)
+    edges = np.zeros((position.shape[0], position.shape[1] + 1))
+    edges[:, 1:] = position
+    traded = (np.abs(np.diff(edges, axis=1)) * filled).sum(axis=1)
+    years = filled.shape[1] / periods
+    return _ratio(traded, filled.mean(axis=1) * years)
+
+
+def compute_metrics(equity, position=None, periods=TRADING_DAYS, risk_free=0.0):
+    """
+    Tüm metrikleri hesaplar
+
+    Args:
+        equity (array-like): Portföy değerleri; tek seri ya da (çalıştırma x
+            bar) matrisi, atlanan barlar NaN olabilir
+        position (array-like): Aynı boyutta pozisyon matrisi; verilmezse
+            kazanma oranı, döngü sayısı, piyasada kalma ve devir hızı NaN olur
+        periods (float): Yıllık bar sayısı (bkz. periods_per_year)
+        risk_free (float): Yıllık risksiz getiri
+
+    Returns:
+        dict: METRIC_COLUMNS anahtarlı sonuçlar; oranlar kesir (0.12 = %12),
+            total_return yüzde. Tek seri verildiyse değerler skalerdir.
+    """
+    single = np.ndim(equity) == 1
+    equity = _as_matrix(equity)
+    returns = bar_returns(equity)
+    filled = fill_equity(equity)
+    mdd, mdd_bars = max_drawdown(equity)
+
+    result = {
+        'total_return': (_ratio(filled[:, -1], filled[:, 0]) - 1) * 100,
+        'cagr': cagr(equity, periods),
+        'sharpe': sharpe_ratio(returns, periods, risk_free),
+        'sortino': sortino_ratio(returns, periods, risk_free),
+        'max_drawdown': mdd,
+        'max_drawdown_bars': mdd_bars,
+    }
+
+    if position is None:
+        nan = np.full(len(equity), np.nan)
+        result.update(win_rate=nan, round_trips=nan, exposure=nan, turnover=nan)
+    else:
+        count, win_rate = round_trips(equity, position)
+        result['win_rate'] = win_rate
+        result['round_trips'] = count
+        result['exposure'] = exposure(position, ~np.isnan(equity))
+        result['turnover'] = turnover(equity, position, periods)
+
+    return {name: _squeeze(result[name], single) for name in METRIC_COLUMNS}
+
+
+def metrics_frame(equity, position=None, periods=TRADING_DAYS, risk_free=0.0, index=None):
+    """
+    Metrikleri çalıştırma başına bir satırlık tabloya döker
+
+    Args:
+        equity (array-like): (çalıştırma x bar) portföy değerleri
+        position (array-like): (çalıştırma x bar) pozisyon matrisi
+        periods (float): Yıllık bar sayısı
+        risk_free (float): Yıllık risksiz getiri
+        index (array-like): Satır etiketleri
+
+    Returns:
+        pd.DataFrame: METRIC_COLUMNS sütunları
+    """
+    equity = _as_matrix(equity)
+    if position is not None:
+        position = np.asarray(position)
+        position = position[None, :] if position.ndim == 1 else position
+    return pd.DataFrame(compute_metrics(equity, position, periods, risk_free), index=index)
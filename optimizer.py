@@ -0,0 +1,232 @@
+"""
+Parametre Optimizasyonu
+SMA/RSI periyotlarını ve Stop-Loss/Take-Profit ızgarasını paralel olarak tarar
+"""
+
+import os
+import sys
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from signals import combined_signals
+from backtest_kernel import run_backtest
+from batch_backtest import batch_backtest
+from metrics import compute_metrics, position_from_trades
+from history_store import StoreRef
+from indicators import IndicatorGraph
+
+# Her işçi sürecinde bir kez doldurulan salt-okunur veri
+_SHARED = {}
+
+# Sonuç tablosuna eklenen performans metrikleri
+RANK_METRICS = ('sharpe', 'sortino', 'max_drawdown', 'win_rate', 'exposure')
+
+
+def _init_worker(close, periods=252):
+    """
+    İşçi sürecini hazırlar
+
+    Kapanış dizisi süreç başına bir kez aktarılır (StoreRef verilirse işçi
+    depoyu kendisi mmap ile açar); MACD parametrelere bağlı olmadığı için
+    burada bir kez hesaplanır. İndikatörler paylaşımlı grafla (ta ile aynı
+    tanımlar: Wilder RSI, adjust=False MACD) hesaplanır.
+    """
+    # Aynı süreçte art arda çağrılarda (max_workers=1) önceki verinin
+    # türetilmiş değerleri kalmasın
+    _SHARED.clear()
+    if isinstance(close, StoreRef):
+        close = close.load()
+    close = np.asarray(close, dtype=np.float64)
+    close.flags.writeable = False
+    _SHARED['periods'] = periods
+
+    graph = IndicatorGraph({'close': pd.Series(close)})
+    macd = graph.indicator('macd', adjust=False)
+    _SHARED['close'] = close
+    _SHARED['graph'] = graph
+    _SHARED['macd'] = macd['macd'].to_numpy()
+    _SHARED['macd_signal'] = macd['signal'].to_numpy()
+
+
+def _rsi(period):
+    """RSI değerlerini işçinin grafından döndürür (periyot başına bir kez)"""
+    return _SHARED['graph'].indicator('rsi_wilder', window=period)['value'].to_numpy()
+
+
+def _evaluate(task):
+    """
+    Bir (SMA, RSI) çifti için tüm risk ızgarasını çalıştırır
+
+    Sinyaller çift başına bir kez üretilir, her Stop-Loss/Take-Profit
+    kombinasyonu sadece backtest çekirdeğini tekrar çalıştırır.
+    """
+    sma_period, rsi_period, risk_grid, initial_capital = task
+    start = time.perf_counter()
+
+    close = _SHARED['close']
+    sma = _SHARED['graph'].indicator('sma', window=sma_period)['value'].to_numpy()
+    signal = combined_signals(close, sma, _rsi(rsi_period),
+                              _SHARED['macd'], _SHARED['macd_signal'],
+                              macd_two_way=True)
+    valid = ~np.isnan(sma)
+
+    rows = []
+    equity = np.empty((len(risk_grid), len(close)))
+    position = np.empty((len(risk_grid), len(close)), dtype=bool)
+    for i, (stop_loss, take_profit) in enumerate(risk_grid):
+        result = run_backtest(close, signal, valid=valid, initial_capital=initial_capital,
+                              stop_loss=stop_loss, take_profit=take_profit)
+        equity[i] = result['equity']
+        position[i] = position_from_trades(len(close), result['trade_index'], result['trade_side'])
+        rows.append({
+            'sma_period': sma_period,
+            'rsi_period': rsi_period,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'final_capital': result['final_capital'],
+            'total_return': result['total_return'],
+            'trades': len(result['trade_index'])
+        })
+
+    # Risk ızgarasının tüm metrikleri tek matris geçişinde
+    metrics = compute_metrics(equity, position, _SHARED['periods'])
+    for i, row in enumerate(rows):
+        for name in RANK_METRICS:
+            row[name] = metrics[name][i]
+
+    return os.getpid(), time.perf_counter() - start, rows
+
+
+def optimize(data, sma_periods=range(3, 21), rsi_periods=(14,),
+             stop_losses=(0.05,), take_profits=(0.10,),
+             initial_capital=10000, max_workers=None, sort_by='total_return', periods=252):
+    """
+    Parametre ızgarasını süreç havuzunda tarar
+
+    Args:
+        data (pd.DataFrame veya StoreRef): 'close' sütunu olan OHLCV verisi ya da
+            geçmiş veri deposundaki seriye referans (işçilere dizi kopyalanmaz)
+        sma_periods (iterable): Denenecek SMA periyotları
+        rsi_periods (iterable): Denenecek RSI periyotları
+        stop_losses (iterable): Denenecek Stop-Loss oranları
+        take_profits (iterable): Denenecek Take-Profit oranları
+        initial_capital (float): Başlangıç sermayesi
+        max_workers (int): Süreç sayısı (1 ise havuz kullanılmaz)
+        sort_by (str): Sıralama sütunu ('total_return', 'sharpe', 'sortino',
+            'max_drawdown' ...; hepsi büyükten küçüğe)
+        periods (float): Yıllık bar sayısı (metrics.periods_per_year)
+
+    Returns:
+        tuple: (sort_by'a göre sıralı sonuç tablosu, işçi başına süre tablosu)
+    """
+    if isinstance(data, StoreRef):
+        close = data
+    else:
+        close = data['close'].to_numpy(dtype=np.float64)
+    risk_grid = list(itertools.product(stop_losses, take_profits))
+    tasks = [(sma_period, rsi_period, risk_grid, initial_capital)
+             for sma_period in sma_periods for rsi_period in rsi_periods]
+
+    if max_workers == 1:
+        _init_worker(close, periods)
+        outputs = [_evaluate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(close, periods)) as executor:
+            outputs = list(executor.map(_evaluate, tasks))
+
+    rows = []
+    timing = {}
+    for pid, elapsed, task_rows in outputs:
+        rows.extend(task_rows)
+        worker = timing.setdefault(pid, {'worker': pid, 'tasks': 0, 'combos': 0, 'seconds': 0.0})
+        worker['tasks'] += 1
+        worker['combos'] += len(task_rows)
+        worker['seconds'] += elapsed
+
+    results = pd.DataFrame(rows).sort_values(sort_by, ascending=False, ignore_index=True)
+    results.index += 1
+    workers = pd.DataFrame(list(timing.values()))
+    return results, workers
+
+
+def optimize_sma(data, sma_periods=range(3, 21), rsi_period=14, initial_capital=10000,
+                 chunk_size=512, sort_by='total_return', periods=252):
+    """
+    Risk çıkışları olmadan SMA periyotlarını toplu modda tarar
+
+    Tüm pencereler tek dizi geçişinde değerlendirildiği için süre Python
+    çağrı sayısıyla değil bellek bant genişliğiyle ölçeklenir.
+
+    Args:
+        data (pd.DataFrame): 'close' sütunu olan OHLCV verisi
+        sma_periods (iterable): Denenecek SMA periyotları
+        rsi_period (int): RSI periyodu
+        initial_capital (float): Başlangıç sermayesi
+        chunk_size (int): Bir seferde işlenen pencere sayısı
+        sort_by (str): Sıralama sütunu (büyükten küçüğe)
+        periods (float): Yıllık bar sayısı
+
+    Returns:
+        pd.DataFrame: sort_by'a göre sıralı sonuç tablosu
+    """
+    close = data['close'].astype(np.float64)
+    graph = IndicatorGraph({'close': close})
+    macd = graph.indicator('macd', adjust=False)
+    rsi = graph.indicator('rsi_wilder', window=rsi_period)['value']
+
+    result = batch_backtest(close.to_numpy(), list(sma_periods), rsi.to_numpy(),
+                            macd['macd'].to_numpy(), macd['signal'].to_numpy(),
+                            initial_capital=initial_capital, chunk_size=chunk_size)
+
+    # Tüm pencerelerin metrikleri (pencere x bar) matrisinden tek geçişte
+    metrics = compute_metrics(result['equity'], result['position'], periods)
+
+    results = pd.DataFrame({
+        'sma_period': result['windows'],
+        'rsi_period': rsi_period,
+        'final_capital': result['final_capital'],
+        'total_return': result['total_return'],
+        'trades': result['trades'],
+        **{name: metrics[name] for name in RANK_METRICS}
+    }).sort_values(sort_by, ascending=False, ignore_index=True)
+    results.index += 1
+    return results
+
+
+def main():
+    """Komut satırından SMA/RSI/risk taraması yapar"""
+    symbol = sys.argv[1].upper() if len(sys.argv) > 1 else 'AAPL'
+    period = sys.argv[2] if len(sys.argv) > 2 else '1y'
+
+    print(f"📊 {symbol} için {period} veri çekiliyor...")
+    data = yf.Ticker(symbol).history(period=period)
+    if data.empty:
+        print("❌ Veri bulunamadı")
+        sys.exit(1)
+    data.reset_index(inplace=True)
+    data.columns = [col.lower() for col in data.columns]
+
+    sma_periods = range(3, 21)
+    rsi_periods = range(7, 22, 7)
+    stop_losses = (0.02, 0.03, 0.05, 0.08, 0.10)
+    take_profits = (0.05, 0.10, 0.15, 0.20, 0.30)
+    n_combos = len(sma_periods) * len(rsi_periods) * len(stop_losses) * len(take_profits)
+
+    print(f"🔍 {n_combos} parametre kombinasyonu taranıyor...")
+    start = time.perf_counter()
+    results, workers = optimize(data, sma_periods, rsi_periods, stop_losses, take_profits)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Tarama {elapsed:.2f} saniyede tamamlandı")
+    print("\n🏆 EN İYİ 10 KOMBİNASYON:")
+    print(results.head(10).to_string())
+    print("\n⏱️ İŞÇİ SÜRELERİ:")
+    print(workers.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
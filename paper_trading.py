@@ -0,0 +1,317 @@
+"""
+Kağıt İşlem (Paper Trading) Çalışma Ortamı
+asyncio olay döngüsünde bar akışını tüketir, her barda kombine SMA/RSI/MACD
+kararını verir ve bar gelişinden karara kadar geçen gecikmeyi ölçer
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import numpy as np
+import pandas as pd
+from streaming import IndicatorEngine
+from signals import combined_signal_value
+
+
+def load_bars(path, symbol=None):
+    """
+    CSV ya da Parquet dosyasından bar verisini okur
+
+    Args:
+        path (str): .csv veya .parquet dosyası
+        symbol (str): Dosyada 'symbol' sütunu yoksa kullanılacak sembol
+            (varsayılan dosya adı)
+
+    Returns:
+        pd.DataFrame: 'symbol', 'date', 'close', 'high', 'low' sütunlu veri
+    """
+    if path.endswith('.parquet'):
+        data = pd.read_parquet(path)
+    else:
+        data = pd.read_csv(path)
+
+    data.columns = [str(col).lower() for col in data.columns]
+    if 'datetime' in data.columns:
+        data.rename(columns={'datetime': 'date'}, inplace=True)
+    if 'symbol' not in data.columns:
+        data['symbol'] = symbol or os.path.splitext(os.path.basename(path))[0].upper()
+    data['date'] = pd.to_datetime(data['date'], utc=True)
+    return data
+
+
+class ReplayFeed:
+    """
+    Kaydedilmiş barları zaman sırasıyla akıtan yerel piyasa beslemesi
+
+    Birden fazla sembolün barları tarih sırasına göre birleştirilir.
+    speed gerçek zaman çarpanıdır (60 = bir dakikalık aralık bir saniyede);
+    None ise barlar beklemeden akıtılır.
+    """
+
+    def __init__(self, frames, speed=None):
+        """
+        Args:
+            frames (list veya pd.DataFrame): load_bars formatında veri(ler)
+            speed (float): Gerçek zaman çarpanı (None = en yüksek hız)
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        data = pd.concat(frames, ignore_index=True)
+        data['date'] = pd.to_datetime(data['date'], utc=True)
+        self.data = data.sort_values(['date', 'symbol'], kind='stable', ignore_index=True)
+        self.speed = speed
+
+    def __len__(self):
+        return len(self.data)
+
+    async def stream(self):
+        """
+        Barları sırayla üretir
+
+        Yields:
+            dict: symbol, date, close, high, low ve varış zamanı (arrival)
+        """
+        symbols = self.data['symbol'].to_numpy()
+        dates = self.data['date'].to_numpy()
+        close = self.data['close'].to_numpy(dtype=np.float64)
+        high = self.data['high'].to_numpy(dtype=np.float64) if 'high' in self.data else close
+        low = self.data['low'].to_numpy(dtype=np.float64) if 'low' in self.data else close
+
+        previous = None
+        for i in range(len(self.data)):
+            if self.speed and previous is not None and dates[i] != previous:
+                gap = (dates[i] - previous) / np.timedelta64(1, 's')
+                await asyncio.sleep(gap / self.speed)
+            elif i % 1000 == 0:
+                # Diğer görevlere sıra ver
+                await asyncio.sleep(0)
+            previous = dates[i]
+
+            yield {
+                'symbol': symbols[i],
+                'date': dates[i],
+                'close': close[i],
+                'high': high[i],
+                'low': low[i],
+                'arrival': time.perf_counter()
+            }
+
+
+class PaperTrader:
+    """
+    Bellekte pozisyon ve portföy değeri tutan kağıt işlemci
+
+    Her sembol ayrı bir hesapla (initial_capital) işlem görür; kurallar
+    backtest_kernel ile aynıdır: düz pozisyonda al sinyaliyle tüm nakitle
+    alım, açık pozisyonda sat sinyali ya da Stop-Loss/Take-Profit ile satış.
+    """
+
+    def __init__(self, initial_capital=10000, stop_loss=0.0, take_profit=0.0,
+                 macd_two_way=False):
+        """
+        Args:
+            initial_capital (float): Sembol başına başlangıç sermayesi
+            stop_loss (float): Zarar-kes oranı (0 ise kapalı)
+            take_profit (float): Kâr-al oranı (0 ise kapalı)
+            macd_two_way (bool): combined_signals ile aynı anlamda
+        """
+        self.initial_capital = initial_capital
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.macd_two_way = macd_two_way
+        self.accounts = {}
+        self.trades = []
+        self.latencies = []
+        self.decision_times = []
+
+    def _account(self, symbol):
+        """Sembol hesabını döndürür, yoksa açar"""
+        account = self.accounts.get(symbol)
+        if account is None:
+            account = {
+                'engine': IndicatorEngine(),
+                'capital': float(self.initial_capital),
+                'shares': 0.0,
+                'entry_price': 0.0,
+                'equity': float(self.initial_capital),
+                'bars': 0
+            }
+            self.accounts[symbol] = account
+        return account
+
+    def on_bar(self, bar):
+        """
+        Tek barı işler ve işlem kararını uygular
+
+        Returns:
+            str veya None: 'BUY', 'SELL' ya da işlem yoksa None
+        """
+        started = time.perf_counter()
+        account = self._account(bar['symbol'])
+        values = account['engine'].update(bar)
+        account['bars'] += 1
+
+        price = values['close']
+        signal = 0
+        if account['bars'] > 1:
+            signal = combined_signal_value(price, values['sma_5'], values['rsi'],
+                                           values['macd'], values['macd_signal'],
+                                           macd_two_way=self.macd_two_way)
+
+        action = None
+        reason = 'Signal'
+        shares = account['shares']
+
+        if signal == 1 and shares == 0:
+            account['shares'] = account['capital'] / price
+            account['capital'] = 0.0
+            account['entry_price'] = price
+            action = 'BUY'
+        elif signal == -1 and shares > 0:
+            action = 'SELL'
+        elif shares > 0:
+            entry_price = account['entry_price']
+            if self.stop_loss > 0 and price <= entry_price * (1 - self.stop_loss):
+                action, reason = 'SELL', 'Stop-Loss'
+            elif self.take_profit > 0 and price >= entry_price * (1 + self.take_profit):
+                action, reason = 'SELL', 'Take-Profit'
+
+        if action == 'SELL':
+            account['capital'] = shares * price
+            account['shares'] = 0.0
+
+        if action is not None:
+            self.trades.append({
+                'symbol': bar['symbol'],
+                'date': bar['date'],
+                'action': action,
+                'price': price,
+                'shares': shares if action == 'SELL' else account['shares'],
+                'reason': reason
+            })
+
+        account['equity'] = account['shares'] * price if account['shares'] > 0 else account['capital']
+        decided = time.perf_counter()
+        self.latencies.append(decided - bar['arrival'])
+        self.decision_times.append(decided - started)
+        return action
+
+    def summary(self):
+        """
+        Hesapların ve gecikmelerin özetini döndürür
+
+        Returns:
+            dict: Sembol sayısı, toplam değer, işlem sayısı, varıştan karara
+                gecikme (kuyrukta bekleme dahil) ve sadece karar süresi yüzdelikleri
+        """
+        latencies = np.array(self.latencies) * 1e6
+        decision_times = np.array(self.decision_times) * 1e6
+        total = sum(account['equity'] for account in self.accounts.values())
+        invested = self.initial_capital * len(self.accounts)
+
+        def pct(values, q):
+            return float(np.percentile(values, q)) if len(values) else float('nan')
+
+        return {
+            'symbols': len(self.accounts),
+            'bars': len(latencies),
+            'trades': len(self.trades),
+            'equity': total,
+            'total_return': (total - invested) / invested * 100 if invested else 0.0,
+            'latency_p50_us': pct(latencies, 50),
+            'latency_p95_us': pct(latencies, 95),
+            'latency_p99_us': pct(latencies, 99),
+            'latency_max_us': pct(latencies, 100),
+            'decision_p50_us': pct(decision_times, 50),
+            'decision_p99_us': pct(decision_times, 99),
+        }
+
+
+async def run_paper_trading(feed, trader, queue_size=1000):
+    """
+    Beslemeyi üretici, işlemciyi tüketici görev olarak çalıştırır
+
+    Barlar sınırlı bir asyncio kuyruğundan geçer; ölçülen gecikme kuyrukta
+    bekleme süresini de içerir.
+
+    Returns:
+        dict: trader.summary() çıktısı ve duvar süresi
+    """
+    queue = asyncio.Queue(maxsize=queue_size)
+    start = time.perf_counter()
+
+    async def produce():
+        async for bar in feed.stream():
+            await queue.put(bar)
+        await queue.put(None)
+
+    async def consume():
+        while True:
+            bar = await queue.get()
+            if bar is None:
+                break
+            trader.on_bar(bar)
+
+    await asyncio.gather(produce(), consume())
+
+    summary = trader.summary()
+    summary['wall_time_s'] = time.perf_counter() - start
+    return summary
+
+
+def simulated_frames(n_symbols, n_bars, seed=42):
+    """Yük testi için sentetik çoklu sembol verisi üretir"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2025-01-01', periods=n_bars, tz='UTC')
+    prices = 100 * np.exp(np.cumsum(rng.standard_normal((n_symbols, n_bars)) * 0.02, axis=1))
+    spread = rng.uniform(0, 0.02, (n_symbols, n_bars))
+
+    return pd.DataFrame({
+        'symbol': np.repeat([f'SIM{i:04d}' for i in range(n_symbols)], n_bars),
+        'date': np.tile(dates, n_symbols),
+        'close': prices.ravel(),
+        'high': (prices * (1 + spread)).ravel(),
+        'low': (prices * (1 - spread)).ravel()
+    })
+
+
+def main():
+    """Komut satırından kağıt işlem oturumu başlatır"""
+    parser = argparse.ArgumentParser(description="Kağıt işlem (paper trading) oturumu")
+    parser.add_argument('paths', nargs='*', help="Oynatılacak CSV/Parquet dosyaları")
+    parser.add_argument('--simulate', type=int, default=0, help="Sentetik sembol sayısı")
+    parser.add_argument('--bars', type=int, default=250, help="Sentetik sembol başına bar")
+    parser.add_argument('--speed', type=float, default=None, help="Gerçek zaman çarpanı")
+    parser.add_argument('--capital', type=float, default=10000)
+    parser.add_argument('--stop-loss', type=float, default=0.0)
+    parser.add_argument('--take-profit', type=float, default=0.0)
+    args = parser.parse_args()
+
+    frames = [load_bars(path) for path in args.paths]
+    if args.simulate:
+        frames.append(simulated_frames(args.simulate, args.bars))
+    if not frames:
+        parser.error("En az bir dosya ya da --simulate gerekli")
+
+    feed = ReplayFeed(frames, speed=args.speed)
+    trader = PaperTrader(args.capital, args.stop_loss, args.take_profit)
+
+    print(f"🔄 {len(feed)} bar oynatılıyor...")
+    summary = asyncio.run(run_paper_trading(feed, trader))
+
+    print("\n" + "="*60)
+    print("📊 KAĞIT İŞLEM SONUÇLARI")
+    print("="*60)
+    print(f"📈 Sembol: {summary['symbols']} | Bar: {summary['bars']} | İşlem: {summary['trades']}")
+    print(f"💰 Toplam değer: {summary['equity']:,.2f} TL ({summary['total_return']:.2f}%)")
+    print(f"⏱️ Gecikme (µs): p50 {summary['latency_p50_us']:.1f} | p95 {summary['latency_p95_us']:.1f} | "
+          f"p99 {summary['latency_p99_us']:.1f} | maks {summary['latency_max_us']:.1f}")
+    print(f"⏱️ Karar süresi (µs): p50 {summary['decision_p50_us']:.1f} | p99 {summary['decision_p99_us']:.1f}")
+    print(f"⏱️ Duvar süresi: {summary['wall_time_s']:.2f} s "
+          f"({summary['bars'] / summary['wall_time_s']:,.0f} bar/s)")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
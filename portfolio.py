@@ -0,0 +1,285 @@
+"""
+Çoklu Sembol Portföy Backtest'i
+N sembolü tek tarih indeksinde (bar x sembol) matrisine hizalar, stratejiyi
+tüm semboller için tek geçişte değerlendirir ve ortak nakit üzerinden portföy
+değerini (istenirse işlem maliyetleriyle) dizi işlemleriyle hesaplar
+"""
+
+import numpy as np
+import pandas as pd
+from signals import combined_signals
+from batch_backtest import positions_from_signals
+from indicators import IndicatorGraph
+from alignment import AlignedFrames, align_frames
+
+
+def align_closes(stocks_data, column='close', adjust='auto', cache_dir=None):
+    """
+    Sembol verilerini tek tarih indeksinde birleştirir
+
+    Args:
+        stocks_data (dict): Sembol -> 'date' ve fiyat sütunları olan veri
+        column (str): Alınacak fiyat sütunu
+        adjust (bool veya str): Bölünme/temettü düzeltmesi (bkz. alignment.align_frames)
+        cache_dir (str): Verilirse hizalanmış matris bu klasörde saklanır
+
+    Returns:
+        pd.DataFrame: (bar x sembol) fiyat matrisi; işlem görmeye başladıktan
+            sonraki boşluklar son fiyatla doldurulur, öncesi NaN kalır
+    """
+    if isinstance(stocks_data, AlignedFrames):
+        return stocks_data.frame(column)
+    aligned = align_frames(stocks_data, columns=(column,), adjust=adjust, cache_dir=cache_dir)
+    return aligned.frame(column)
+
+
+def closes_from_store(store, symbols=None, start=None, end=None, column='close'):
+    """
+    Geçmiş veri deposundan hizalı fiyat matrisini okur
+
+    Depodaki semboller zaten ortak takvimde olduğu için birleştirme
+    yapılmaz; align_closes ile aynı biçimde döner.
+
+    Args:
+        store (HistoryStore): Geçmiş veri deposu
+        symbols (list): Semboller (None ise hepsi)
+        start, end: Tarih aralığı [start, end)
+        column (str): Alınacak fiyat sütunu
+
+    Returns:
+        pd.DataFrame: (bar x sembol) fiyat matrisi
+    """
+    lo, hi = store.bar_range(start, end)
+    dates = store.calendar[lo:hi]
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    values = store.matrix(column, symbols, start, end)
+    closes = pd.DataFrame(np.asarray(values, dtype=np.float64).T, index=dates.normalize(),
+                          columns=list(symbols or store.symbols))
+    return closes.ffill()
+
+
+def signal_matrix(closes, sma_period=5, rsi_period=14):
+    """
+    Fiyat matrisinin tüm sütunları için kombine sinyalleri üretir
+
+    İndikatörler CurrentTradingBot.calculate_technical_indicators ile aynı
+    şekilde, ama tüm semboller için tek seferde hesaplanır.
+
+    Args:
+        closes (pd.DataFrame): (bar x sembol) kapanış matrisi
+        sma_period (int): SMA periyodu
+        rsi_period (int): RSI periyodu
+
+    Returns:
+        np.ndarray: (sembol x bar) sinyal matrisi
+    """
+    columns = IndicatorGraph({'close': closes}).evaluate({
+        'sma': ('sma', {'window': sma_period}),
+        'rsi': ('rsi', {'window': rsi_period}),
+        'macd': ('macd', {}, 'macd'),
+        'macd_signal': ('macd', {}, 'signal'),
+    })
+    sma, macd, macd_signal = columns['sma'], columns['macd'], columns['macd_signal']
+    rsi = columns['rsi'].where(closes.notna())
+
+    return combined_signals(closes.to_numpy().T, sma.to_numpy().T, rsi.to_numpy().T,
+                            macd.to_numpy().T, macd_signal.to_numpy().T)
+
+
+def strategy_env(frames, strategy, columns, extra=()):
+    """
+    Stratejinin (sembol x bar) değerlendirme ortamını hazırlar
+
+    İndikatörler (bar x sembol) DataFrame'leri üzerinde paylaşımlı grafla,
+    sadece stratejinin (ve extra'nın) kullandığı sütunlar için hesaplanır.
+
+    Args:
+        frames (dict): Sütun -> (bar x sembol) DataFrame ('close', 'high' ...)
+        strategy (Strategy): Sinyal stratejisi
+        columns (dict): İndikatör sütun tanımları (bkz. IndicatorGraph.evaluate)
+        extra (iterable): Ayrıca hesaplanacak indikatör sütunları
+
+    Returns:
+        dict: Sütun adı -> (sembol x bar) float64 matris
+    """
+    needed = ((strategy.columns | set(extra)) & set(columns)) - set(frames)
+    specs = {name: spec for name, spec in columns.items() if name in needed}
+    env = {name: frame.to_numpy(dtype=np.float64).T for name, frame in frames.items()}
+    for name, values in IndicatorGraph(frames).evaluate(specs).items():
+        env[name] = values.to_numpy(dtype=np.float64).T
+    return env
+
+
+def strategy_signals(frames, strategy, columns):
+    """
+    Stratejinin tüm semboller için sinyallerini üretir
+
+    Args:
+        frames (dict): Sütun -> (bar x sembol) DataFrame
+        strategy (Strategy): Sinyal stratejisi
+        columns (dict): İndikatör sütun tanımları
+
+    Returns:
+        np.ndarray: (sembol x bar) sinyal matrisi
+    """
+    return strategy.signals(strategy_env(frames, strategy, columns))
+
+
+def _portfolio_equity(prices, weights, initial_capital, costs=None, opens=None, volumes=None):
+    """
+    Hedef ağırlıklardan portföy değerini hesaplar
+
+    Ağırlıklar karar barının kapanışında ('close') ya da sonraki barın
+    açılışında ('next_open') dolar. Ağırlık değişimi kadar işlem yapılmış
+    sayılır: tutarın fee + slippage oranı, değişen sembol başına komisyon ve
+    hacme orantılı kayma (işlem adedi / dolum barı hacmi) sermayeden düşülür.
+
+    Returns:
+        tuple: (portföy değeri, toplam maliyet)
+    """
+    n_bars = prices.shape[1]
+    delay = costs.delay if costs is not None else 0
+    held = np.zeros_like(weights)
+    held[:, delay:] = weights[:, :n_bars - delay]
+
+    # Dolum noktası: kapanış ya da (sonraki bar) açılış
+    fill_prices = prices
+    if delay:
+        fill_prices = np.where(np.isnan(opens), prices, opens) if opens is not None else prices
+
+    def growth(start, end):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = end / start - 1
+        change[~np.isfinite(change)] = 0.0
+        return change
+
+    # Önceki ağırlıklar dolum noktasına kadar, yeniler dolumdan kapanışa kadar taşınır
+    previous = np.zeros_like(held)
+    previous[:, 1:] = held[:, :-1]
+    to_fill = np.zeros_like(prices)
+    to_fill[:, 1:] = growth(prices[:, :-1], fill_prices[:, 1:])
+    pre = 1 + np.einsum('ij,ij->j', previous, to_fill)
+    post = 1 + np.einsum('ij,ij->j', held, growth(fill_prices, prices)) if delay else 1.0
+
+    if costs is None:
+        return initial_capital * np.cumprod(pre * post), 0.0
+
+    traded = np.abs(held - previous)
+    rate = costs.fee_rate + costs.slippage
+    if costs.commission == 0 and costs.volume_impact == 0:
+        # Sadece oransal maliyetler: her bar sabit bir çarpan
+        cost_rate = traded.sum(axis=0) * rate
+        equity = initial_capital * np.cumprod(pre * (1 - cost_rate) * post)
+        start = np.concatenate(([initial_capital], equity[:-1])) * pre
+        return equity, float(np.sum(start * cost_rate))
+
+    # Komisyon ve hacim etkisi sermayeye bağlı: barlar üzerinde sırayla
+    if costs.volume_impact > 0 and volumes is None:
+        raise ValueError("Hacme orantılı slippage için hacim gerekli")
+    post = np.broadcast_to(post, (n_bars,))
+    equity = np.empty(n_bars)
+    value, total_costs = float(initial_capital), 0.0
+    for t in range(n_bars):
+        value *= pre[t]
+        amount = traded[:, t] * value
+        cost = amount.sum() * rate + costs.commission * np.count_nonzero(traded[:, t])
+        if costs.volume_impact > 0:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                slip = costs.volume_impact * (amount / fill_prices[:, t]) / volumes[:, t]
+            cost += np.sum(np.where(np.isfinite(slip) & (volumes[:, t] > 0), slip * amount, 0.0))
+        value -= cost
+        total_costs += cost
+        value *= post[t]
+        equity[t] = value
+    return equity, total_costs
+
+
+def allocation_weights(position, allocation='equal', symbols=None):
+    """
+    Pozisyon matrisinden hedef ağırlıkları hesaplar
+
+    Args:
+        position (np.ndarray): (sembol x bar) pozisyon matrisi
+        allocation (str veya dict): 'equal' her sembole sabit 1/N pay ayırır,
+            boşta kalan pay nakitte bekler; 'active' tüm sermayeyi o an açık
+            pozisyonlara eşit böler; sözlük verilirse sembol başına sabit pay
+        symbols (list): Sözlük tahsisi için sembol sırası
+
+    Returns:
+        np.ndarray: (sembol x bar) ağırlık matrisi (toplam <= 1)
+    """
+    held = position.astype(np.float64)
+    n_symbols = held.shape[0]
+
+    if isinstance(allocation, dict):
+        target = np.array([allocation.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
+        if target.sum() > 1:
+            target = target / target.sum()
+        return held * target[:, None]
+
+    if allocation == 'equal':
+        return held / max(n_symbols, 1)
+
+    if allocation == 'active':
+        n_active = held.sum(axis=0)
+        return np.divide(held, n_active, out=np.zeros_like(held), where=n_active > 0)
+
+    raise ValueError(f"Bilinmeyen tahsis kuralı: {allocation}")
+
+
+def backtest_portfolio(closes, signal=None, allocation='equal', initial_capital=10000.0,
+                       sma_period=5, rsi_period=14, costs=None, opens=None, volumes=None):
+    """
+    Ortak nakitli, her barda hedef ağırlıklara dengelenen portföy backtest'i
+
+    Bir barın kapanışındaki ağırlıklar sonraki barın getirisine uygulanır
+    ('next_open' dolumunda sonraki barın açılışından itibaren); açık
+    pozisyonlara verilmeyen pay nakitte getirisiz bekler. Son barda açık
+    pozisyonlar kapatılmaz, değerlerine göre sayılır.
+
+    Args:
+        closes (pd.DataFrame): (bar x sembol) kapanış matrisi (align_closes)
+        signal (np.ndarray): (sembol x bar) sinyaller; verilmezse signal_matrix
+            (sabit SMA/RSI/MACD; strateji için strategy_signals)
+        allocation (str veya dict): allocation_weights ile aynı
+        initial_capital (float): Başlangıç sermayesi
+        sma_period (int): Sinyal üretilecekse SMA periyodu
+        rsi_period (int): Sinyal üretilecekse RSI periyodu
+        costs (CostModel): İşlem maliyeti modeli (None ise maliyetsiz)
+        opens (pd.DataFrame): (bar x sembol) açılışlar ('next_open' dolumu için)
+        volumes (pd.DataFrame): (bar x sembol) hacimler (hacme orantılı slippage için)
+
+    Returns:
+        dict: equity ve returns serileri, weights tablosu, final_capital,
+            total_return, total_costs
+    """
+    if signal is None:
+        signal = signal_matrix(closes, sma_period, rsi_period)
+
+    symbols = list(closes.columns)
+    prices = closes.to_numpy(dtype=np.float64).T
+    position = positions_from_signals(signal) & ~np.isnan(prices)
+    weights = allocation_weights(position, allocation, symbols)
+
+    if costs is not None and costs.fill == 'next_open' and opens is None:
+        raise ValueError("'next_open' dolumu için açılış fiyatları gerekli")
+
+    def matrix(frame):
+        return None if frame is None else frame.to_numpy(dtype=np.float64).T
+
+    equity, total_costs = _portfolio_equity(prices, weights, initial_capital, costs,
+                                            matrix(opens), matrix(volumes))
+    portfolio_returns = np.zeros(prices.shape[1])
+    portfolio_returns[0] = equity[0] / initial_capital - 1 if len(equity) else 0.0
+    portfolio_returns[1:] = equity[1:] / equity[:-1] - 1
+
+    final_capital = float(equity[-1]) if len(equity) else float(initial_capital)
+    return {
+        'equity': pd.Series(equity, index=closes.index, name='equity'),
+        'returns': pd.Series(portfolio_returns, index=closes.index, name='returns'),
+        'weights': pd.DataFrame(weights.T, index=closes.index, columns=symbols),
+        'final_capital': final_capital,
+        'total_return': (final_capital - initial_capital) / initial_capital * 100,
+        'total_costs': total_costs,
+    }
@@ -0,0 +1,266 @@
+"""
+Performans İzleme (Instrumentation)
+Aşama süreleri, en yüksek RSS, bellek ayırma sayaçları ve opsiyonel cProfile.
+Kapalıyken her sarmalanmış çağrının maliyeti tek bir bayrak kontrolüdür.
+
+Ortam değişkenleriyle açılır:
+    BOT_PROFILE=1               izlemeyi aç
+    BOT_PROFILE_TRACE=yol.jsonl her aşamayı JSON satırı olarak yaz
+    BOT_PROFILE_MEMORY=1        tracemalloc ile ayırma sayaçlarını topla
+    BOT_PROFILE_CPROFILE=klasör üst düzey aşamaların cProfile çıktısını kaydet
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import threading
+import functools
+import contextlib
+import tracemalloc
+from collections import deque
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MB = 1024 * 1024
+
+# Bellekte tutulan en fazla aşama kaydı (uzun süren Streamlit oturumları için)
+MAX_RECORDS = 10_000
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek RSS değerini (MB) döndürür"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        return peak / MB if sys.platform == 'darwin' else peak / 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / MB
+    except (ImportError, AttributeError):
+        return None
+
+
+class Profiler:
+    """
+    Aşama bazlı zamanlayıcı ve iz (trace) kaydedici
+
+    Aşama yığını iş parçacığı başınadır (Streamlit oturumları ayrı
+    iş parçacıklarında çalışır); kayıtlar son max_records kayıtla sınırlıdır.
+    """
+
+    def __init__(self, enabled=False, trace_path=None, memory=False, cprofile_dir=None,
+                 max_records=MAX_RECORDS):
+        self.enabled = False
+        self.records = deque(maxlen=max_records)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._trace_file = None
+        self.configure(enabled, trace_path, memory, cprofile_dir)
+
+    @property
+    def _stack(self):
+        """Bu iş parçacığının açık aşamaları"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def configure(self, enabled=True, trace_path=None, memory=False, cprofile_dir=None):
+        """
+        İzlemeyi açar/kapatır
+
+        Args:
+            enabled (bool): İzleme açık mı
+            trace_path (str): JSON satırlarının ekleneceği dosya
+            memory (bool): tracemalloc ile ayırma sayaçlarını topla
+            cprofile_dir (str): Üst düzey aşamaların .prof dosyaları için klasör
+        """
+        self.enabled = enabled
+        if trace_path != getattr(self, 'trace_path', None):
+            self.close()
+        self.trace_path = trace_path
+        self.memory = memory and enabled
+        self.cprofile_dir = cprofile_dir if enabled else None
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.cprofile_dir:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+
+    def configure_from_env(self):
+        """BOT_PROFILE* ortam değişkenlerinden ayarları okur"""
+        enabled = os.environ.get('BOT_PROFILE', '') not in ('', '0')
+        self.configure(
+            enabled=enabled,
+            trace_path=os.environ.get('BOT_PROFILE_TRACE') or None,
+            memory=os.environ.get('BOT_PROFILE_MEMORY', '') not in ('', '0'),
+            cprofile_dir=os.environ.get('BOT_PROFILE_CPROFILE') or None
+        )
+
+    def stage(self, name, **fields):
+        """
+        Bir aşamayı ölçen bağlam yöneticisi döndürür
+
+        Args:
+            name (str): Aşama adı
+            **fields: İz kaydına eklenecek ek alanlar (örn. symbol)
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._measure(name, fields)
+
+    @contextlib.contextmanager
+    def _measure(self, name, fields):
+        stack = self._stack
+        top_level = not stack
+        parent = stack[-1] if stack else None
+        stack.append(name)
+
+        profile = None
+        if top_level and self.cprofile_dir:
+            profile = cProfile.Profile()
+
+        alloc_before = 0
+        if self.memory:
+            if top_level:
+                tracemalloc.reset_peak()
+            alloc_before = tracemalloc.get_traced_memory()[0]
+
+        start_wall = time.time()
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - start_cpu
+            stack.pop()
+
+            record = {
+                'stage': name,
+                'parent': parent,
+                'depth': len(stack),
+                'thread': threading.current_thread().name,
+                'start': start_wall,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'rss_peak_mb': peak_rss_mb(),
+            }
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['alloc_net_mb'] = (current - alloc_before) / MB
+                record['alloc_peak_mb'] = (peak - alloc_before) / MB if top_level else None
+            record.update(fields)
+
+            with self._lock:
+                if profile is not None:
+                    path = os.path.join(self.cprofile_dir, f"{self._count:04d}_{name}.prof")
+                    profile.dump_stats(path)
+                    record['cprofile'] = path
+                self._count += 1
+                self.records.append(record)
+                self._write_trace(record)
+
+    def _write_trace(self, record):
+        """Kaydı JSON satırı olarak iz dosyasına ekler (kilit altında çağrılır)"""
+        if not self.trace_path:
+            return
+        if self._trace_file is None:
+            self._trace_file = open(self.trace_path, 'a', encoding='utf-8')
+        self._trace_file.write(json.dumps(record, default=str) + '\n')
+        self._trace_file.flush()
+
+    def summary(self):
+        """
+        Aşama başına özet tabloyu döndürür
+
+        Returns:
+            pd.DataFrame: Çağrı sayısı, toplam/ortalama/en uzun süre, RSS ve
+                bellek ayırma değerleri (toplam süreye göre sıralı)
+        """
+        if not self.records:
+            return pd.DataFrame()
+
+        with self._lock:
+            records = pd.DataFrame(list(self.records))
+        aggregations = {
+            'calls': ('wall_s', 'size'),
+            'total_s': ('wall_s', 'sum'),
+            'mean_s': ('wall_s', 'mean'),
+            'max_s': ('wall_s', 'max'),
+            'cpu_s': ('cpu_s', 'sum'),
+            'rss_peak_mb': ('rss_peak_mb', 'max'),
+        }
+        if 'alloc_peak_mb' in records:
+            aggregations['alloc_net_mb'] = ('alloc_net_mb', 'sum')
+            aggregations['alloc_peak_mb'] = ('alloc_peak_mb', 'max')
+
+        return (records.groupby('stage', sort=False).agg(**aggregations)
+                .sort_values('total_s', ascending=False))
+
+    def print_summary(self):
+        """Özet tabloyu yazdırır"""
+        table = self.summary()
+        if table.empty:
+            return
+        print("\n" + "="*70)
+        print("⏱️ AŞAMA PROFİLİ")
+        print("="*70)
+        print(table.to_string(float_format=lambda x: f"{x:.4f}"))
+        print("="*70)
+
+    def reset(self):
+        """Kayıtları temizler ve iz dosyasını kapatır"""
+        with self._lock:
+            self.records.clear()
+            self._close_trace()
+
+    def close(self):
+        """İz dosyasını kapatır (sonraki kayıtta yeniden açılır)"""
+        with self._lock:
+            self._close_trace()
+
+    def _close_trace(self):
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = None
+
+
+# Uygulama genelinde paylaşılan profiler
+PROFILER = Profiler()
+PROFILER.configure_from_env()
+atexit.register(PROFILER.close)
+
+
+def traced(name=None):
+    """
+    Fonksiyonu PROFILER aşaması olarak sarmalayan dekoratör
+
+    Args:
+        name (str): Aşama adı (varsayılan fonksiyonun nitelikli adı)
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.stage(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,448 @@
+"""
+Başsız (Headless) Rapor Üretimi
+Grafikleri ekran açmadan Agg ile çizer ve sembol başına PNG/SVG/PDF/HTML
+rapor üretir. Uzun seriler görüntü için LTTB ya da min/maks seyreltmeyle
+sınırlı sayıda noktaya indirilir; birden fazla sembol süreç havuzunda çizilir.
+"""
+
+import os
+import io
+import html
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Panel başına çizilecek en fazla nokta
+DEFAULT_MAX_POINTS = 2000
+FORMATS = ('png', 'svg', 'pdf', 'html')
+
+
+def _fill(y):
+    """NaN değerleri görüntü seçimi için en yakın değerle doldurur"""
+    return pd.Series(y, dtype=np.float64).ffill().bfill().to_numpy()
+
+
+def lttb_indices(y, n_out):
+    """
+    Largest-Triangle-Three-Buckets ile korunacak nokta indekslerini seçer
+
+    Args:
+        y (array-like): Seri değerleri (x eşit aralıklı kabul edilir)
+        n_out (int): Hedef nokta sayısı
+
+    Returns:
+        np.ndarray: Artan sırada n_out indeks (ilk ve son nokta dahil)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = _fill(y)
+    if np.isnan(y).all():
+        return minmax_indices(y, n_out)
+    x = np.arange(n, dtype=np.float64)
+
+    # İlk ve son nokta hariç n_out - 2 kova
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """
+    Her kovanın en küçük ve en büyük noktasını koruyan seyreltme
+
+    Args:
+        y (array-like): Seri değerleri
+        n_out (int): Hedef nokta sayısı (yaklaşık)
+
+    Returns:
+        np.ndarray: Artan sırada benzersiz indeksler (ilk ve son nokta dahil)
+    """
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+
+    y = np.nan_to_num(_fill(y))
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, y[-1])
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+
+    offsets = np.arange(n_buckets) * size
+    indices = np.concatenate([offsets + buckets.argmin(axis=1),
+                              offsets + buckets.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def decimate_indices(y, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    Seri max_points'ten uzunsa görüntülenecek indeksleri döndürür
+
+    Args:
+        y (array-like): Seçimin dayandığı seri (örn. kapanış)
+        max_points (int): En fazla nokta (None ya da 0 ise seyreltme yok)
+        method (str): 'lttb' veya 'minmax'
+
+    Returns:
+        np.ndarray: İndeksler
+    """
+    n = len(y)
+    if not max_points or n <= max_points:
+        return np.arange(n)
+    if method == 'lttb':
+        return lttb_indices(y, max_points)
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    raise ValueError(f"Bilinmeyen seyreltme yöntemi: {method}")
+
+
+def thin_markers(frame, max_points=DEFAULT_MAX_POINTS):
+    """
+    İşaret (marker) satırlarını eşit adımla max_points ile sınırlar
+
+    Args:
+        frame (pd.DataFrame): Al/sat sinyali satırları
+        max_points (int): En fazla satır (0 ya da None ise hepsi)
+
+    Returns:
+        pd.DataFrame: Seyreltilmiş satırlar (az ise aynısı)
+    """
+    if not max_points or len(frame) <= max_points:
+        return frame
+    return frame.iloc[::-(-len(frame) // max_points)]
+
+
+def _take(values, indices):
+    return np.asarray(values)[indices]
+
+
+def draw_current_panels(axes, data, portfolio_values, initial_capital,
+                        max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    CurrentTradingBot grafiğinin üç panelini verilen eksenlere çizer
+
+    Args:
+        axes (list): Üç matplotlib ekseni
+        data (pd.DataFrame): İndikatör ve sinyal sütunları olan veri
+        portfolio_values (array-like): Portföy değerleri
+        initial_capital (float): Başlangıç sermayesi
+        max_points (int): Panel başına en fazla nokta
+        method (str): Seyreltme yöntemi
+    """
+    ax1, ax2, ax3 = axes
+    idx = decimate_indices(data['close'].to_numpy(), max_points, method)
+    dates = _take(data['date'], idx)
+
+    # 1. Hisse fiyatı ve sinyaller
+    ax1.plot(dates, _take(data['close'], idx), label='Hisse Fiyatı', linewidth=2, color='blue')
+    ax1.plot(dates, _take(data['sma_5'], idx), label='5-Günlük MA', linewidth=2, color='orange')
+    ax1.plot(dates, _take(data['sma_20'], idx), label='20-Günlük MA', linewidth=2, color='red')
+
+    # Bollinger Bands
+    ax1.fill_between(dates, _take(data['bb_upper'], idx), _take(data['bb_lower'], idx),
+                     alpha=0.2, color='gray', label='Bollinger Bands')
+
+    # Al/sat sinyalleri (sadece çok fazlaysa seyreltilir)
+    buy_signals = thin_markers(data[data['position'] == 1], max_points)
+    sell_signals = thin_markers(data[data['position'] == -1], max_points)
+
+    ax1.scatter(buy_signals['date'], buy_signals['close'],
+                color='green', marker='^', s=100, label='Al Sinyali', zorder=5)
+    ax1.scatter(sell_signals['date'], sell_signals['close'],
+                color='red', marker='v', s=100, label='Sat Sinyali', zorder=5)
+
+    ax1.set_title('2025 Güncel Hisse Senedi Fiyatı ve Sinyaller', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Fiyat (TL)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # 2. RSI
+    ax2.plot(dates, _take(data['rsi'], idx), label='RSI', color='purple', linewidth=2)
+    ax2.axhline(y=70, color='red', linestyle='--', alpha=0.7, label='Overbought (70)')
+    ax2.axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Oversold (30)')
+    ax2.set_ylabel('RSI')
+    ax2.set_ylim(0, 100)
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Portföy değeri
+    _draw_portfolio(ax3, data['date'], portfolio_values, initial_capital, max_points, method,
+                    '2025 Portföy Değeri Değişimi')
+
+
+def draw_simple_panels(axes, data, portfolio_values, initial_capital,
+                       max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    TradingBot (main1) grafiğinin iki panelini verilen eksenlere çizer
+
+    Args:
+        axes (list): İki matplotlib ekseni
+        data (pd.DataFrame): 'Date', 'Close', 'SMA_5', 'Position' sütunlu veri
+        portfolio_values (array-like): Portföy değerleri
+        initial_capital (float): Başlangıç sermayesi
+        max_points (int): Panel başına en fazla nokta
+        method (str): Seyreltme yöntemi
+    """
+    ax1, ax2 = axes
+    idx = decimate_indices(data['Close'].to_numpy(), max_points, method)
+    dates = _take(data['Date'], idx)
+
+    # Hisse fiyatı ve hareketli ortalama
+    ax1.plot(dates, _take(data['Close'], idx), label='Hisse Fiyatı', linewidth=2, color='blue')
+    ax1.plot(dates, _take(data['SMA_5'], idx), label='5-Günlük MA', linewidth=2, color='orange')
+
+    # Al/sat sinyalleri
+    buy_signals = thin_markers(data[data['Position'] == 1], max_points)
+    sell_signals = thin_markers(data[data['Position'] == -1], max_points)
+
+    ax1.scatter(buy_signals['Date'], buy_signals['Close'],
+                color='green', marker='^', s=100, label='Al Sinyali', zorder=5)
+    ax1.scatter(sell_signals['Date'], sell_signals['Close'],
+                color='red', marker='v', s=100, label='Sat Sinyali', zorder=5)
+
+    ax1.set_title('Hisse Senedi Fiyatı ve Al/Sat Sinyalleri', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Fiyat (TL)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # Portföy değeri
+    _draw_portfolio(ax2, data['Date'], portfolio_values, initial_capital, max_points, method,
+                    'Portföy Değeri Değişimi')
+
+
+def _draw_portfolio(ax, dates, portfolio_values, initial_capital, max_points, method, title):
+    """Portföy değeri panelini çizer"""
+    values = np.asarray(portfolio_values, dtype=np.float64)
+    portfolio_dates = np.asarray(dates)[:len(values)]
+    idx = decimate_indices(values, max_points, method)
+
+    ax.plot(portfolio_dates[idx], values[idx],
+            color='purple', linewidth=2, label='Portföy Değeri')
+    ax.axhline(y=initial_capital, color='red', linestyle='--',
+               label=f'Başlangıç Sermayesi ({initial_capital:,} TL)')
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel('Tarih')
+    ax.set_ylabel('Portföy Değeri (TL)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def headless_figure(n_panels, figsize):
+    """
+    pyplot'a kaydedilmeyen, Agg tuvalli figür oluşturur
+
+    Returns:
+        tuple: (Figure, eksen listesi)
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(n_panels, 1)
+    return fig, list(axes)
+
+
+def _summary_rows(results, initial_capital):
+    """HTML raporu için özet satırları"""
+    rows = [
+        ('Başlangıç Sermayesi', f"{initial_capital:,.2f} TL"),
+        ('Final Sermaye', f"{results['final_capital']:,.2f} TL"),
+        ('Toplam Getiri', f"{results['total_return']:.2f}%"),
+        ('Toplam İşlem Sayısı', f"{len(results['trades'])}"),
+    ]
+    metrics = results.get('metrics')
+    if metrics:
+        rows += [
+            ('Sharpe', f"{metrics['sharpe']:.2f}"),
+            ('Sortino', f"{metrics['sortino']:.2f}"),
+            ('CAGR', f"{metrics['cagr'] * 100:.2f}%"),
+            ('Max Drawdown', f"{metrics['max_drawdown'] * 100:.2f}% ({metrics['max_drawdown_bars']:.0f} bar)"),
+            ('Kazanma Oranı', f"{metrics['win_rate'] * 100:.1f}%"),
+            ('Piyasada Kalma', f"{metrics['exposure'] * 100:.1f}%"),
+            ('Devir Hızı', f"{metrics['turnover']:.1f}x/yıl"),
+        ]
+    return rows
+
+
+def _write_html(path, fig, title, results, initial_capital):
+    """Grafiği gömülü SVG olarak içeren tek dosyalık HTML rapor yazar"""
+    buffer = io.StringIO()
+    fig.savefig(buffer, format='svg')
+    svg = buffer.getvalue()
+    svg = svg[svg.index('<svg'):]
+
+    rows = ''.join(f"<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>"
+                   for k, v in _summary_rows(results, initial_capital))
+
+    trades = results['trades']
+    if len(trades) == 0:
+        trades_html = "<p>Hiç işlem yapılmadı.</p>"
+    elif hasattr(trades, 'to_frame'):
+        trades_html = trades.to_frame().to_html(index=False, float_format=lambda x: f"{x:.2f}")
+    else:
+        trades_html = pd.DataFrame(list(trades)).to_html(index=False, float_format=lambda x: f"{x:.2f}")
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html lang=\"tr\"><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title>"
+            "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}</style></head><body>"
+            f"<h1>{html.escape(title)}</h1><table>{rows}</table>"
+            f"<div>{svg}</div><h2>İşlem Detayları</h2>{trades_html}</body></html>\n"
+        )
+
+
+def save_figure(fig, path_base, formats=('png',), dpi=100, title=None, results=None,
+                initial_capital=None):
+    """
+    Figürü istenen formatlarda kaydeder
+
+    Args:
+        fig (Figure): Çizilmiş figür
+        path_base (str): Uzantısız dosya yolu
+        formats (tuple): 'png', 'svg', 'pdf', 'html'
+        dpi (int): Raster çıktı çözünürlüğü
+        title (str): HTML başlığı
+        results (dict): HTML özeti için backtest çıktısı
+        initial_capital (float): HTML özeti için başlangıç sermayesi
+
+    Returns:
+        dict: Format -> dosya yolu
+    """
+    directory = os.path.dirname(path_base)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    paths = {}
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Desteklenmeyen format: {fmt}")
+        path = f"{path_base}.{fmt}"
+        if fmt == 'html':
+            _write_html(path, fig, title or os.path.basename(path_base), results, initial_capital)
+        else:
+            fig.savefig(path, format=fmt, dpi=dpi)
+        paths[fmt] = path
+    return paths
+
+
+def render_report(symbol, data, results, out_dir='reports', formats=('png', 'html'),
+                  initial_capital=10000, max_points=DEFAULT_MAX_POINTS, method='lttb', dpi=100):
+    """
+    Tek sembolün raporunu ekran açmadan üretir
+
+    Args:
+        symbol (str): Sembol (dosya adı)
+        data (pd.DataFrame): İndikatör ve sinyal sütunları olan veri
+        results (dict): CurrentTradingBot.backtest çıktısı
+        out_dir (str): Çıktı klasörü
+        formats (tuple): Çıktı formatları
+        initial_capital (float): Başlangıç sermayesi
+        max_points (int): Panel başına en fazla nokta
+        method (str): Seyreltme yöntemi
+        dpi (int): Raster çıktı çözünürlüğü
+
+    Returns:
+        dict: Format -> dosya yolu
+    """
+    fig, axes = headless_figure(3, (16, 12))
+    draw_current_panels(axes, data, results['portfolio_values'], initial_capital, max_points, method)
+    fig.tight_layout()
+
+    return save_figure(fig, os.path.join(out_dir, symbol), formats, dpi,
+                       title=f"{symbol} Backtest Raporu", results=results,
+                       initial_capital=initial_capital)
+
+
+def _render_job(job):
+    symbol, data, results, kwargs = job
+    return symbol, render_report(symbol, data, results, **kwargs)
+
+
+def render_reports(jobs, out_dir='reports', formats=('png', 'html'), max_workers=None, **kwargs):
+    """
+    Birden fazla sembolün raporunu süreç havuzunda üretir
+
+    Args:
+        jobs (dict): Sembol -> (data, results)
+        out_dir (str): Çıktı klasörü
+        formats (tuple): Çıktı formatları
+        max_workers (int): Süreç sayısı (1 ise aynı süreçte çizer)
+        **kwargs: render_report'a iletilen diğer ayarlar
+
+    Returns:
+        dict: Sembol -> {format: dosya yolu}
+    """
+    kwargs = dict(kwargs, out_dir=out_dir, formats=tuple(formats))
+    tasks = [(symbol, data, results, kwargs) for symbol, (data, results) in jobs.items()]
+
+    if max_workers == 1 or len(tasks) <= 1:
+        return dict(_render_job(task) for task in tasks)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(_render_job, tasks))
+
+
+def main():
+    """Komut satırından sembol başına rapor üretir"""
+    from main2 import CurrentTradingBot
+    from data_cache import OHLCVCache
+    from verbosity import verbosity
+
+    parser = argparse.ArgumentParser(description="Başsız rapor üretimi")
+    parser.add_argument('symbols', nargs='+', help="Hisse senedi sembolleri")
+    parser.add_argument('--start', default='2025-01-01', help="Başlangıç tarihi")
+    parser.add_argument('--sample', action='store_true', help="Örnek veriyle çalış (ağ gerekmez)")
+    parser.add_argument('--out', default='reports', help="Çıktı klasörü")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['png', 'html'])
+    parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı")
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_POINTS)
+    parser.add_argument('--method', choices=['lttb', 'minmax'], default='lttb')
+    parser.add_argument('--capital', type=float, default=10000)
+    args = parser.parse_args()
+
+    jobs = {}
+    cache = None if args.sample else OHLCVCache()
+    with verbosity('batch'):
+        for i, symbol in enumerate(args.symbols):
+            bot = CurrentTradingBot(initial_capital=args.capital, cache=cache)
+            if args.sample:
+                data = bot.create_sample_data_2025(seed=42 + i)
+            else:
+                data = bot.get_current_data(symbol, start_date=args.start)
+            data = bot.generate_signals(bot.calculate_technical_indicators(data))
+            jobs[symbol] = (data, bot.backtest(data))
+
+    print(f"📊 {len(jobs)} sembol için rapor üretiliyor...")
+    paths = render_reports(jobs, args.out, args.formats, args.workers,
+                           initial_capital=args.capital, max_points=args.max_points,
+                           method=args.method)
+    for symbol, files in paths.items():
+        print(f"✅ {symbol}: {', '.join(files.values())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Sembol Tarayıcı (Screener)
+Önbellekteki evrenin son barlarını (bar x sembol) matrislerine alır,
+indikatörleri tüm semboller için tek geçişte hesaplar ve stratejinin güncel
+kombine sinyaline göre sıralı tablo döndürür. Sembol başına boru hattı
+çalıştırılmaz.
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from alignment import AlignedFrames, fill_index
+from history_store import HistoryStore, DEFAULT_STORE_DIR
+from portfolio import strategy_env
+
+# Son barların indikatör ısınması için yeterli pencere (MACD EWM dahil)
+DEFAULT_LOOKBACK = 260
+
+SIGNAL_LABELS = {1: 'AL', -1: 'SAT', 0: 'BEKLE'}
+
+# İndikatörlerin her zaman ihtiyaç duyduğu fiyat sütunları
+BASE_COLUMNS = ('close', 'high', 'low')
+
+# Stratejiler bunlara ek olarak ham bar sütunlarını da kullanabilir
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Tabloda gösterilen indikatör sütunları (hesaplanmışsa)
+DISPLAY_COLUMNS = ('sma_5', 'sma_20', 'rsi', 'macd', 'macd_signal',
+                   'bb_lower', 'bb_upper', 'stoch_k', 'stoch_d')
+
+
+def _universe(source, symbols, lookback, columns=BASE_COLUMNS):
+    """
+    Kaynaktan son barların (sembol x bar) matrislerini okur
+
+    Args:
+        columns (iterable): Okunacak sütunlar; kaynakta olmayanlar atlanır
+
+    Returns:
+        tuple: (semboller, takvim, sütun -> ileri doldurulmuş matris, son gerçek bar indeksi)
+    """
+    if not isinstance(source, (HistoryStore, AlignedFrames)):
+        raise TypeError("Kaynak HistoryStore ya da AlignedFrames olmalı")
+
+    calendar = source.calendar
+    rows = None
+    if symbols is not None:
+        rows = [source.row(s) if isinstance(source, HistoryStore) else source.symbols.index(s)
+                for s in symbols]
+    symbols = list(symbols or source.symbols)
+
+    # Sadece son pencere okunur (mmap'ten satır/bar kesiti)
+    lo = 0 if lookback is None else max(len(calendar) - int(lookback), 0)
+
+    def window(values):
+        return values[:, lo:] if rows is None else values[rows, lo:]
+
+    present = np.asarray(window(source.present))
+    last = fill_index(present)
+    take = np.maximum(last, 0)
+    listed = last >= 0
+
+    available = set(source.columns if isinstance(source, HistoryStore) else source.values)
+    matrices = {}
+    for column in columns:
+        if column not in available:
+            continue
+        values = np.asarray(window(source.matrix(column)), dtype=np.float64)
+        values = np.take_along_axis(values, take, axis=1)
+        values[~listed] = np.nan
+        matrices[column] = values
+    return symbols, calendar[lo:], matrices, last
+
+
+def screen(source, strategy, columns, symbols=None, lookback=DEFAULT_LOOKBACK):
+    """
+    Evreni güncel sinyal durumuna göre tarar
+
+    İndikatörler (bar x sembol) DataFrame'leri üzerinde paylaşımlı grafla,
+    strateji (sembol x bar) matrislerinde yayınlamayla değerlendirilir;
+    sıralama için her sembolün son barı alınır.
+
+    Args:
+        source (HistoryStore veya AlignedFrames): Hizalı evren
+        strategy (Strategy): Sinyal stratejisi
+        columns (dict): İndikatör sütun tanımları (bkz. IndicatorGraph.evaluate)
+        symbols (list): Taranacak semboller (None ise hepsi)
+        lookback (int): Kullanılacak son bar sayısı (None ise tüm geçmiş;
+            EWM tabanlı MACD uzun geçmişte birkaç ondalık farklılaşabilir)
+
+    Returns:
+        dict: Sıralı tablo, tarama tarihi, bar sayısı ve süre
+    """
+    start = time.perf_counter()
+    wanted = list(BASE_COLUMNS) + [name for name in BAR_COLUMNS
+                                   if name in strategy.columns and name not in BASE_COLUMNS]
+    symbols, calendar, matrices, last = _universe(source, symbols, lookback, wanted)
+    if len(calendar) < 2:
+        raise ValueError("Tarama için en az iki bar gerekli")
+
+    frames = {name: pd.DataFrame(values.T) for name, values in matrices.items()}
+    env = strategy_env(frames, strategy, columns, DISPLAY_COLUMNS)
+
+    signal = strategy.signals(env)[:, -1]
+    if strategy.votes:
+        with np.errstate(invalid='ignore'):
+            combined = strategy.combined(env)[:, -1]
+        # Ana indikatörleri eksik (yetersiz geçmiş) semboller sıralanmaz
+        for name in strategy.requires:
+            combined = np.where(np.isnan(env[name][:, -1]), np.nan, combined)
+    else:
+        combined = signal.astype(np.float64)
+
+    close = env['close']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = (close[:, -1] / close[:, -2] - 1) * 100
+
+    last_bar = last[:, -1]
+    dates = pd.Series(calendar[np.maximum(last_bar, 0)], index=symbols)
+    dates[last_bar < 0] = pd.NaT
+
+    table = pd.DataFrame({
+        'date': dates,
+        'close': close[:, -1],
+        'change_pct': change,
+        **{name: env[name][:, -1] for name in DISPLAY_COLUMNS if name in env},
+        'combined': combined,
+        'signal': signal,
+        'action': [SIGNAL_LABELS[int(s)] for s in signal],
+        'stale_bars': np.where(last_bar >= 0, len(calendar) - 1 - last_bar, -1),
+    }, index=pd.Index(symbols, name='symbol'))
+
+    # Güçlü al sinyalinden güçlü sat sinyaline; hesaplanamayanlar sonda
+    table = table.sort_values(['combined', 'rsi' if 'rsi' in table else 'close'],
+                              ascending=[False, True], na_position='last', kind='stable')
+    table.insert(0, 'rank', np.arange(1, len(table) + 1))
+
+    return {
+        'table': table,
+        'as_of': calendar[-1],
+        'bars': len(calendar),
+        'elapsed_s': time.perf_counter() - start,
+    }
+
+
+def main():
+    """Komut satırından önbellekteki evreni tarar"""
+    parser = argparse.ArgumentParser(description="Güncel sinyal durumuna göre sembol tarayıcı")
+    parser.add_argument('symbols', nargs='*',
+                        help="Semboller (verilirse .cache/ohlcv'den hizalanır, yoksa depo taranır)")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="Geçmiş veri deposu")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--strategy', default='sma_rsi_macd')
+    parser.add_argument('--lookback', type=int, default=DEFAULT_LOOKBACK)
+    parser.add_argument('--top', type=int, default=20, help="Gösterilecek satır (0: hepsi)")
+    parser.add_argument('--action', choices=['AL', 'SAT', 'BEKLE'], help="Sadece bu sinyaller")
+    parser.add_argument('--output', help="Tabloyu CSV olarak kaydet")
+    args = parser.parse_args()
+
+    from main2 import CurrentTradingBot
+    from data_cache import OHLCVCache
+    from strategy import STRATEGIES
+
+    if args.strategy not in STRATEGIES:
+        print(f"❌ Bilinmeyen strateji: {args.strategy} ({', '.join(STRATEGIES)})")
+        sys.exit(1)
+    cache = OHLCVCache() if args.symbols else None
+    bot = CurrentTradingBot(cache=cache, interval=args.interval,
+                            strategy=STRATEGIES[args.strategy]())
+
+    start = time.perf_counter()
+    if args.symbols:
+        symbols = [s.upper() for s in args.symbols]
+        stocks_data = {s: data for s in symbols
+                       if (data := cache.load(s, args.interval)) is not None and len(data)}
+        # Gün içi aralıklarda tarihler güne yuvarlanmaz (botun hizalaması)
+        source = bot.align_stocks(stocks_data)
+    else:
+        try:
+            source = HistoryStore(args.store)
+        except FileNotFoundError as e:
+            print(f"❌ {e} (önce: python history_store.py build ...)")
+            sys.exit(1)
+    loaded = time.perf_counter() - start
+
+    result = bot.screen(source, lookback=args.lookback)
+    table = result['table']
+    if args.action:
+        table = table[table['action'] == args.action]
+
+    print(f"🔎 {len(result['table'])} sembol, {result['bars']} bar, tarih {result['as_of']} "
+          f"({args.strategy})")
+    print(f"⏱️ Yükleme {loaded * 1000:.0f} ms, tarama {result['elapsed_s'] * 1000:.0f} ms")
+    counts = result['table']['action'].value_counts()
+    print(f"📊 AL {counts.get('AL', 0)}, SAT {counts.get('SAT', 0)}, BEKLE {counts.get('BEKLE', 0)}")
+    with pd.option_context('display.width', 200, 'display.max_columns', 30,
+                           'display.float_format', '{:.2f}'.format):
+        print(table if args.top == 0 else table.head(args.top))
+    if args.output:
+        table.to_csv(args.output)
+        print(f"💾 Tablo kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Vektörel Sinyal Motoru
+SMA/RSI/MACD oylarını NumPy dizileri üzerinde tek seferde hesaplar
+"""
+
+import numpy as np
+
+# Kombine sinyal ağırlıkları ve eşikleri
+SMA_WEIGHT = 0.5
+RSI_WEIGHT = 0.3
+MACD_WEIGHT = 0.2
+SIGNAL_THRESHOLD = 0.3
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+
+def combined_signals(close, sma, rsi, macd, macd_signal, macd_two_way=False):
+    """
+    Kombine al/sat sinyallerini dizi işlemleriyle üretir
+
+    Satır satır döngüyle birebir aynı sonucu verir: ilk bar ve SMA ya da
+    RSI değeri eksik olan barlar 0 sinyali alır.
+
+    Args:
+        close (array-like): Kapanış fiyatları
+        sma (array-like): Hareketli ortalama
+        rsi (array-like): RSI değerleri
+        macd (array-like): MACD çizgisi
+        macd_signal (array-like): MACD sinyal çizgisi
+        macd_two_way (bool): True ise MACD oyu sadece 1/-1 olur
+            (app2.py davranışı), False ise eşitlikte 0 olur (main2.py)
+
+    Girişler yayınlanabilir (broadcast) olmalıdır; örneğin (pencere x bar)
+    boyutlu bir SMA matrisi tek kapanış serisiyle birlikte verilebilir.
+
+    Returns:
+        np.ndarray: 1 (al), -1 (sat) veya 0 değerli int64 sinyal dizisi
+    """
+    close = np.asarray(close, dtype=np.float64)
+    sma = np.asarray(sma, dtype=np.float64)
+    rsi = np.asarray(rsi, dtype=np.float64)
+    macd = np.asarray(macd, dtype=np.float64)
+    macd_signal = np.asarray(macd_signal, dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        # Temel sinyal: SMA
+        sma_vote = np.where(close > sma, 1.0, -1.0)
+
+        # RSI sinyali
+        rsi_vote = np.where(rsi < RSI_OVERSOLD, 1.0,
+                            np.where(rsi > RSI_OVERBOUGHT, -1.0, 0.0))
+
+        # MACD sinyali
+        if macd_two_way:
+            macd_vote = np.where(macd > macd_signal, 1.0, -1.0)
+        else:
+            macd_vote = np.where(macd > macd_signal, 1.0,
+                                 np.where(macd < macd_signal, -1.0, 0.0))
+
+    # Kombine sinyal (döngüdeki toplama sırası korunur)
+    combined = sma_vote * SMA_WEIGHT + rsi_vote * RSI_WEIGHT + macd_vote * MACD_WEIGHT
+
+    # 2-D girişlerde (parametre x bar) son eksen bar eksenidir
+    valid = np.broadcast_to(~(np.isnan(sma) | np.isnan(rsi)), combined.shape).copy()
+    if valid.shape[-1] > 0:
+        valid[..., 0] = False
+
+    signal = np.zeros(combined.shape, dtype=np.int64)
+    signal[valid & (combined > SIGNAL_THRESHOLD)] = 1
+    signal[valid & (combined < -SIGNAL_THRESHOLD)] = -1
+    return signal
+
+
+def combined_signal_value(close, sma, rsi, macd, macd_signal, macd_two_way=False):
+    """
+    Tek bar için kombine sinyali hesaplar (canlı/kağıt işlem döngüsü için)
+
+    combined_signals ile aynı kuralları skaler değerlerle uygular; SMA ya da
+    RSI eksikse 0 döndürür.
+
+    Returns:
+        int: 1 (al), -1 (sat) veya 0
+    """
+    if sma != sma or rsi != rsi:
+        return 0
+
+    sma_vote = 1 if close > sma else -1
+    rsi_vote = 1 if rsi < RSI_OVERSOLD else (-1 if rsi > RSI_OVERBOUGHT else 0)
+    if macd > macd_signal:
+        macd_vote = 1
+    elif macd < macd_signal or macd_two_way:
+        macd_vote = -1
+    else:
+        macd_vote = 0
+
+    combined = sma_vote * SMA_WEIGHT + rsi_vote * RSI_WEIGHT + macd_vote * MACD_WEIGHT
+    if combined > SIGNAL_THRESHOLD:
+        return 1
+    if combined < -SIGNAL_THRESHOLD:
+        return -1
+    return 0
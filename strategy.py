@@ -0,0 +1,345 @@
+"""
+Tanımsal Strateji API'si
+Kurallar indikatör sütunları üzerinde dizi ifadeleri olarak tanımlanır
+(oylar, ağırlıklar, eşikler, mantıksal birleştiriciler). İfade ağacı her
+düğüm için tek bir NumPy işlemine derlenir; girdiler yayınlanabildiği için
+aynı strateji tek seride, (sembol x bar) ya da (parametre x bar)
+matrislerinde aynı maliyetle çalışır.
+
+Örnek:
+    close, sma = col('close'), col('sma_5')
+    strategy = Strategy('sma_cross',
+                        votes=[(vote(close > sma, close < sma), 1.0)],
+                        threshold=0.5, requires=('sma_5',))
+    data['signal'] = strategy.signals(data)
+"""
+
+import numpy as np
+from signals import (SMA_WEIGHT, RSI_WEIGHT, MACD_WEIGHT, SIGNAL_THRESHOLD,
+                     RSI_OVERSOLD, RSI_OVERBOUGHT)
+
+
+class Expr:
+    """Dizi ifadesi düğümü (operatörler yeni düğüm üretir)"""
+
+    def evaluate(self, env, memo):
+        raise NotImplementedError
+
+    def columns(self):
+        """İfadenin okuduğu sütun adları"""
+        return set()
+
+    def __add__(self, other):
+        return Op(np.add, self, other)
+
+    def __radd__(self, other):
+        return Op(np.add, other, self)
+
+    def __sub__(self, other):
+        return Op(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        return Op(np.subtract, other, self)
+
+    def __mul__(self, other):
+        return Op(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        return Op(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        return Op(np.divide, self, other)
+
+    def __neg__(self):
+        return Op(np.negative, self)
+
+    def __gt__(self, other):
+        return Op(np.greater, self, other)
+
+    def __ge__(self, other):
+        return Op(np.greater_equal, self, other)
+
+    def __lt__(self, other):
+        return Op(np.less, self, other)
+
+    def __le__(self, other):
+        return Op(np.less_equal, self, other)
+
+    def __and__(self, other):
+        return Op(np.logical_and, self, other)
+
+    def __or__(self, other):
+        return Op(np.logical_or, self, other)
+
+    def __invert__(self):
+        return Op(np.logical_not, self)
+
+    def isnan(self):
+        return Op(np.isnan, self)
+
+    def shift(self, periods=1):
+        """Bar ekseninde (son eksen) kaydırma; boşalan barlar NaN"""
+        return Shift(self, periods)
+
+
+class Col(Expr):
+    """Girdi sütunu"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, env, memo):
+        if self.name not in memo:
+            memo[self.name] = np.asarray(env[self.name], dtype=np.float64)
+        return memo[self.name]
+
+    def columns(self):
+        return {self.name}
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+
+class Const(Expr):
+    """Sabit ya da yayınlanabilir parametre dizisi"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, env, memo):
+        return self.value
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class Op(Expr):
+    """NumPy ufunc/fonksiyon uygulaması"""
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = [arg if isinstance(arg, Expr) else Const(arg) for arg in args]
+
+    def evaluate(self, env, memo):
+        key = id(self)
+        if key not in memo:
+            memo[key] = self.func(*(arg.evaluate(env, memo) for arg in self.args))
+        return memo[key]
+
+    def columns(self):
+        return set().union(*(arg.columns() for arg in self.args))
+
+    def __repr__(self):
+        return f"{self.func.__name__}({', '.join(map(repr, self.args))})"
+
+
+class Shift(Expr):
+    """Son eksende kaydırılmış ifade"""
+
+    def __init__(self, expr, periods):
+        self.expr = expr
+        self.periods = int(periods)
+
+    def evaluate(self, env, memo):
+        key = id(self)
+        if key not in memo:
+            values = np.asarray(self.expr.evaluate(env, memo), dtype=np.float64)
+            shifted = np.full(values.shape, np.nan)
+            p = self.periods
+            if p > 0:
+                shifted[..., p:] = values[..., :-p]
+            elif p < 0:
+                shifted[..., :p] = values[..., -p:]
+            else:
+                shifted[...] = values
+            memo[key] = shifted
+        return memo[key]
+
+    def columns(self):
+        return self.expr.columns()
+
+    def __repr__(self):
+        return f"{self.expr!r}.shift({self.periods})"
+
+
+def col(name):
+    """Sütun ifadesi"""
+    return Col(name)
+
+
+def where(condition, if_true, if_false):
+    """Koşullu seçim (np.where)"""
+    return Op(np.where, condition, if_true, if_false)
+
+
+def vote(buy, sell, neutral=0.0):
+    """
+    Al/sat oyu: buy ise 1, değilse sell ise -1, değilse neutral
+
+    Args:
+        buy (Expr): Al koşulu
+        sell (Expr): Sat koşulu (None ise her zaman -1; iki yönlü oy)
+        neutral (float): İki koşul da yoksa oy
+    """
+    if sell is None:
+        return where(buy, 1.0, -1.0)
+    return where(buy, 1.0, where(sell, -1.0, neutral))
+
+
+class Strategy:
+    """
+    Ağırlıklı oylar ya da doğrudan al/sat kurallarıyla tanımlanan strateji
+
+    Oy modunda kombine değer = sum(oy * ağırlık); eşiğin üstü 1, -eşiğin
+    altı -1 sinyalidir. Kural modunda buy/sell koşulları sinyali doğrudan
+    verir (ikisi birden doğruysa 0). Her iki modda da ilk bar ve requires
+    sütunlarından biri eksik olan barlar 0 sinyali alır.
+    """
+
+    def __init__(self, name, votes=None, threshold=SIGNAL_THRESHOLD, buy=None, sell=None,
+                 requires=()):
+        """
+        Args:
+            name (str): Strateji adı
+            votes (list): (oy ifadesi, ağırlık) çiftleri
+            threshold (float veya array-like): Sinyal eşiği (dizi verilirse
+                parametre ekseninde yayınlanır)
+            buy (Expr): Kural modunda al koşulu
+            sell (Expr): Kural modunda sat koşulu
+            requires (tuple): Eksikse sinyal üretilmeyen sütunlar; ilki
+                backtest'in başlayacağı ana indikatördür
+        """
+        if votes is None and buy is None:
+            raise ValueError("Strateji için oy ya da al kuralı gerekli")
+        self.name = name
+        self.votes = list(votes or [])
+        self.threshold = threshold
+        self.buy = buy
+        self.sell = sell
+        self.requires = tuple(requires)
+
+    @property
+    def columns(self):
+        """Stratejinin okuduğu tüm sütunlar (sadece bunlar hesaplanır)"""
+        names = set(self.requires)
+        for expr, weight in self.votes:
+            names |= expr.columns()
+            if isinstance(weight, Expr):
+                names |= weight.columns()
+        for rule in (self.buy, self.sell):
+            if rule is not None:
+                names |= rule.columns()
+        return names
+
+    def combined(self, env, memo=None):
+        """Oy modunda kombine değeri döndürür"""
+        memo = {} if memo is None else memo
+        total = None
+        with np.errstate(invalid='ignore'):
+            for expr, weight in self.votes:
+                weight = weight.evaluate(env, memo) if isinstance(weight, Expr) else weight
+                term = expr.evaluate(env, memo) * weight
+                total = term if total is None else total + term
+        return total
+
+    def signals(self, env):
+        """
+        Sinyalleri hesaplar
+
+        Args:
+            env (pd.DataFrame veya dict): Sütun adı -> dizi; diziler
+                yayınlanabilir olmalı (son eksen bar ekseni)
+
+        Returns:
+            np.ndarray: 1 (al), -1 (sat) veya 0 değerli int64 sinyaller
+        """
+        memo = {}
+        with np.errstate(invalid='ignore'):
+            if self.votes:
+                combined = self.combined(env, memo)
+                threshold = self.threshold
+                buy = combined > threshold
+                sell = combined < -np.asarray(threshold)
+            else:
+                buy = np.asarray(self.buy.evaluate(env, memo), dtype=bool)
+                sell = (np.asarray(self.sell.evaluate(env, memo), dtype=bool)
+                        if self.sell is not None else np.zeros_like(buy))
+                buy, sell = buy & ~sell, sell & ~buy
+
+        shape = np.broadcast_shapes(np.shape(buy), np.shape(sell))
+        valid = np.ones(shape, dtype=bool)
+        for name in self.requires:
+            valid &= ~np.isnan(Col(name).evaluate(env, memo))
+        if shape and shape[-1] > 0:
+            valid[..., 0] = False
+
+        signal = np.zeros(shape, dtype=np.int64)
+        signal[valid & buy] = 1
+        signal[valid & sell] = -1
+        return signal
+
+    def __repr__(self):
+        return f"Strategy({self.name!r})"
+
+
+# --- Hazır stratejiler ---
+
+def sma_rsi_macd(sma='sma_5', rsi='rsi', macd='macd', macd_signal='macd_signal',
+                 macd_two_way=False, weights=(SMA_WEIGHT, RSI_WEIGHT, MACD_WEIGHT),
+                 threshold=SIGNAL_THRESHOLD):
+    """
+    SMA/RSI/MACD ağırlıklı oy stratejisi (signals.combined_signals ile aynı)
+
+    Args:
+        sma, rsi, macd, macd_signal (str): Sütun adları
+        macd_two_way (bool): MACD oyu sadece 1/-1 (app2.py davranışı)
+        weights (tuple): SMA, RSI, MACD ağırlıkları
+        threshold (float): Sinyal eşiği
+    """
+    close = col('close')
+    sma_col, rsi_col = col(sma), col(rsi)
+    macd_col, macd_signal_col = col(macd), col(macd_signal)
+    sma_weight, rsi_weight, macd_weight = weights
+    return Strategy(
+        'sma_rsi_macd',
+        votes=[
+            (vote(close > sma_col, None), sma_weight),
+            (vote(rsi_col < RSI_OVERSOLD, rsi_col > RSI_OVERBOUGHT), rsi_weight),
+            (vote(macd_col > macd_signal_col, None if macd_two_way else macd_col < macd_signal_col),
+             macd_weight),
+        ],
+        threshold=threshold,
+        requires=(sma, rsi),
+    )
+
+
+def bollinger_stochastic(oversold=20, overbought=80, threshold=0.5):
+    """
+    Bollinger bantları + Stokastik ortalamaya dönüş stratejisi
+
+    Fiyat alt bandın altında ve %K aşırı satımda ise al, üst bandın üstünde
+    ve %K aşırı alımda ise sat yönünde oy verir; %K/%D kesişimi teyit oyudur.
+
+    Args:
+        oversold (float): Stokastik aşırı satım seviyesi
+        overbought (float): Stokastik aşırı alım seviyesi
+        threshold (float): Sinyal eşiği
+    """
+    close = col('close')
+    k, d = col('stoch_k'), col('stoch_d')
+    return Strategy(
+        'bollinger_stochastic',
+        votes=[
+            (vote(close < col('bb_lower'), close > col('bb_upper')), 0.4),
+            (vote(k < oversold, k > overbought), 0.4),
+            (vote((k > d) & (k.shift() <= d.shift()), (k < d) & (k.shift() >= d.shift())), 0.2),
+        ],
+        threshold=threshold,
+        requires=('bb_middle', 'stoch_d'),
+    )
+
+
+STRATEGIES = {
+    'sma_rsi_macd': sma_rsi_macd,
+    'bollinger_stochastic': bollinger_stochastic,
+}
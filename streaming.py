@@ -0,0 +1,320 @@
+"""
+Artımlı (Streaming) İndikatör Motoru
+Canlı/kağıt işlem döngüsü için her yeni barda O(1) güncellenen indikatörler.
+Sonuçlar CurrentTradingBot.calculate_technical_indicators ile kayan nokta
+yuvarlaması sınırında aynıdır (verify_against_batch ile doğrulanır).
+"""
+
+import math
+from collections import deque
+import numpy as np
+
+NAN = float('nan')
+
+
+def _divide(a, b):
+    """NumPy bölme kuralları (x/0 = inf, 0/0 = NaN) ile bölme yapar"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / np.float64(b))
+
+
+class RollingMean:
+    """
+    Kayan pencere ortalaması (pandas rolling().mean() ile aynı algoritma)
+
+    Kahan düzeltmeli toplam tutar; pencere tamamen aynı değerlerden
+    oluşuyorsa o değeri birebir döndürür.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.compensation = 0.0
+        self.neg_ct = 0
+        self.same_count = 0
+        self.prev_value = NAN
+
+    def update(self, value):
+        """Yeni değeri ekler, güncel ortalamayı döndürür"""
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+
+        if self.nobs < self.window or self.nobs == 0:
+            return NAN
+        result = self.sum / self.nobs
+        if self.same_count >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        y = value - self.compensation
+        t = self.sum + y
+        self.compensation = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        if value == self.prev_value:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.prev_value = value
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        y = -value - self.compensation
+        t = self.sum + y
+        self.compensation = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+
+class RollingStd:
+    """
+    Kayan pencere standart sapması (Welford, ddof=1)
+
+    Ortalama ve kare sapma toplamı değer eklenip çıkarıldıkça güncellenir.
+    """
+
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+
+    def update(self, value):
+        """Yeni değeri ekler, güncel standart sapmayı döndürür"""
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+
+        if self.nobs < self.window or self.nobs <= self.ddof:
+            return NAN
+        if self.nobs == 1:
+            return 0.0
+        variance = self.ssqdm / (self.nobs - self.ddof)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        prev_mean = self.mean - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean
+        self.compensation_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm += (value - prev_mean) * (value - self.mean)
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean
+            self.compensation_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm -= (value - prev_mean) * (value - self.mean)
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+
+
+class RollingExtreme:
+    """
+    Kayan pencere minimum/maksimumu (monoton deque, amortize O(1))
+    """
+
+    def __init__(self, window, mode='min'):
+        self.window = window
+        self.is_min = mode == 'min'
+        self.queue = deque()
+        self.count = 0
+
+    def update(self, value):
+        """Yeni değeri ekler, pencerenin min/maks değerini döndürür"""
+        i = self.count
+        self.count += 1
+
+        if self.is_min:
+            while self.queue and self.queue[-1][1] >= value:
+                self.queue.pop()
+        else:
+            while self.queue and self.queue[-1][1] <= value:
+                self.queue.pop()
+        self.queue.append((i, value))
+
+        while self.queue[0][0] <= i - self.window:
+            self.queue.popleft()
+
+        if self.count < self.window:
+            return NAN
+        return self.queue[0][1]
+
+
+class EWMA:
+    """
+    Üstel hareketli ortalama (pandas ewm(span=..., adjust=True) ile aynı)
+    """
+
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.weighted = NAN
+        self.old_wt = 1.0
+
+    def update(self, value):
+        """Yeni değeri ekler, güncel ortalamayı döndürür"""
+        if self.weighted == self.weighted:
+            if value == value:
+                self.old_wt *= self.old_wt_factor
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + value) / (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+class RSI:
+    """
+    RSI (kazanç/kayıp için kayan ortalama, main2.py ile aynı)
+    """
+
+    def __init__(self, window=14):
+        self.gain = RollingMean(window)
+        self.loss = RollingMean(window)
+        self.prev_close = NAN
+
+    def update(self, close):
+        """Yeni kapanışı ekler, güncel RSI değerini döndürür"""
+        delta = close - self.prev_close
+        self.prev_close = close
+
+        # delta.where(delta > 0, 0) ve -delta.where(delta < 0, 0)
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-(delta if delta < 0 else 0.0))
+        rs = _divide(gain, loss)
+        return 100 - _divide(100, 1 + rs)
+
+
+class MACD:
+    """
+    MACD çizgisi, sinyal çizgisi ve histogram
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EWMA(fast)
+        self.slow = EWMA(slow)
+        self.signal = EWMA(signal)
+
+    def update(self, close):
+        """Yeni kapanışı ekler, (macd, sinyal, histogram) döndürür"""
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        return macd, signal, macd - signal
+
+
+class Bollinger:
+    """
+    Bollinger bantları (orta, üst, alt)
+    """
+
+    def __init__(self, window=20, num_std=2):
+        self.mean = RollingMean(window)
+        self.std = RollingStd(window)
+        self.num_std = num_std
+
+    def update(self, close):
+        """Yeni kapanışı ekler, (orta, üst, alt) döndürür"""
+        middle = self.mean.update(close)
+        std = self.std.update(close)
+        return middle, middle + (std * self.num_std), middle - (std * self.num_std)
+
+
+class Stochastic:
+    """
+    Stokastik osilatör (%K ve %D)
+    """
+
+    def __init__(self, k_window=14, d_window=3):
+        self.low_min = RollingExtreme(k_window, 'min')
+        self.high_max = RollingExtreme(k_window, 'max')
+        self.d = RollingMean(d_window)
+
+    def update(self, high, low, close):
+        """Yeni barı ekler, (%K, %D) döndürür"""
+        low_min = self.low_min.update(low)
+        high_max = self.high_max.update(high)
+        k = 100 * _divide(close - low_min, high_max - low_min)
+        return k, self.d.update(k)
+
+
+class IndicatorEngine:
+    """
+    calculate_technical_indicators'ın artımlı karşılığı
+
+    Her update(bar) çağrısı tek barı işler ve aynı sütun adlarıyla
+    güncel indikatör değerlerini döndürür.
+    """
+
+    def __init__(self):
+        self.sma_5 = RollingMean(5)
+        self.sma_10 = RollingMean(10)
+        self.sma_20 = RollingMean(20)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bollinger = Bollinger(20, 2)
+        self.stochastic = Stochastic(14, 3)
+
+    def update(self, bar):
+        """
+        Yeni barı işler
+
+        Args:
+            bar (dict): En az 'close', 'high', 'low' alanları olan bar
+
+        Returns:
+            dict: Güncel indikatör değerleri
+        """
+        close = float(bar['close'])
+        macd, macd_signal, macd_histogram = self.macd.update(close)
+        bb_middle, bb_upper, bb_lower = self.bollinger.update(close)
+        stoch_k, stoch_d = self.stochastic.update(float(bar['high']), float(bar['low']), close)
+
+        return {
+            'close': close,
+            'sma_5': self.sma_5.update(close),
+            'sma_10': self.sma_10.update(close),
+            'sma_20': self.sma_20.update(close),
+            'rsi': self.rsi.update(close),
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_histogram': macd_histogram,
+            'bb_middle': bb_middle,
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+        }
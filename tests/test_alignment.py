@@ -0,0 +1,50 @@
+"""align_frames kurumsal işlem düzeltmesi ve önbellek testleri"""
+
+import os
+import numpy as np
+import pandas as pd
+from alignment import align_frames
+
+
+def frame(dates, **columns):
+    return pd.DataFrame({'date': pd.DatetimeIndex(dates), **columns})
+
+
+def test_dividend_after_missing_bar_uses_last_close():
+    days = pd.bdate_range('2024-01-01', periods=5)
+    full = frame(days, close=[10.0] * 5, dividends=[0, 0, 0, 0, 1.0])
+    # B'nin 4. barı yok; temettü bir önceki gerçek kapanışa (10) göre uygulanır
+    gap = frame(days[[0, 1, 2, 4]], close=[10.0] * 4, dividends=[0, 0, 0, 1.0])
+
+    aligned = align_frames({'A': full, 'B': gap}, columns=('close',), adjust=True)
+
+    expected = [9.0, 9.0, 9.0, 9.0, 10.0]
+    np.testing.assert_allclose(aligned.matrix('close')[0], expected)
+    np.testing.assert_allclose(aligned.matrix('close')[1], expected)
+
+
+def test_adj_close_path_leaves_volume_unadjusted():
+    days = pd.bdate_range('2024-01-01', periods=3)
+    data = frame(days, close=[100.0, 100.0, 50.0], volume=[1000.0, 1000.0, 2000.0],
+                 **{'adj close': [50.0, 50.0, 50.0], 'stock splits': [0, 0, 2.0]})
+
+    aligned = align_frames({'A': data}, columns=('close', 'volume'))
+
+    assert aligned.adjusted
+    np.testing.assert_allclose(aligned.matrix('close')[0], [50.0, 50.0, 50.0])
+    np.testing.assert_allclose(aligned.matrix('volume')[0], [1000.0, 1000.0, 2000.0])
+
+
+def test_cache_keeps_one_entry_per_symbol_set(tmp_path):
+    days = pd.bdate_range('2024-01-01', periods=6)
+    data = frame(days, close=np.arange(1.0, 7.0))
+
+    first = align_frames({'A': data.iloc[:5]}, cache_dir=tmp_path)
+    second = align_frames({'A': data}, cache_dir=tmp_path)
+    again = align_frames({'A': data}, cache_dir=tmp_path)
+
+    assert len(os.listdir(tmp_path)) == 1
+    # Üzerine yazma, eski kaydı okuyan görünümü bozmaz
+    np.testing.assert_allclose(first.matrix('close')[0], [1, 2, 3, 4, 5])
+    assert len(second.calendar) == 6
+    assert isinstance(again.matrix('close'), np.memmap)
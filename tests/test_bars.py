@@ -0,0 +1,33 @@
+"""window_bars pencere dönüşümü testleri"""
+
+import pytest
+from bars import window_bars, bars_per_session
+
+
+@pytest.mark.parametrize('window, interval, expected', [
+    (14, '1m', 14),
+    ('1D', '1m', 390),
+    ('5D', '1h', 35),
+    ('1D', '90m', 5),
+    ('2D', '30m', 26),
+    ('1W', '5m', 5 * 78),
+    ('30min', '5m', 6),
+    ('2h', '1m', 120),
+    ('500D', '1d', 500),
+    ('4W', '1d', 20),
+    ('2W', '1wk', 2),
+])
+def test_window_bars_counts_trading_sessions(window, interval, expected):
+    assert window_bars(window, interval) == expected
+
+
+def test_window_bars_shorter_than_one_bar():
+    with pytest.raises(ValueError):
+        window_bars('2h', '1d')
+
+
+@pytest.mark.parametrize('interval, expected', [
+    ('1m', 390), ('5m', 78), ('30m', 13), ('1h', 7), ('90m', 5), ('1d', 1),
+])
+def test_bars_per_session_counts_partial_last_bar(interval, expected):
+    assert bars_per_session(interval) == expected
@@ -0,0 +1,93 @@
+"""OHLCVCache artımlı güncelleme testleri (sahte indirici ile, ağ gerekmez)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from data_cache import OHLCVCache
+
+
+class StubDownloader:
+    """İş günleri için deterministik bar üreten ve çağrıları kaydeden indirici"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, symbol, start, end, interval='1d'):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        if self.fail:
+            raise ConnectionError("ağ yok")
+        dates = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        close = np.array([d.toordinal() % 1000 for d in dates], dtype=np.float64)
+        return pd.DataFrame({'date': dates, 'open': close, 'high': close + 1,
+                             'low': close - 1, 'close': close, 'volume': close * 10})
+
+
+@pytest.fixture
+def stub():
+    return StubDownloader()
+
+
+@pytest.fixture
+def cache(tmp_path, stub):
+    return OHLCVCache(cache_dir=str(tmp_path), downloader=stub)
+
+
+def expected(start, end):
+    """Önbellekten dönmesi beklenen veri (önbellek tarihleri ns çözünürlüğünde saklar)"""
+    data = StubDownloader()('X', start, end)
+    data['date'] = data['date'].astype('datetime64[ns]')
+    return data
+
+
+def test_incremental_top_up_fetches_only_missing_range(cache, stub):
+    cache.get('AAPL', '2024-01-01', '2024-02-01')
+    stub.calls.clear()
+
+    data = cache.get('AAPL', '2024-01-01', '2024-03-01')
+
+    assert len(stub.calls) == 1
+    fetch_start, fetch_end = stub.calls[0]
+    assert fetch_start == pd.Timestamp('2024-02-01')
+    assert fetch_end == pd.Timestamp('2024-03-01')
+    pd.testing.assert_frame_equal(data, expected('2024-01-01', '2024-03-01'))
+
+
+def test_prepend_earlier_dates(cache, stub):
+    cache.get('AAPL', '2024-02-01', '2024-03-01')
+    stub.calls.clear()
+
+    data = cache.get('AAPL', '2024-01-01', '2024-03-01')
+
+    assert stub.calls == [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-02-01'))]
+    pd.testing.assert_frame_equal(data, expected('2024-01-01', '2024-03-01'))
+
+
+def test_cache_hit_makes_no_network_call(cache, stub):
+    cache.get('AAPL', '2024-01-01', '2024-03-01')
+    stub.calls.clear()
+
+    again = cache.get('AAPL', '2024-01-01', '2024-03-01')
+    inner = cache.get('AAPL', '2024-01-15', '2024-02-15')
+
+    assert stub.calls == []
+    pd.testing.assert_frame_equal(again, expected('2024-01-01', '2024-03-01'))
+    pd.testing.assert_frame_equal(inner, expected('2024-01-15', '2024-02-15'))
+
+
+def test_failed_download_returns_cached_bars(cache, stub, caplog):
+    cache.get('AAPL', '2024-01-01', '2024-02-01')
+    stub.fail = True
+
+    with caplog.at_level('WARNING'):
+        data = cache.get('AAPL', '2023-12-01', '2024-03-01')
+
+    pd.testing.assert_frame_equal(data, expected('2024-01-01', '2024-02-01'))
+    assert 'indirilemedi' in caplog.text
+
+    # Başarısız aralık sorgulanmış sayılmaz, bir sonraki çağrıda tekrar denenir
+    stub.fail = False
+    stub.calls.clear()
+    data = cache.get('AAPL', '2024-01-01', '2024-03-01')
+    assert len(stub.calls) == 1
+    pd.testing.assert_frame_equal(data, expected('2024-01-01', '2024-03-01'))
@@ -0,0 +1,101 @@
+"""fetch_many tekrar deneme, bekleme ve toplu indirme testleri (yerel kaynakla)"""
+
+import pandas as pd
+import pytest
+import downloader
+from downloader import SimulatedSource, fetch_many, summarize_report
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Beklemeleri uyumadan kaydeder (SimulatedSource gecikmesi 0 iken sadece bekleme)"""
+    delays = []
+    monkeypatch.setattr(downloader.time, 'sleep', delays.append)
+    return delays
+
+
+class FlakySource:
+    """Her sembolde ilk `failures` isteği hata veren kaynak"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = {}
+        self.source = SimulatedSource(latency=0, jitter=0, failure_rate=0)
+
+    def __call__(self, symbol):
+        self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        if self.calls[symbol] <= self.failures:
+            raise ConnectionError(f"{symbol}: geçici hata")
+        return self.source(symbol)
+
+
+def test_success_after_retries_with_exponential_backoff(sleeps):
+    source = FlakySource(failures=2)
+
+    results, report = fetch_many(['AAPL', 'MSFT'], source, max_workers=1, retries=3, backoff=0.5)
+
+    assert list(results) == ['AAPL', 'MSFT']
+    assert report['status'].tolist() == ['ok', 'ok']
+    assert report['attempts'].tolist() == [3, 3]
+    assert source.calls == {'AAPL': 3, 'MSFT': 3}
+
+    # Sembol başına iki bekleme: 0.5 * 2**(deneme-1) + [0, 0.5) sapma
+    backoffs = [d for d in sleeps if d > 0]
+    assert len(backoffs) == 4
+    assert sum(0.5 <= d < 1.0 for d in backoffs) == 2
+    assert sum(1.0 <= d < 1.5 for d in backoffs) == 2
+    assert summarize_report(report)['retries'] == 4
+
+
+def test_permanent_failure_drops_symbol(sleeps):
+    failing = SimulatedSource(latency=0, jitter=0, failure_rate=1.0)
+    healthy = SimulatedSource(latency=0, jitter=0, failure_rate=0)
+
+    def fetch(symbol):
+        return (failing if symbol == 'BAD' else healthy)(symbol)
+
+    results, report = fetch_many(['AAPL', 'BAD', 'MSFT'], fetch, max_workers=2, retries=3,
+                                 backoff=0.1)
+
+    assert list(results) == ['AAPL', 'MSFT']
+    assert report['symbol'].tolist() == ['AAPL', 'BAD', 'MSFT']
+    bad = report.set_index('symbol').loc['BAD']
+    assert bad['status'] == 'failed'
+    assert bad['attempts'] == 3
+    assert 'bağlantı hatası' in bad['error']
+
+    summary = summarize_report(report)
+    assert (summary['ok'], summary['failed']) == (2, 1)
+
+
+def test_batch_path_fills_missing_symbols_individually(sleeps):
+    source = SimulatedSource(latency=0, jitter=0, failure_rate=0)
+    fetched = []
+
+    def fetch(symbol):
+        fetched.append(symbol)
+        return source(symbol)
+
+    def batch_fetch(symbols):
+        # Toplu istek bir sembolü döndürmüyor
+        return {symbol: source(symbol) for symbol in symbols if symbol != 'TSLA'}
+
+    results, report = fetch_many(['AAPL', 'MSFT', 'TSLA'], fetch, batch_fetch=batch_fetch)
+
+    assert list(results) == ['AAPL', 'MSFT', 'TSLA']
+    assert fetched == ['TSLA']
+    assert report.set_index('symbol')['source'].to_dict() == {
+        'AAPL': 'batch', 'MSFT': 'batch', 'TSLA': 'single'}
+    pd.testing.assert_frame_equal(results['AAPL'], source('AAPL'))
+
+
+def test_batch_failure_falls_back_to_single_requests(sleeps):
+    source = SimulatedSource(latency=0, jitter=0, failure_rate=0)
+
+    def batch_fetch(symbols):
+        raise ConnectionError("toplu istek reddedildi")
+
+    results, report = fetch_many(['AAPL', 'MSFT'], source, batch_fetch=batch_fetch)
+
+    assert list(results) == ['AAPL', 'MSFT']
+    assert set(report['source']) == {'single'}
@@ -0,0 +1,84 @@
+"""Geçmiş veri deposu yazma, okuma ve yeniden yazma testleri"""
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from history_store import HistoryStore, write_store
+
+
+def bars(dates, start=100.0):
+    dates = pd.DatetimeIndex(dates)
+    close = start + np.arange(len(dates), dtype=np.float64)
+    return pd.DataFrame({'date': dates, 'open': close - 0.5, 'high': close + 1,
+                         'low': close - 1, 'close': close,
+                         'volume': np.full(len(dates), 1000.0)})
+
+
+@pytest.fixture
+def universe():
+    days = pd.bdate_range('2024-01-01', periods=10)
+    # B'nin ortada iki barı eksik, C ilk üç barda işlem görmüyor
+    return {
+        'A': bars(days),
+        'B': bars(days.delete([4, 5]), start=200.0),
+        'C': bars(days[3:], start=300.0),
+    }
+
+
+def test_write_and_reopen(tmp_path, universe):
+    write_store(tmp_path / 'store', list(universe), universe)
+    store = HistoryStore(str(tmp_path / 'store'))
+
+    assert store.symbols == ['A', 'B', 'C']
+    assert len(store.calendar) == 10
+    np.testing.assert_array_equal(store.matrix('close')[0], universe['A']['close'])
+
+    dates, close = store.series('A')
+    assert isinstance(close, np.memmap)  # boşluksuz seri kopyasız görünüm
+    np.testing.assert_array_equal(dates, universe['A']['date'])
+
+    frame = store.frame('C')
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), universe['C'].reset_index(drop=True),
+                                  check_freq=False, check_dtype=False)
+
+
+def test_gaps_are_nan_and_masked(tmp_path, universe):
+    store = write_store(tmp_path / 'store', list(universe), universe)
+
+    row = store.row('B')
+    assert not store.present[row, 4] and not store.present[row, 5]
+    assert np.isnan(store.matrix('close')[row, 4:6]).all()
+    assert np.isnan(store.matrix('close', ['C'])[0, :3]).all()
+
+    dates, close = store.series('B')
+    np.testing.assert_array_equal(dates, universe['B']['date'])
+    np.testing.assert_array_equal(close, universe['B']['close'])
+
+    dates, _ = store.series('A', start='2024-01-03', end='2024-01-05')
+    assert list(dates.strftime('%Y-%m-%d')) == ['2024-01-03', '2024-01-04']
+
+
+def test_rebuild_while_view_is_open(tmp_path, universe):
+    path = str(tmp_path / 'store')
+    old = write_store(path, list(universe), universe)
+    old_view = old.matrix('close')
+
+    smaller = {'A': bars(pd.bdate_range('2024-02-01', periods=3), start=500.0)}
+    new = write_store(path, ['A'], smaller)
+
+    # Eski görünüm eski dosyayı okumaya devam eder, yeni açılış yeni sürümü görür
+    assert old_view.shape == (3, 10)
+    assert old_view[0, -1] == 109.0
+    assert new.symbols == ['A']
+    np.testing.assert_array_equal(HistoryStore(path).matrix('close')[0], [500.0, 501.0, 502.0])
+    assert not any(name.startswith('store.') for name in os.listdir(tmp_path))
+
+
+def test_unknown_symbol_and_column(tmp_path, universe):
+    store = write_store(tmp_path / 'store', list(universe), universe)
+
+    with pytest.raises(KeyError):
+        store.row('ZZZ')
+    with pytest.raises(KeyError):
+        store.matrix('adj close')
@@ -0,0 +1,39 @@
+"""İndikatör grafı hassasiyet ve paylaşım testleri"""
+
+import numpy as np
+import pandas as pd
+import ta
+from indicators import IndicatorGraph
+
+
+def prices(level, n_bars=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(level + np.cumsum(rng.normal(0, 0.01, n_bars)))
+
+
+def test_bollinger_keeps_precision_at_high_price_level():
+    close = prices(1e6)
+    values = IndicatorGraph({'close': close}).evaluate({
+        'upper': ('bollinger', {'window': 20, 'ddof': 0}, 'upper'),
+        'lower': ('bollinger', {'window': 20, 'ddof': 0}, 'lower'),
+    })
+
+    bands = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+    np.testing.assert_allclose(values['upper'], bands.bollinger_hband(), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(values['lower'], bands.bollinger_lband(), rtol=0, atol=1e-9)
+
+
+def test_macd_signal_periods_share_the_line():
+    close = prices(100)
+    graph = IndicatorGraph({'close': close})
+    values = graph.evaluate({
+        'macd': ('macd', {'adjust': False}, 'macd'),
+        'signal_9': ('macd', {'adjust': False}, 'signal'),
+        'signal_5': ('macd', {'adjust': False, 'signal': 5}, 'signal'),
+    })
+
+    expected = ta.trend.MACD(close)
+    np.testing.assert_allclose(values['macd'], expected.macd(), equal_nan=True)
+    np.testing.assert_allclose(values['signal_9'], expected.macd_signal(), equal_nan=True)
+    # EMA'lar ve çizgi bir kez; her sinyal periyodu kendi EWM'i ve histogramı
+    assert graph.misses == 2 + 1 + 2 * 2
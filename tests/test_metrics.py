@@ -0,0 +1,27 @@
+"""compute_metrics uç durum testleri"""
+
+import numpy as np
+from backtest_kernel import run_backtest
+from metrics import compute_metrics, position_from_trades
+
+
+def test_zero_trade_equity_curve():
+    metrics = compute_metrics(np.full(50, 10000.0), np.zeros(50))
+
+    assert metrics['round_trips'] == 0
+    assert metrics['win_rate'] == 0.0
+    assert metrics['exposure'] == 0.0
+    assert metrics['max_drawdown'] == 0.0
+
+
+def test_lone_buy_on_last_bar():
+    close = np.linspace(100.0, 110.0, 30)
+    signal = np.zeros(30)
+    signal[-1] = 1
+    result = run_backtest(close, signal, initial_capital=10000)
+    position = position_from_trades(len(close), result['trade_index'], result['trade_side'])
+
+    metrics = compute_metrics(result['equity'], position)
+
+    assert np.isfinite(metrics['win_rate'])
+    assert metrics['round_trips'] <= 1
@@ -0,0 +1,52 @@
+"""Kağıt işlem çalışma ortamının vektörel sinyallerle tutarlılık testi"""
+
+import asyncio
+import pandas as pd
+import pytest
+from backtest_kernel import run_backtest, iter_trades
+from indicators import add_indicators
+from main2 import CurrentTradingBot
+from paper_trading import PaperTrader, ReplayFeed, run_paper_trading, simulated_frames
+from signals import combined_signals
+
+
+def utc(date):
+    date = pd.Timestamp(date)
+    return date.tz_convert('UTC') if date.tz is not None else date.tz_localize('UTC')
+
+
+def vectorized_trades(frame, stop_loss, take_profit):
+    """Aynı barların toplu sinyalleri ve backtest çekirdeğinin işlemleri"""
+    data = add_indicators(frame.reset_index(drop=True), CurrentTradingBot().indicator_columns())
+    close = data['close'].to_numpy()
+    signal = combined_signals(close, data['sma_5'].to_numpy(), data['rsi'].to_numpy(),
+                              data['macd'].to_numpy(), data['macd_signal'].to_numpy())
+    result = run_backtest(close, signal, stop_loss=stop_loss, take_profit=take_profit)
+    dates = [utc(date) for date in data['date']]
+    # Kağıt işlemci son barda pozisyonu kapatmaz
+    trades = [(dates[idx], action, price, reason)
+              for idx, action, price, _, reason in iter_trades(result) if reason != 'Final']
+    return trades, result
+
+
+@pytest.mark.parametrize('stop_loss, take_profit', [(0.0, 0.0), (0.03, 0.06)])
+def test_replay_matches_vectorized_signals(stop_loss, take_profit):
+    frames = simulated_frames(n_symbols=3, n_bars=300, seed=11)
+    trader = PaperTrader(stop_loss=stop_loss, take_profit=take_profit)
+
+    summary = asyncio.run(run_paper_trading(ReplayFeed(frames), trader, queue_size=16))
+
+    assert summary['bars'] == len(frames)
+    assert summary['symbols'] == 3
+    for symbol, frame in frames.groupby('symbol'):
+        expected, result = vectorized_trades(frame, stop_loss, take_profit)
+        actual = [(utc(t['date']), t['action'], t['price'], t['reason'])
+                  for t in trader.trades if t['symbol'] == symbol]
+
+        assert len(actual) == len(expected) > 0
+        for (date, action, price, reason), (e_date, e_action, e_price, e_reason) in zip(actual, expected):
+            assert (date, action, reason) == (e_date, e_action, e_reason)
+            assert price == pytest.approx(e_price)
+
+        # Açık pozisyon son fiyattan değerlenir: çekirdeğin son değeriyle aynı
+        assert trader.accounts[symbol]['equity'] == pytest.approx(result['final_capital'])
@@ -0,0 +1,42 @@
+"""Portföy backtest'inin tek sembollü backtest ile tutarlılık testleri"""
+
+import pytest
+from main2 import CurrentTradingBot
+from costs import CostModel
+from strategy import bollinger_stochastic
+from verbosity import verbosity
+
+
+def sample(bot, seed=1):
+    data = bot.create_sample_data_2025(n_bars=500, seed=seed)
+    data['open'] = data['close'].shift().bfill()
+    return data
+
+
+def run_both(bot):
+    with verbosity('batch'):
+        data = sample(bot)
+        single = bot.backtest(bot.generate_signals(bot.calculate_technical_indicators(data.copy())))
+        portfolio = bot.backtest_portfolio({'A': data})
+    return single, portfolio
+
+
+@pytest.mark.parametrize('strategy', [None, bollinger_stochastic()], ids=['default', 'bollinger'])
+def test_single_symbol_portfolio_uses_bot_strategy(strategy):
+    single, portfolio = run_both(CurrentTradingBot(strategy=strategy))
+
+    assert portfolio['final_capital'] == pytest.approx(single['final_capital'])
+    assert portfolio['total_costs'] == 0.0
+
+
+@pytest.mark.parametrize('costs', [
+    CostModel(fee_bps=10, slippage_bps=5),
+    CostModel(commission=2, fee_bps=10),
+    CostModel(fee_bps=10, fill='next_open'),
+])
+def test_single_symbol_portfolio_applies_bot_costs(costs):
+    single, portfolio = run_both(CurrentTradingBot(costs=costs, strategy=bollinger_stochastic()))
+
+    # Tek sembollü backtest son barda pozisyonu kapatır (son satışın maliyeti)
+    assert portfolio['total_costs'] > 0
+    assert portfolio['final_capital'] == pytest.approx(single['final_capital'], rel=5e-3)
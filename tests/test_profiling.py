@@ -0,0 +1,42 @@
+"""Profiler iş parçacığı güvenliği ve kayıt sınırı testleri"""
+
+import json
+import threading
+from profiling import Profiler
+
+
+def test_stage_stack_is_per_thread(tmp_path):
+    trace = tmp_path / 'trace.jsonl'
+    profiler = Profiler(enabled=True, trace_path=str(trace), max_records=50)
+
+    def work():
+        for _ in range(20):
+            with profiler.stage('outer'):
+                with profiler.stage('inner'):
+                    pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Kayıtlar son 50 ile sınırlı, iz dosyası hepsini içerir
+    assert len(profiler.records) == 50
+    for record in profiler.records:
+        assert record['parent'] == (None if record['stage'] == 'outer' else 'outer')
+    lines = trace.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 4 * 20 * 2
+    assert all(json.loads(line)['stage'] in ('outer', 'inner') for line in lines)
+
+
+def test_reset_closes_trace_file(tmp_path):
+    profiler = Profiler(enabled=True, trace_path=str(tmp_path / 'trace.jsonl'))
+    with profiler.stage('step'):
+        pass
+    assert profiler._trace_file is not None
+
+    profiler.reset()
+
+    assert profiler._trace_file is None
+    assert len(profiler.records) == 0
@@ -0,0 +1,44 @@
+"""Tarayıcının hizalama ve sütun okuma testleri"""
+
+import numpy as np
+import pandas as pd
+from bars import session_index
+from main2 import CurrentTradingBot
+from strategy import Strategy, col
+
+
+def intraday(symbol_seed, n_bars=390 * 2):
+    rng = np.random.default_rng(symbol_seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n_bars))
+    return pd.DataFrame({
+        'date': session_index('2024-01-02', n_bars, '1m'),
+        'open': close + rng.normal(0, 0.05, n_bars),
+        'high': close + 0.2,
+        'low': close - 0.2,
+        'close': close,
+        'volume': rng.integers(1, 1000, n_bars).astype(np.float64),
+    })
+
+
+def test_intraday_bars_are_not_collapsed_to_days():
+    bot = CurrentTradingBot(interval='1m')
+    aligned = bot.align_stocks({'A': intraday(1), 'B': intraday(2)})
+
+    assert len(aligned.calendar) == 390 * 2
+    result = bot.screen(aligned, lookback=None)
+    assert result['bars'] == 390 * 2
+
+
+def test_strategy_reads_open_and_volume():
+    # Açılışın üstünde ve hacimli kapanışta al, aksi halde sat
+    strategy = Strategy('open_volume', buy=(col('close') > col('open')) & (col('volume') > 0),
+                        sell=col('close') <= col('open'))
+    bot = CurrentTradingBot(interval='1m', strategy=strategy)
+    data = {'A': intraday(1), 'B': intraday(2)}
+
+    table = bot.screen(bot.align_stocks(data))['table']
+
+    for symbol, frame in data.items():
+        last = frame.iloc[-1]
+        expected = 1 if last['close'] > last['open'] else -1
+        assert table.loc[symbol, 'signal'] == expected
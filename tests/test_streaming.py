@@ -0,0 +1,55 @@
+"""Artımlı indikatör motorunun toplu add_indicators hesabıyla eşdeğerliği"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from indicators import add_indicators
+from main2 import CurrentTradingBot
+from streaming import IndicatorEngine
+from verbosity import verbosity
+
+STREAM_COLUMNS = ['sma_5', 'sma_10', 'sma_20', 'rsi', 'macd', 'macd_signal',
+                  'macd_histogram', 'bb_middle', 'bb_upper', 'bb_lower', 'stoch_k', 'stoch_d']
+
+
+def sample_data(n_bars, seed, level=100.0):
+    with verbosity('quiet'):
+        data = CurrentTradingBot().create_sample_data_2025(n_bars=n_bars, seed=seed)
+    scale = level / data['close'].iloc[0]
+    for name in ('open', 'high', 'low', 'close'):
+        if name in data:
+            data[name] = data[name] * scale
+    return data
+
+
+def stream(data):
+    engine = IndicatorEngine()
+    return pd.DataFrame([engine.update(bar) for bar in
+                         data[['close', 'high', 'low']].to_dict('records')])
+
+
+@pytest.mark.parametrize('n_bars, seed, level', [
+    (300, 42, 100.0),
+    (1000, 7, 100.0),
+    (500, 3, 5000.0),
+])
+def test_stream_matches_batch_indicators(n_bars, seed, level):
+    data = sample_data(n_bars, seed, level)
+    batch = add_indicators(data.copy(), CurrentTradingBot().indicator_columns())
+    streamed = stream(data)
+
+    assert set(STREAM_COLUMNS) <= set(streamed.columns)
+    for column in STREAM_COLUMNS:
+        np.testing.assert_allclose(streamed[column].to_numpy(dtype=np.float64),
+                                   batch[column].to_numpy(dtype=np.float64),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+
+
+def test_stream_warmup_matches_batch_nan_pattern():
+    data = sample_data(60, 11)
+    batch = add_indicators(data.copy(), CurrentTradingBot().indicator_columns())
+    streamed = stream(data)
+
+    for column in STREAM_COLUMNS:
+        np.testing.assert_array_equal(streamed[column].isna().to_numpy(),
+                                      batch[column].isna().to_numpy(), err_msg=column)
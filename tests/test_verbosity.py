@@ -0,0 +1,24 @@
+"""Çıktı seviyesi ortam değişkeni testleri"""
+
+import logging
+import verbosity
+
+
+def test_invalid_env_value_falls_back_to_info(monkeypatch, capsys):
+    monkeypatch.setenv('BOT_VERBOSITY', 'bogus')
+
+    assert verbosity._env_level() == 'info'
+    assert 'bogus' in capsys.readouterr().out
+
+
+def test_valid_env_value(monkeypatch):
+    monkeypatch.setenv('BOT_VERBOSITY', 'batch')
+    assert verbosity._env_level() == 'batch'
+
+
+def test_verbosity_block_restores_level():
+    root = logging.getLogger(verbosity.ROOT_NAME)
+    before = root.level
+    with verbosity.verbosity('batch'):
+        assert root.level == logging.WARNING
+    assert root.level == before
@@ -0,0 +1,226 @@
+"""
+Sütunlu İşlem Defteri (Trade Ledger)
+İşlemleri işlem başına sözlük yerine önceden ayrılmış, tipli NumPy
+dizilerinde tutar; DataFrame/Arrow'a kopyasız aktarılır
+"""
+
+import numpy as np
+import pandas as pd
+from backtest_kernel import SIDE_BUY, SIDE_SELL, REASON_NAMES
+
+ACTION_LABELS = ['BUY', 'SELL']
+REASON_LABELS = [REASON_NAMES[code] for code in sorted(REASON_NAMES)]
+
+DEFAULT_FIELDS = ('date', 'action', 'price', 'shares', 'reason')
+
+
+class TradeLedger:
+    """
+    Dizi tabanlı işlem kaydı
+
+    Sütunlar: bar indeksi (int64), tarih (datetime64[ns]), yön (int8,
+    SIDE_BUY/SIDE_SELL), fiyat ve adet (float64), çıkış nedeni (int8,
+    REASON_*). Kapasite doldukça diziler iki katına büyütülür.
+    """
+
+    __slots__ = ('fields', '_size', '_index', '_date', '_side', '_price', '_shares', '_reason')
+
+    def __init__(self, capacity=64, fields=DEFAULT_FIELDS):
+        """
+        Args:
+            capacity (int): Başlangıç kapasitesi
+            fields (tuple): Kayıt/DataFrame sütun adları
+                (tarih, işlem, fiyat, adet, neden sırasıyla)
+        """
+        self.fields = tuple(fields)
+        self._size = 0
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity):
+        """Dizileri verilen kapasiteye büyütür (mevcut kayıtlar korunur)"""
+        n = getattr(self, '_size', 0)
+        old = None if n == 0 else (self._index, self._date, self._side,
+                                   self._price, self._shares, self._reason)
+
+        self._index = np.empty(capacity, dtype=np.int64)
+        self._date = np.empty(capacity, dtype='datetime64[ns]')
+        self._side = np.empty(capacity, dtype=np.int8)
+        self._price = np.empty(capacity, dtype=np.float64)
+        self._shares = np.empty(capacity, dtype=np.float64)
+        self._reason = np.empty(capacity, dtype=np.int8)
+
+        if old is not None:
+            for new, values in zip((self._index, self._date, self._side,
+                                    self._price, self._shares, self._reason), old):
+                new[:n] = values[:n]
+
+    def _reserve(self, extra):
+        """En az extra kadar boş yer açar"""
+        needed = self._size + extra
+        capacity = len(self._index)
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+
+    def append(self, index, date, side, price, shares, reason):
+        """
+        Tek işlem ekler
+
+        Args:
+            index (int): Bar indeksi
+            date: Tarih (Timestamp/datetime64)
+            side (int): SIDE_BUY veya SIDE_SELL
+            price (float): İşlem fiyatı
+            shares (float): Adet
+            reason (int): REASON_* kodu
+        """
+        self._reserve(1)
+        i = self._size
+        self._index[i] = index
+        self._date[i] = np.datetime64(pd.Timestamp(date).tz_localize(None), 'ns')
+        self._side[i] = side
+        self._price[i] = price
+        self._shares[i] = shares
+        self._reason[i] = reason
+        self._size += 1
+
+    def extend_from_result(self, result, dates):
+        """
+        run_backtest sonucundaki işlemleri tek seferde ekler
+
+        Args:
+            result (dict): run_backtest çıktısı
+            dates (array-like): Bar tarihleri (trade_index ile eşlenir)
+        """
+        trade_index = result['trade_index']
+        n = len(trade_index)
+        if n == 0:
+            return
+
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+
+        self._reserve(n)
+        start, end = self._size, self._size + n
+        self._index[start:end] = trade_index
+        self._date[start:end] = dates.to_numpy(dtype='datetime64[ns]')[trade_index]
+        self._side[start:end] = result['trade_side']
+        self._price[start:end] = result['trade_price']
+        self._shares[start:end] = result['trade_shares']
+        self._reason[start:end] = result['trade_reason']
+        self._size = end
+
+    @classmethod
+    def from_result(cls, result, dates, fields=DEFAULT_FIELDS):
+        """run_backtest sonucundan defter oluşturur"""
+        ledger = cls(capacity=len(result['trade_index']), fields=fields)
+        ledger.extend_from_result(result, dates)
+        return ledger
+
+    # Dizi görünümleri (kopya değil)
+    @property
+    def index(self):
+        return self._index[:self._size]
+
+    @property
+    def date(self):
+        return self._date[:self._size]
+
+    @property
+    def side(self):
+        return self._side[:self._size]
+
+    @property
+    def price(self):
+        return self._price[:self._size]
+
+    @property
+    def shares(self):
+        return self._shares[:self._size]
+
+    @property
+    def reason(self):
+        return self._reason[:self._size]
+
+    def count(self, side):
+        """Verilen yöndeki işlem sayısını döndürür"""
+        return int(np.count_nonzero(self.side == side))
+
+    def clear(self):
+        """Kayıtları siler (kapasite korunur)"""
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        """Tek işlemi sözlük olarak döndürür (eski liste arayüzüyle uyumlu)"""
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("İşlem indeksi aralık dışında")
+
+        date_field, action_field, price_field, shares_field, reason_field = self.fields
+        return {
+            date_field: pd.Timestamp(self._date[i]),
+            action_field: 'BUY' if self._side[i] == SIDE_BUY else 'SELL',
+            price_field: float(self._price[i]),
+            shares_field: float(self._shares[i]),
+            reason_field: REASON_NAMES[int(self._reason[i])],
+        }
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def to_frame(self, labels=True):
+        """
+        DataFrame'e aktarır
+
+        Sayısal sütunlar defter dizilerinin görünümleridir (kopyalanmaz);
+        işlem ve neden sütunları int8 kodlu kategoriktir.
+
+        Args:
+            labels (bool): False ise yön/neden ham kodlarla bırakılır
+
+        Returns:
+            pd.DataFrame: fields sırasıyla sütunlar ve 'bar' indeksi
+        """
+        date_field, action_field, price_field, shares_field, reason_field = self.fields
+        if labels:
+            action = pd.Categorical.from_codes((self.side == SIDE_SELL).view(np.int8), ACTION_LABELS)
+            reason = pd.Categorical.from_codes(self.reason, REASON_LABELS)
+        else:
+            action, reason = self.side, self.reason
+
+        return pd.DataFrame({
+            'bar': self.index,
+            date_field: self.date,
+            action_field: action,
+            price_field: self.price,
+            shares_field: self.shares,
+            reason_field: reason,
+        }, copy=False)
+
+    def to_arrow(self):
+        """
+        pyarrow tablosuna aktarır (sayısal sütunlar kopyalanmaz)
+
+        Returns:
+            pyarrow.Table: to_frame ile aynı sütunlar; yön/neden sözlük kodlu
+        """
+        import pyarrow as pa
+
+        date_field, action_field, price_field, shares_field, reason_field = self.fields
+        return pa.table({
+            'bar': pa.array(self.index),
+            date_field: pa.array(self.date),
+            action_field: pa.DictionaryArray.from_arrays(
+                pa.array((self.side == SIDE_SELL).view(np.int8)), pa.array(ACTION_LABELS)),
+            price_field: pa.array(self.price),
+            shares_field: pa.array(self.shares),
+            reason_field: pa.DictionaryArray.from_arrays(
+                pa.array(self.reason), pa.array(REASON_LABELS)),
+        })
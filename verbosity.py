@@ -0,0 +1,98 @@
+"""
+Konsol Çıktı Seviyesi (Verbosity)
+Bot mesajlarını logging üzerinden yazar; toplu (batch) çalıştırmalarda
+işlem başına satırlar hiç biçimlendirilmez
+
+Seviyeler:
+    'trades'  aşama mesajları + her AL/SAT satırı (varsayılan)
+    'info'    sadece aşama mesajları
+    'quiet'   sadece uyarı/hatalar ('batch' ile aynı)
+
+BOT_VERBOSITY ortam değişkeniyle ya da main2.py --verbosity ile ayarlanabilir;
+geçersiz ortam değeri uyarıyla 'info' seviyesine düşer.
+"""
+
+import os
+import sys
+import logging
+import contextlib
+
+# AL/SAT satırları için INFO'nun altında özel seviye
+TRADE = 15
+logging.addLevelName(TRADE, 'TRADE')
+
+LEVELS = {
+    'trades': TRADE,
+    'info': logging.INFO,
+    'quiet': logging.WARNING,
+    'batch': logging.WARNING,
+}
+
+ROOT_NAME = 'trading_bot'
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Her kayıtta güncel sys.stdout'a yazar (redirect_stdout ile uyumlu)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_root = logging.getLogger(ROOT_NAME)
+_handler = _StdoutHandler()
+_handler.setFormatter(logging.Formatter('%(message)s'))
+_root.addHandler(_handler)
+_root.propagate = False
+
+
+def get_logger(name):
+    """
+    Bot alt logger'ını döndürür
+
+    Args:
+        name (str): Modül adı (örn. 'main2')
+    """
+    return logging.getLogger(f"{ROOT_NAME}.{name}")
+
+
+def set_verbosity(level):
+    """
+    Çıktı seviyesini ayarlar
+
+    Args:
+        level (str veya int): 'trades', 'info', 'quiet', 'batch' ya da logging seviyesi
+    """
+    if isinstance(level, str):
+        if level not in LEVELS:
+            raise ValueError(f"Bilinmeyen çıktı seviyesi: {level}")
+        level = LEVELS[level]
+    _root.setLevel(level)
+
+
+@contextlib.contextmanager
+def verbosity(level):
+    """Seviyeyi blok boyunca geçici olarak değiştirir (örn. taramalarda 'batch')"""
+    previous = _root.level
+    set_verbosity(level)
+    try:
+        yield
+    finally:
+        _root.setLevel(previous)
+
+
+def _env_level():
+    """BOT_VERBOSITY değerini okur; geçersizse uyarı verip 'info' döndürür"""
+    level = os.environ.get('BOT_VERBOSITY', 'trades')
+    if level not in LEVELS:
+        _root.warning(f"⚠️ Geçersiz BOT_VERBOSITY değeri: {level!r} "
+                      f"({', '.join(LEVELS)}); 'info' kullanılıyor")
+        return 'info'
+    return level
+
+
+set_verbosity(_env_level())
@@ -0,0 +1,305 @@
+"""
+İleriye Doğru (Walk-Forward) Optimizasyon
+Geçmiş veriyi ardışık eğitim/test pencerelerine böler, her eğitim
+penceresinde parametre taraması yapar ve seçilen parametreleri hemen
+sonraki test penceresinde dener. Pencereler birbirinden bağımsızdır ve
+süreç havuzunda paralel çalışır; test sonuçları tek bir örneklem dışı
+(out-of-sample) portföy eğrisinde birleştirilir.
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from backtest_kernel import run_backtest
+from indicators import IndicatorGraph
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Strateji başına varsayılan pencere ızgarası (CurrentTradingBot.walk_forward)
+DEFAULT_WINDOW_GRIDS = {
+    'sma_rsi_macd': {'sma_5': range(3, 21)},
+    'bollinger_stochastic': {'bb': (10, 20, 30), 'stoch': (7, 14, 21)},
+}
+
+# Her işçi sürecinde init_worker ile bir kez doldurulan salt-okunur durum
+_STATE = {}
+
+
+def walk_forward_windows(n_bars, train_size, test_size, anchored=False):
+    """
+    Eğitim/test pencerelerini üretir
+
+    Test pencereleri üst üste binmez ve art arda gelir; kayan (rolling)
+    modda eğitim penceresi sabit uzunlukta ilerler, sabitlenmiş (anchored)
+    modda hep ilk bardan başlar.
+
+    Args:
+        n_bars (int): Toplam bar sayısı
+        train_size (int): Eğitim penceresi (bar)
+        test_size (int): Test penceresi (bar)
+        anchored (bool): Eğitim penceresi baştan başlasın
+
+    Returns:
+        list: (eğitim başı, eğitim sonu, test başı, test sonu) bar indeksleri
+            (sonlar hariç)
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("Pencere uzunlukları pozitif olmalı")
+
+    windows = []
+    test_start = train_size
+    while test_start < n_bars:
+        test_end = min(test_start + test_size, n_bars)
+        train_start = 0 if anchored else test_start - train_size
+        windows.append((train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def init_worker(data, strategy, costs=None):
+    """
+    İşçi sürecini hazırlar
+
+    Veri, strateji ve maliyet modeli süreç başına bir kez aktarılır; önceki
+    çağrının sinyal ve indikatör önbellekleri temizlenir.
+
+    Args:
+        data (dict): Sütun adı -> dizi (OHLCV)
+        strategy (Strategy): Sinyal stratejisi
+        costs (CostModel): İşlem maliyeti modeli
+    """
+    _STATE.clear()
+    columns = {}
+    for name, values in data.items():
+        values = np.asarray(values, dtype=np.float64)
+        values.flags.writeable = False
+        columns[name] = values
+    _STATE['data'] = columns
+    _STATE['graph'] = IndicatorGraph(pd.DataFrame(columns, copy=False))
+    _STATE['strategy'] = strategy
+    _STATE['costs'] = costs
+    _STATE['signals'] = {}
+
+
+def _signals(param_id, columns):
+    """
+    Parametre setinin tüm geçmiş için sinyallerini işçi içinde bir kez üretir
+
+    Ara sonuçlar (kayan ortalamalar, EWM) parametre setleri arasında
+    indikatör grafında paylaşılır.
+    """
+    cache = _STATE['signals']
+    if param_id not in cache:
+        strategy = _STATE['strategy']
+        env = dict(_STATE['data'])
+        for name, values in _STATE['graph'].evaluate(columns).items():
+            env[name] = values.to_numpy(dtype=np.float64)
+        signal = strategy.signals(env)
+        # Stratejinin ana indikatörü oluşunca başlanır (bot.backtest ile aynı)
+        if strategy.requires:
+            valid = ~np.isnan(env[strategy.requires[0]])
+        else:
+            valid = np.ones(len(signal), dtype=bool)
+        cache[param_id] = (signal, valid)
+    return cache[param_id]
+
+
+def _backtest(bounds, signal, valid, initial_capital, stop_loss, take_profit):
+    """Pencere diliminde backtest (botun maliyet modeliyle)"""
+    lo, hi = bounds
+    data = _STATE['data']
+    return run_backtest(data['close'][lo:hi], signal[lo:hi], valid=valid[lo:hi],
+                        initial_capital=initial_capital, stop_loss=stop_loss,
+                        take_profit=take_profit, costs=_STATE['costs'],
+                        open_prices=data['open'][lo:hi] if 'open' in data else None,
+                        volume=data['volume'][lo:hi] if 'volume' in data else None)
+
+
+def _run_window(task):
+    """
+    Tek pencereyi çalıştırır: eğitimde tarama, testte seçilen parametre
+
+    İndikatörler sadece geçmiş barlara baktığı için tüm seri üzerinde bir
+    kez hesaplanıp pencerelere dilimlenir; ileriye bakış (look-ahead) olmaz.
+    """
+    window_id, bounds, grid, initial_capital = task
+    train_start, train_end, test_start, test_end = bounds
+    start = time.perf_counter()
+
+    best = None
+    for param_id, params, columns, stop_loss, take_profit in grid:
+        signal, valid = _signals(param_id, columns)
+        result = _backtest((train_start, train_end), signal, valid, initial_capital,
+                           stop_loss, take_profit)
+        if best is None or result['total_return'] > best[0]:
+            best = (result['total_return'], param_id, params, columns, stop_loss, take_profit)
+
+    train_return, param_id, params, columns, stop_loss, take_profit = best
+    signal, valid = _signals(param_id, columns)
+    test = _backtest((test_start, test_end), signal, valid, initial_capital,
+                     stop_loss, take_profit)
+
+    # Atlanan barlarda (ana indikatör yok) sermaye nakitte bekler
+    equity = pd.Series(test['equity']).ffill().fillna(initial_capital).to_numpy()
+
+    row = {
+        'window': window_id,
+        'train_bars': train_end - train_start,
+        'test_bars': test_end - test_start,
+        **params,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+        'train_return': train_return,
+        'test_return': test['total_return'],
+        'test_trades': len(test['trade_index']),
+        'test_costs': test['total_costs'],
+        'combos': len(grid),
+        'seconds': time.perf_counter() - start,
+        'worker': os.getpid(),
+    }
+    return row, equity
+
+
+def walk_forward(data, strategy, param_sets, train_size=252, test_size=63, anchored=False,
+                 stop_losses=(0.0,), take_profits=(0.0,), initial_capital=10000,
+                 costs=None, max_workers=None):
+    """
+    Walk-forward optimizasyonu yapar
+
+    Args:
+        data (pd.DataFrame): 'date' ve OHLCV sütunları olan veri
+        strategy (Strategy): Sinyal stratejisi (botun stratejisi)
+        param_sets (list): (parametreler, indikatör sütun tanımları) çiftleri;
+            parametreler sonuç tablosuna sütun olarak yazılır
+            (bkz. CurrentTradingBot.walk_forward)
+        train_size (int): Eğitim penceresi (bar)
+        test_size (int): Test penceresi (bar)
+        anchored (bool): Eğitim penceresi hep ilk bardan başlasın
+        stop_losses (iterable): Denenecek Stop-Loss oranları (0: kapalı)
+        take_profits (iterable): Denenecek Take-Profit oranları (0: kapalı)
+        initial_capital (float): Başlangıç sermayesi
+        costs (CostModel): İşlem maliyeti modeli (None ise maliyetsiz)
+        max_workers (int): Süreç sayısı (1 ise havuz kullanılmaz)
+
+    Returns:
+        dict: windows (pencere başına seçilen parametreler, eğitim/test
+            getirisi ve süre), equity (birleştirilmiş örneklem dışı portföy
+            değeri), final_capital, total_return
+    """
+    columns = {name: data[name].to_numpy(dtype=np.float64)
+               for name in OHLCV_COLUMNS if name in data}
+    dates = pd.DatetimeIndex(data['date'])
+    n_bars = len(columns['close'])
+    windows = walk_forward_windows(n_bars, train_size, test_size, anchored)
+    if not windows:
+        raise ValueError(f"{n_bars} bar, {train_size} barlık eğitim penceresi için yetersiz")
+
+    grid = [(param_id, params, specs, stop_loss, take_profit)
+            for param_id, (params, specs) in enumerate(param_sets)
+            for stop_loss, take_profit in itertools.product(stop_losses, take_profits)]
+    tasks = [(i + 1, bounds, grid, initial_capital) for i, bounds in enumerate(windows)]
+
+    initargs = (columns, strategy, costs)
+    if max_workers == 1:
+        init_worker(*initargs)
+        outputs = [_run_window(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=initargs) as executor:
+            outputs = list(executor.map(_run_window, tasks))
+
+    # Test eğrilerini uç uca ekle: her pencere bir öncekinin bittiği değerden devam eder
+    rows = []
+    curves = []
+    capital = float(initial_capital)
+    for (row, equity), (train_start, _, test_start, test_end) in zip(outputs, windows):
+        curve = capital * equity / initial_capital
+        capital = float(curve[-1])
+        curves.append(curve)
+
+        row['train_start'] = dates[train_start]
+        row['test_start'] = dates[test_start]
+        row['test_end'] = dates[test_end - 1]
+        rows.append(row)
+
+    first_test = windows[0][2]
+    equity = pd.Series(np.concatenate(curves), index=dates[first_test:], name='equity')
+
+    param_names = list(param_sets[0][0]) if param_sets else []
+    table = ['window', 'train_start', 'test_start', 'test_end', 'train_bars', 'test_bars',
+             *param_names, 'stop_loss', 'take_profit', 'train_return', 'test_return',
+             'test_trades', 'test_costs', 'combos', 'seconds', 'worker']
+    return {
+        'windows': pd.DataFrame(rows)[table],
+        'equity': equity,
+        'final_capital': capital,
+        'total_return': (capital - initial_capital) / initial_capital * 100,
+    }
+
+
+def main():
+    """Komut satırından walk-forward optimizasyonu çalıştırır"""
+    from main2 import CurrentTradingBot
+    from data_cache import OHLCVCache
+    from strategy import STRATEGIES
+    from verbosity import verbosity
+
+    parser = argparse.ArgumentParser(description="Walk-forward optimizasyonu")
+    parser.add_argument('symbol', nargs='?', default='AAPL')
+    parser.add_argument('--start', default='2015-01-01', help="Geçmişin başlangıcı")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--train', default='252', help="Eğitim penceresi (bar ya da süre)")
+    parser.add_argument('--test', default='63', help="Test penceresi (bar ya da süre)")
+    parser.add_argument('--anchored', action='store_true', help="Sabitlenmiş eğitim penceresi")
+    parser.add_argument('--sample', action='store_true', help="Örnek veriyle çalış (ağ gerekmez)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--strategy', default='sma_rsi_macd', choices=sorted(STRATEGIES))
+    args = parser.parse_args()
+
+    def size(value):
+        return int(value) if value.isdigit() else value
+
+    bot = CurrentTradingBot(cache=None if args.sample else OHLCVCache(), interval=args.interval,
+                            strategy=STRATEGIES[args.strategy]())
+    with verbosity('batch'):
+        if args.sample:
+            data = bot.create_sample_data_2025(n_bars=2520)
+        else:
+            data = bot.get_current_data(args.symbol.upper(), start_date=args.start)
+
+    windows = dict(DEFAULT_WINDOW_GRIDS.get(args.strategy, {}))
+    if args.strategy == 'sma_rsi_macd':
+        windows['rsi'] = range(7, 22, 7)
+
+    print(f"🔍 {args.symbol.upper()}: {len(data)} bar üzerinde walk-forward optimizasyonu "
+          f"({args.strategy})...")
+    start = time.perf_counter()
+    try:
+        with verbosity('batch'):
+            result = bot.walk_forward(data, size(args.train), size(args.test), args.anchored,
+                                      windows=windows,
+                                      stop_losses=(0.0, 0.05, 0.08),
+                                      take_profits=(0.0, 0.10, 0.20),
+                                      max_workers=args.workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    windows = result['windows']
+    print(f"✅ {len(windows)} pencere {elapsed:.2f} saniyede tamamlandı")
+    print("\n📋 PENCERELER:")
+    print(windows.drop(columns=['worker']).to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    print(f"\n📈 Örneklem dışı toplam getiri: {result['total_return']:.2f}% "
+          f"(final {result['final_capital']:,.2f} TL)")
+    print(f"⏱️ Pencere süreleri: toplam {windows['seconds'].sum():.2f} s, "
+          f"en uzun {windows['seconds'].max():.2f} s")
+
+
+if __name__ == "__main__":
+    main()